@@ -0,0 +1,62 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+"""
+Benchmark loading an SDFG file with DaCe's `SDFG.from_file` and with the
+daemon's loader, reporting the load time and the peak memory use of each.
+Every measurement runs in a fresh process, since the peak memory use of a
+process never decreases.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from os import path
+import sys
+import time
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '..')))
+
+
+def load_with_dace(filename):
+    import dace
+    from dace_vscode.utils import get_peak_memory
+
+    baseline = get_peak_memory()
+    start = time.perf_counter()
+    dace.SDFG.from_file(filename)
+    return time.perf_counter() - start, baseline, get_peak_memory()
+
+
+def load_with_daemon(filename):
+    from dace_vscode.utils import get_peak_memory, load_sdfg_from_file
+
+    baseline = get_peak_memory()
+    loaded = load_sdfg_from_file(filename)
+    if loaded['error'] is not None:
+        raise RuntimeError(loaded['error']['error']['details'])
+    return loaded['stats']['loadTime'], baseline, get_peak_memory()
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('sdfg', help='SDFG file to load, compressed or not')
+    args = parser.parse_args()
+
+    size = path.getsize(args.sdfg)
+    print('file size: %.1f MB' % (size / 1024 / 1024))
+    for name, loader in (('SDFG.from_file', load_with_dace),
+                         ('load_sdfg_from_file', load_with_daemon)):
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            elapsed, baseline, peak = executor.submit(
+                loader, args.sdfg
+            ).result()
+        print('%s: %.3fs, peak memory +%.1f MB' % (
+            name, elapsed, (peak - baseline) / 1024 / 1024
+        ))
+
+
+if __name__ == '__main__':
+    main()
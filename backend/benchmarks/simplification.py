@@ -0,0 +1,106 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+"""
+Benchmark simplifying the results of the work depth analysis sequentially and
+with a pool of worker processes, and check that both produce the same
+results. Uses a given SDFG file, or generates a large stencil SDFG made up of
+many states with differently shaped stencils if none is given.
+"""
+
+from argparse import ArgumentParser
+from os import path
+import sys
+import time
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '..')))
+
+import dace
+from dace.sdfg.performance_evaluation import work_depth
+
+from dace_vscode import simplify
+from dace_vscode.worker_pool import simplify_pool
+
+
+def generate_sdfg(num_states):
+    N = dace.symbol('N')
+    M = dace.symbol('M')
+    sdfg = dace.SDFG('simplification_benchmark')
+    sdfg.add_array('A', [N, M], dace.float64)
+    sdfg.add_array('B', [N, M], dace.float64)
+    last = None
+    for i in range(num_states):
+        radius = i % 4 + 1
+        inputs = {}
+        terms = []
+        for j in range(-radius, radius + 1):
+            name = 'a' + str(j + radius)
+            inputs[name] = dace.Memlet('A[i, j + (%d)]' % j)
+            terms.append(name)
+        state = sdfg.add_state('s' + str(i))
+        state.add_mapped_tasklet(
+            't' + str(i),
+            dict(i='0:N', j='%d:M-%d' % (radius, radius + i % 3)),
+            inputs, 'b = (' + ' + '.join(terms) + ') / %d' % len(terms),
+            dict(b=dace.Memlet('B[i, j]')), external_edges=True
+        )
+        if last is not None:
+            sdfg.add_edge(last, state, dace.InterstateEdge())
+        last = state
+    return sdfg
+
+
+def time_simplification(values):
+    simplify.clear_cache()
+    start = time.perf_counter()
+    simplifier = simplify.Simplifier()
+    results = (
+        simplifier.simplify_all([work for work, _ in values]),
+        simplifier.simplify_all([depth for _, depth in values]),
+        simplifier.simplify_ratios(values),
+    )
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('sdfg', nargs='?', help='SDFG file to benchmark on')
+    parser.add_argument('-s', '--states', type=int, default=200,
+                        help='Number of states of the generated SDFG')
+    parser.add_argument('-w', '--workers', type=int, nargs='+',
+                        default=[2, 4, 8], help='Worker counts to measure')
+    parser.add_argument('-t', '--timeout', type=float, default=60.0,
+                        help='Time limit per expression in the workers')
+    args = parser.parse_args()
+
+    if args.sdfg:
+        sdfg = dace.SDFG.from_file(args.sdfg)
+    else:
+        sdfg = generate_sdfg(args.states)
+
+    work_depth_map = {}
+    work_depth.analyze_sdfg(sdfg, work_depth_map,
+                            work_depth.get_tasklet_work_depth, [], False)
+    values = list(work_depth_map.values())
+    print('%d elements' % len(values))
+
+    simplify_pool.num_workers = 0
+    baseline, expected = time_simplification(values)
+    print('sequential: %.3fs' % baseline)
+
+    simplify_pool.timeout = args.timeout
+    for workers in args.workers:
+        simplify_pool.shutdown()
+        simplify_pool.num_workers = workers
+        # Start the workers outside of the measurement.
+        simplify_pool.simplify([0] * workers)
+        elapsed, results = time_simplification(values)
+        print('%d workers: %.3fs, speedup %.2fx, %s' % (
+            workers, elapsed, baseline / elapsed,
+            'identical' if results == expected else 'DIFFERENT RESULTS'
+        ))
+    simplify_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
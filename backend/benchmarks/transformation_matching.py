@@ -0,0 +1,83 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+"""
+Benchmark finding applicable transformations sequentially and with a pool of
+worker processes. Uses a given SDFG file, or generates a large SDFG made up of
+many states with mapped tasklets if none is given.
+"""
+
+from argparse import ArgumentParser
+from os import path
+import sys
+import time
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '..')))
+
+import dace
+
+from dace_vscode import transformations
+from dace_vscode.worker_pool import worker_pool
+
+
+def generate_sdfg(num_states):
+    sdfg = dace.SDFG('transformation_matching_benchmark')
+    sdfg.add_array('A', [dace.symbol('N')], dace.float64)
+    sdfg.add_array('B', [dace.symbol('N')], dace.float64)
+    last = None
+    for i in range(num_states):
+        state = sdfg.add_state('s' + str(i))
+        state.add_mapped_tasklet(
+            't' + str(i), dict(i='0:N'),
+            dict(a=dace.Memlet('A[i]')), 'b = a * 2',
+            dict(b=dace.Memlet('B[i]')), external_edges=True
+        )
+        if last is not None:
+            sdfg.add_edge(last, state, dace.InterstateEdge())
+        last = state
+    return sdfg
+
+
+def time_call(sdfg_json, repetitions):
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        result = transformations.get_transformations(sdfg_json, [], False)
+        times.append(time.perf_counter() - start)
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+    return min(times), len(result['transformations'])
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('sdfg', nargs='?', help='SDFG file to benchmark on')
+    parser.add_argument('-s', '--states', type=int, default=500,
+                        help='Number of states of the generated SDFG')
+    parser.add_argument('-w', '--workers', type=int, nargs='+',
+                        default=[2, 4, 8], help='Worker counts to measure')
+    parser.add_argument('-r', '--repetitions', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.sdfg:
+        sdfg = dace.SDFG.from_file(args.sdfg)
+    else:
+        sdfg = generate_sdfg(args.states)
+    sdfg_json = sdfg.to_json()
+
+    worker_pool.num_workers = 0
+    baseline, count = time_call(sdfg_json, args.repetitions)
+    print('sequential: %.3fs (%d transformations)' % (baseline, count))
+
+    for workers in args.workers:
+        worker_pool.shutdown()
+        worker_pool.num_workers = workers
+        worker_pool.warm_up()
+        elapsed, count = time_call(sdfg_json, args.repetitions)
+        print('%d workers: %.3fs (%d transformations), speedup %.2fx' %
+              (workers, elapsed, count, baseline / elapsed))
+    worker_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
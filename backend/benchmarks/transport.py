@@ -0,0 +1,116 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+"""
+Benchmark the transport formats the daemon supports for SDFG payloads. For
+each combination of body format (JSON, MessagePack) and content encoding
+(none, gzip, zstd) that is installed, measure the time to encode an SDFG,
+transfer the body over a local socket, and decode it again. Uses a given SDFG
+file, or generates a large stencil SDFG if none is given.
+"""
+
+from argparse import ArgumentParser
+import gzip
+import json
+from os import path
+import socket
+import sys
+import threading
+import time
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '..')))
+
+from dace_vscode import transport
+
+
+def load_sdfg_json(args):
+    if args.sdfg:
+        with open(args.sdfg, 'rb') as fp:
+            data = fp.read()
+        if data[:2] == b'\x1f\x8b':
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+    from simplification import generate_sdfg
+    return generate_sdfg(args.states).to_json()
+
+
+def transfer(data):
+    """ Send a body over a local socket and receive it again. """
+    sender, receiver = socket.socketpair()
+    received = []
+
+    def _receive():
+        chunks = []
+        while True:
+            chunk = receiver.recv(1024 * 1024)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        received.append(b''.join(chunks))
+
+    start = time.perf_counter()
+    thread = threading.Thread(target=_receive)
+    thread.start()
+    sender.sendall(data)
+    sender.close()
+    thread.join()
+    elapsed = time.perf_counter() - start
+    receiver.close()
+    return elapsed, received[0]
+
+
+def measure(sdfg_json, mimetype, encoding, repetitions):
+    best = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        if mimetype == transport.MSGPACK_MIMETYPE:
+            body = transport.encode(sdfg_json)
+        else:
+            body = json.dumps(sdfg_json, separators=(',', ':')).encode()
+        if encoding is not None:
+            body = transport.compress(body, encoding)
+        encode_time = time.perf_counter() - start
+
+        transfer_time, received = transfer(body)
+
+        start = time.perf_counter()
+        decoded = transport.decode(received, encoding, mimetype)
+        decode_time = time.perf_counter() - start
+
+        timings = (encode_time, transfer_time, decode_time, len(body))
+        if best is None or sum(timings[:3]) < sum(best[:3]):
+            best = timings
+    if decoded != sdfg_json:
+        raise RuntimeError('Decoded payload differs from the original')
+    return best
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('sdfg', nargs='?', help='SDFG file to benchmark on')
+    parser.add_argument('-s', '--states', type=int, default=2000,
+                        help='Number of states of the generated SDFG')
+    parser.add_argument('-r', '--repetitions', type=int, default=3,
+                        help='Number of measurements, the best is reported')
+    args = parser.parse_args()
+
+    sdfg_json = load_sdfg_json(args)
+    print('%-30s %9s %9s %9s %9s %10s' % (
+        'format', 'encode', 'transfer', 'decode', 'total', 'size (MB)'
+    ))
+    for mimetype in transport.get_supported_mimetypes():
+        for encoding in [None] + transport.get_supported_encodings():
+            encode_time, transfer_time, decode_time, size = measure(
+                sdfg_json, mimetype, encoding, args.repetitions
+            )
+            print('%-30s %8.3fs %8.3fs %8.3fs %8.3fs %10.2f' % (
+                mimetype + (' + ' + encoding if encoding else ''),
+                encode_time, transfer_time, decode_time,
+                encode_time + transfer_time + decode_time,
+                size / 1024 / 1024
+            ))
+
+
+if __name__ == '__main__':
+    main()
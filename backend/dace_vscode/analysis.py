@@ -0,0 +1,338 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+import copy
+
+from dace.version import __version__ as DACE_VERSION
+
+from dace_vscode import operational_intensity, symbolic_eval, work_depth
+from dace_vscode.disk_cache import DiskCache
+from dace_vscode.sdfg_cache import canonical_json, get_content_hash
+from dace_vscode.simplify import Simplifier
+from dace_vscode.utils import load_sdfg_from_json, get_exception_message
+from dace_vscode.worker_pool import run_sdfg_tasks, worker_pool
+
+
+WORK_DEPTH_MAPS = ('arithOpsMap', 'depthMap', 'avgParallelismMap')
+
+# Increment when changing how analysis results are computed, to invalidate
+# results persisted by earlier versions.
+ANALYSIS_FORMAT_VERSION = 1
+
+analysis_cache = DiskCache('analysis', 256 * 1024 * 1024)
+
+# Maximum number of grid points of an operational intensity sweep.
+MAX_SWEEP_POINTS = 1024
+
+
+def _normalize_cache_params(cache_params):
+    try:
+        return [int(param) for param in cache_params.split()]
+    except ValueError:
+        return cache_params
+
+
+def _get_cache_key(sdfg_hash, assumptions, kind, **params):
+    """
+    Build the key of a persisted analysis result. Assumptions are independent
+    of each other, so their order does not matter.
+    """
+    return {
+        'format': ANALYSIS_FORMAT_VERSION,
+        'dace': str(DACE_VERSION),
+        'sdfg': sdfg_hash,
+        'assumptions': sorted(assumptions.split()),
+        'kind': kind,
+        'params': params,
+    }
+
+
+def analyze(sdfg_json, assumptions, cache_params=None, simplify=True,
+            memo=None, symbol_values=None, sweep=None):
+    """
+    Compute the work, depth, and average parallelism of all elements of an
+    SDFG, and optionally their operational intensity, from a single parse of
+    the SDFG and a single run of the work depth analysis.
+    Results are persisted on disk, keyed by the SDFG's content hash, the
+    assumptions, and the analysis parameters, so analyzing a known SDFG again
+    does not require running any analysis. Results with expressions whose
+    simplification timed out are not persisted.
+    :param sdfg_json:     The SDFG in JSON format.
+    :param assumptions:   Space separated symbol assumptions.
+    :param cache_params:  Space separated cache size and cache line size for
+                          the operational intensity analysis, or None to skip
+                          it.
+    :param simplify:      Whether to simplify the work and depth expressions,
+                          or return them raw.
+    :param memo:          Optional `WorkDepthMemo` of the SDFG's document, to
+                          only re-analyze changed states with.
+    :param symbol_values: Optional dictionary of symbol values to numerically
+                          evaluate the results for, see
+                          `symbolic_eval.evaluate_maps`.
+    :param sweep:         Optional dictionary of lists of symbol values to
+                          evaluate the results for all combinations of.
+    """
+    if not work_depth.work_depth:
+        return {
+            'error': {
+                'message': 'DaCe version does not support work depth analysis',
+                'details': 'Please update DaCe to a newer version',
+            },
+        }
+    if (cache_params is not None and
+            not operational_intensity.analyze_sdfg_op_in):
+        return {
+            'error': {
+                'message': 'DaCe version does not support operational ' +
+                    'intensity analysis',
+                'details': 'Please update DaCe to a newer version',
+            },
+        }
+
+    if 'error' in sdfg_json:
+        return load_sdfg_from_json(sdfg_json)['error']
+
+    sdfg_hash = get_content_hash(sdfg_json)
+    work_depth_key = _get_cache_key(sdfg_hash, assumptions, 'work_depth',
+                                    simplify=simplify)
+    response = analysis_cache.get(work_depth_key)
+    op_in_key = None
+    op_in_map = None
+    if cache_params is not None:
+        op_in_key = _get_cache_key(
+            sdfg_hash, assumptions, 'operational_intensity',
+            cacheParams=_normalize_cache_params(cache_params)
+        )
+        op_in_map = analysis_cache.get(op_in_key)
+
+    sdfg = None
+    if response is None or (op_in_key is not None and op_in_map is None):
+        loaded = load_sdfg_from_json(sdfg_json)
+        if loaded['error'] is not None:
+            return loaded['error']
+        sdfg = loaded['sdfg']
+
+    if response is None:
+        try:
+            # Both analyses annotate the SDFG they are run on, so the
+            # operational intensity is computed on a copy if needed.
+            analyzed_sdfg = sdfg
+            if op_in_key is not None and op_in_map is None:
+                analyzed_sdfg = copy.deepcopy(sdfg)
+
+            simplifier = Simplifier()
+            work_map, depth_map, avg_parallelism_map = (
+                work_depth.analyze_work_depth(analyzed_sdfg, assumptions,
+                                              simplify, memo, simplifier,
+                                              sdfg_json)
+            )
+            response = {
+                'arithOpsMap': work_map,
+                'depthMap': depth_map,
+                'avgParallelismMap': avg_parallelism_map,
+            }
+            if simplifier.complete:
+                analysis_cache.put(work_depth_key, response)
+        except Exception as e:
+            return {
+                'error': {
+                    'message': 'Failed to analyze work and depth',
+                    'details': get_exception_message(e),
+                },
+            }
+
+    if op_in_key is not None:
+        if op_in_map is None:
+            try:
+                op_in_map = operational_intensity.analyze_op_in(
+                    sdfg, cache_params, assumptions
+                )
+                analysis_cache.put(op_in_key, op_in_map)
+            except Exception as e:
+                return {
+                    'error': {
+                        'message': 'Failed to analyze operational intensity',
+                        'details': get_exception_message(e),
+                    },
+                }
+        response['opInMap'] = op_in_map
+
+    if symbol_values is not None or sweep is not None:
+        try:
+            response.update(symbolic_eval.evaluate_maps({
+                name: response[name]
+                for name in WORK_DEPTH_MAPS + ('opInMap',) if name in response
+            }, symbol_values, sweep))
+        except Exception as e:
+            return {
+                'error': {
+                    'message': 'Failed to evaluate the analysis results',
+                    'details': get_exception_message(e),
+                },
+            }
+    return response
+
+
+def _expand_values(values, limit):
+    """
+    Expand a list of parameter values, or a range given as a dictionary with
+    'start', 'stop' (inclusive) and either 'step' or 'factor'.
+    :param limit:  Maximum number of values, more raise a `ValueError`.
+    """
+    if not isinstance(values, dict):
+        if len(values) > limit:
+            raise ValueError('More than %d values given' % limit)
+        return [int(v) for v in values]
+    start = int(values['start'])
+    stop = int(values['stop'])
+    expanded = []
+    value = start
+    if 'factor' in values:
+        factor = int(values['factor'])
+        if factor < 2 or start < 1:
+            raise ValueError('Invalid geometric range ' + str(values))
+        while value <= stop:
+            if len(expanded) == limit:
+                raise ValueError('Range ' + str(values) +
+                                 ' has more than %d values' % limit)
+            expanded.append(value)
+            value *= factor
+    else:
+        step = int(values.get('step', 1))
+        if step < 1:
+            raise ValueError('Invalid range ' + str(values))
+        while value <= stop:
+            if len(expanded) == limit:
+                raise ValueError('Range ' + str(values) +
+                                 ' has more than %d values' % limit)
+            expanded.append(value)
+            value += step
+    return expanded
+
+
+def _sweep_parallel(sdfg_json, sdfg_hash, points):
+    """
+    Run the operational intensity analysis for a list of (cache parameters,
+    assumptions) points across the worker pool. Each worker only needs to be
+    sent and parse the SDFG once.
+    """
+    results = [None] * len(points)
+    for i, result in run_sdfg_tasks(
+        worker_pool.executor, operational_intensity.analyze_op_in_task,
+        sdfg_hash, lambda: canonical_json(sdfg_json), points
+    ):
+        results[i] = result
+    return results
+
+
+def sweep_operational_intensity(sdfg_json, cache_sizes, line_sizes,
+                                assumption_sets):
+    """
+    Run the operational intensity analysis over the grid of all combinations
+    of cache sizes, cache line sizes, and assumption sets. The SDFG is parsed
+    once, points are analyzed in parallel if the worker pool is enabled (the
+    pool of transformation workers, see `--transformation-workers`), and the
+    results of each point are persisted like those of `analyze`. Grids of more
+    than `MAX_SWEEP_POINTS` points are rejected.
+    DaCe's analysis does not expose the access patterns it derives, so these
+    are recomputed for each point.
+    :param sdfg_json:        The SDFG in JSON format.
+    :param cache_sizes:      List or range of cache sizes.
+    :param line_sizes:       List or range of cache line sizes.
+    :param assumption_sets:  List of space separated symbol assumptions.
+    :returns:                The list of grid points, and for each element
+                             the list of its operational intensities at each
+                             point.
+    """
+    if not operational_intensity.analyze_sdfg_op_in:
+        return {
+            'error': {
+                'message': 'DaCe version does not support operational ' +
+                    'intensity analysis',
+                'details': 'Please update DaCe to a newer version',
+            },
+        }
+
+    if 'error' in sdfg_json:
+        return load_sdfg_from_json(sdfg_json)['error']
+
+    try:
+        if isinstance(assumption_sets, str):
+            assumption_sets = [assumption_sets]
+        cache_sizes = _expand_values(cache_sizes, MAX_SWEEP_POINTS)
+        line_sizes = _expand_values(line_sizes, MAX_SWEEP_POINTS)
+        num_points = (len(assumption_sets) * len(cache_sizes) *
+                      len(line_sizes))
+        if num_points > MAX_SWEEP_POINTS:
+            raise ValueError('The sweep has %d points, at most %d are '
+                             'allowed' % (num_points, MAX_SWEEP_POINTS))
+        grid = [
+            (cache_size, line_size, assumptions)
+            for assumptions in assumption_sets
+            for cache_size in cache_sizes
+            for line_size in line_sizes
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        return {
+            'error': {
+                'message': 'Invalid sweep parameters',
+                'details': get_exception_message(e),
+            },
+        }
+
+    sdfg_hash = get_content_hash(sdfg_json)
+    keys = [
+        _get_cache_key(sdfg_hash, assumptions, 'operational_intensity',
+                       cacheParams=[cache_size, line_size])
+        for cache_size, line_size, assumptions in grid
+    ]
+    results = [analysis_cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    points = [
+        ('%d %d' % (grid[i][0], grid[i][1]), grid[i][2]) for i in missing
+    ]
+
+    try:
+        if points and worker_pool.enabled and len(points) > 1:
+            computed = _sweep_parallel(sdfg_json, sdfg_hash, points)
+        elif points:
+            loaded = load_sdfg_from_json(sdfg_json)
+            if loaded['error'] is not None:
+                return loaded['error']
+            sdfg = loaded['sdfg']
+            computed = [
+                operational_intensity.analyze_op_in(
+                    copy.deepcopy(sdfg), cache_params, assumptions
+                )
+                for cache_params, assumptions in points
+            ]
+        else:
+            computed = []
+    except Exception as e:
+        return {
+            'error': {
+                'message': 'Failed to analyze operational intensity',
+                'details': get_exception_message(e),
+            },
+        }
+
+    for i, op_in_map in zip(missing, computed):
+        results[i] = op_in_map
+        analysis_cache.put(keys[i], op_in_map)
+
+    table = {}
+    for i, op_in_map in enumerate(results):
+        for element, value in op_in_map.items():
+            if element not in table:
+                table[element] = [None] * len(grid)
+            table[element][i] = value
+    return {
+        'points': [
+            {
+                'cacheSize': cache_size,
+                'lineSize': line_size,
+                'assumptions': assumptions,
+            } for cache_size, line_size, assumptions in grid
+        ],
+        'opInTable': table,
+    }
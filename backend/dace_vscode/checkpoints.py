@@ -0,0 +1,108 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+from collections import OrderedDict
+import copy
+import hashlib
+
+from dace_vscode.sdfg_cache import canonical_json
+
+# Default upper bound for the estimated memory held by checkpoints.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Replaying the transformation history stores a checkpoint after every this
+# many history items.
+CHECKPOINT_INTERVAL = 8
+
+# Replaying a history item that takes at least this many seconds always
+# stores a checkpoint after it.
+EXPENSIVE_STEP_TIME = 0.5
+
+
+def get_history_keys(orig_sdfg_json, history_json):
+    """
+    Compute the checkpoint keys of all prefixes of a transformation history.
+    Each key chains the key of the previous prefix with the next history
+    item, so a key identifies the original SDFG and all history items applied
+    to it.
+    :param orig_sdfg_json:  The original SDFG in JSON format.
+    :param history_json:    List of history items in JSON format.
+    :returns:               The list of keys, where the i-th key identifies
+                            the SDFG with the first i history items applied,
+                            and the size of the original SDFG's JSON.
+    """
+    orig_string = canonical_json(orig_sdfg_json)
+    key = hashlib.sha256(orig_string.encode('utf-8')).hexdigest()
+    keys = [key]
+    for item in history_json:
+        key = hashlib.sha256(
+            (key + canonical_json(item)).encode('utf-8')
+        ).hexdigest()
+        keys.append(key)
+    return keys, len(orig_string)
+
+
+class CheckpointStore:
+    """
+    A bounded LRU store of intermediate SDFGs of transformation history
+    replays, keyed by the chained hash of the original SDFG and the history
+    items applied to it (see `get_history_keys`). Since keys only depend on
+    content, checkpoints are shared by all documents with the same history.
+    Like the SDFG cache, checkpoints are copied when stored and handed out,
+    and their memory footprint is estimated through the size of the original
+    SDFG's JSON representation.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def find_latest(self, keys, index):
+        """
+        Find the checkpoint closest to, but not after, a point in a history.
+        :param keys:   The history's checkpoint keys.
+        :param index:  Index of the last history item to apply.
+        :returns:      The index of the last history item the checkpoint has
+                       applied and a private copy of its SDFG, or (-1, None)
+                       if there is no such checkpoint.
+        """
+        for i in range(min(index, len(keys) - 2), -1, -1):
+            key = keys[i + 1]
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                sdfg, _ = self._entries[key]
+                return i, copy.deepcopy(sdfg)
+        self.misses += 1
+        return -1, None
+
+    def put(self, key, sdfg, size):
+        if size > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = (copy.deepcopy(sdfg), size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'size': self._size,
+            'maxSize': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+history_checkpoints = CheckpointStore()
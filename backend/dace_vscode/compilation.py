@@ -0,0 +1,187 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+import contextlib
+import hashlib
+import json
+import os
+
+import dace
+from dace.codegen import compiler
+from dace.codegen.compiled_sdfg import CompiledSDFG
+from dace.version import __version__ as DACE_VERSION
+
+from dace_vscode.disk_cache import DiskCache
+from dace_vscode.utils import (get_exception_message, load_sdfg_from_file,
+                               store_metadata)
+
+# Maps SDFG files and build settings to the libraries built for them. Entries
+# are small, so the size limit effectively bounds the number of entries.
+compile_cache = DiskCache('compile', 4 * 1024 * 1024)
+
+
+def _get_compile_cache_key(path, suppress_instrumentation):
+    """
+    Build the compile cache key of an SDFG file. It covers the file contents
+    and all configuration that affects the generated code and its build.
+    """
+    with open(path, 'rb') as fp:
+        file_hash = hashlib.sha256(fp.read()).hexdigest()
+    return {
+        'sdfg': file_hash,
+        'suppressInstrumentation': suppress_instrumentation,
+        'dace': str(DACE_VERSION),
+        'buildFolder': os.path.abspath(
+            dace.Config.get('default_build_folder')
+        ),
+        'compiler': json.loads(
+            json.dumps(dace.Config.get('compiler'), sort_keys=True,
+                       default=str)
+        ),
+        'instrumentation': json.loads(
+            json.dumps(dace.Config.get('instrumentation'), sort_keys=True,
+                       default=str)
+        ),
+    }
+
+
+def _get_cached_build(key):
+    """
+    Look up the library built for a compile cache key. Entries whose library
+    was removed or has since been overwritten by another build are stale and
+    get removed.
+    """
+    entry = compile_cache.get(key)
+    if entry is None:
+        return None
+    try:
+        if os.path.getmtime(entry['filename']) == entry['mtime']:
+            return entry['filename']
+    except (OSError, KeyError, TypeError):
+        pass
+    compile_cache.remove(key)
+    return None
+
+
+def get_cached_build(path, suppress_instrumentation=False):
+    """
+    Look up an unchanged build of an SDFG file with the current settings,
+    without loading the SDFG.
+    :param path:                      Path to the SDFG file.
+    :param suppress_instrumentation:  Whether instrumentation is removed
+                                      before compiling.
+    :returns:                         The compile result of the build, or None
+                                      if there is none.
+    """
+    try:
+        filename = _get_cached_build(
+            _get_compile_cache_key(path, suppress_instrumentation)
+        )
+    except OSError:
+        return None
+    if filename is None:
+        return None
+    return {
+        'filename': filename,
+        'cached': True,
+    }
+
+
+def _sdfg_remove_instrumentations(sdfg: dace.sdfg.SDFG):
+    sdfg.instrument = dace.dtypes.InstrumentationType.No_Instrumentation
+    for state in sdfg.nodes():
+        state.instrument = dace.dtypes.InstrumentationType.No_Instrumentation
+        for node in state.nodes():
+            node.instrument = dace.dtypes.InstrumentationType.No_Instrumentation
+            if isinstance(node, dace.sdfg.nodes.NestedSDFG):
+                _sdfg_remove_instrumentations(node.sdfg)
+
+
+@contextlib.contextmanager
+def _report_build(progress):
+    """
+    Report the start of the compiler invocation, which `SDFG.compile` runs
+    right after generating code.
+    """
+    configure_and_compile = compiler.configure_and_compile
+
+    def _configure_and_compile(*args, **kwargs):
+        progress('build')
+        return configure_and_compile(*args, **kwargs)
+
+    compiler.configure_and_compile = _configure_and_compile
+    try:
+        yield
+    finally:
+        compiler.configure_and_compile = configure_and_compile
+
+
+def compile_sdfg(path, suppress_instrumentation=False, progress=None):
+    """
+    Compile an SDFG file, unless an unchanged build of the same file contents
+    with the same settings exists.
+    :param path:                      Path to the SDFG file.
+    :param suppress_instrumentation:  Whether to remove all instrumentation
+                                      before compiling.
+    :param progress:                  Optional function called with the name
+                                      of each phase (see
+                                      `compile_jobs.COMPILE_PHASES`) as it
+                                      starts.
+    """
+    if progress is None:
+        progress = lambda phase: None
+
+    progress('load')
+    try:
+        cache_key = _get_compile_cache_key(path, suppress_instrumentation)
+    except OSError:
+        # Loading the SDFG below reports the missing file.
+        cache_key = None
+    if cache_key is not None:
+        filename = _get_cached_build(cache_key)
+        if filename is not None:
+            return {
+                'filename': filename,
+                'cached': True,
+            }
+
+    with store_metadata(False):
+        loaded = load_sdfg_from_file(path)
+        if loaded['error'] is not None:
+            return loaded['error']
+        sdfg = loaded['sdfg']
+
+        try:
+            if suppress_instrumentation:
+                progress('strip_instrumentation')
+                _sdfg_remove_instrumentations(sdfg)
+        except Exception as e:
+            return {
+                'error': {
+                    'message': ('Failed to remove instrumentation from ' +
+                        'SDFG for compiling'),
+                    'details': get_exception_message(e),
+                },
+            }
+
+        try:
+            progress('codegen')
+            with _report_build(progress):
+                compiled_sdfg: CompiledSDFG = sdfg.compile()
+
+            if cache_key is not None:
+                compile_cache.put(cache_key, {
+                    'filename': compiled_sdfg.filename,
+                    'mtime': os.path.getmtime(compiled_sdfg.filename),
+                })
+            return {
+                'filename': compiled_sdfg.filename,
+                'loadStats': loaded['stats'],
+            }
+        except Exception as e:
+            return {
+                'error': {
+                    'message': 'Failed to compile SDFG',
+                    'details': get_exception_message(e),
+                },
+            }
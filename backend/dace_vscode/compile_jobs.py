@@ -0,0 +1,336 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+from collections import OrderedDict
+import itertools
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import traceback
+
+# Phases of a compile job, in the order they are run in.
+COMPILE_PHASES = ('load', 'strip_instrumentation', 'codegen', 'build')
+
+# Number of finished jobs whose results are kept around to be queried.
+FINISHED_JOBS_LIMIT = 64
+
+# Time in seconds a cancelled job's processes get to exit before being killed.
+CANCEL_GRACE_PERIOD = 2.0
+
+FINAL_STATES = ('done', 'failed', 'cancelled')
+
+
+def _compile_job_main(messages, path, suppress_instrumentation,
+                      custom_transformation_paths, config_file):
+    """
+    Entry point of the process a compile job runs in. The process starts its
+    own process group, which the compiler subprocesses it runs inherit, so
+    cancelling the job can kill the entire build.
+    """
+    if hasattr(os, 'setsid'):
+        os.setsid()
+
+    def progress(phase):
+        messages.put(('phase', phase, time.time()))
+
+    try:
+        if config_file is not None:
+            # Build with the same configuration the daemon has loaded.
+            import dace
+            dace.Config.load(config_file)
+        if custom_transformation_paths:
+            # Custom transformations may register library nodes used in the
+            # SDFG.
+            from dace_vscode import transformations
+            transformations.add_custom_transformations(
+                custom_transformation_paths
+            )
+        from dace_vscode import compilation
+        result = compilation.compile_sdfg(path, suppress_instrumentation,
+                                          progress)
+    except BaseException as e:
+        result = {
+            'error': {
+                'message': 'Failed to compile SDFG',
+                'details': ''.join(
+                    traceback.format_exception(type(e), e, e.__traceback__)
+                ),
+            },
+        }
+    messages.put(('result', result, time.time()))
+
+
+class CompileJob:
+    """
+    An SDFG compilation running in the background. Its state moves from
+    'queued' to 'running' to one of 'done', 'failed', or 'cancelled', and the
+    time spent in each compilation phase is recorded along the way.
+    """
+
+    def __init__(self, job_id, path, suppress_instrumentation,
+                 config_file=None):
+        self.id = job_id
+        self.path = path
+        self.suppress_instrumentation = suppress_instrumentation
+        self.config_file = config_file
+        self.state = 'queued'
+        self.phases = OrderedDict(
+            (phase, {'state': 'pending', 'time': None})
+            for phase in COMPILE_PHASES
+        )
+        self.result = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_requested = False
+        self.process = None
+        self.done = threading.Event()
+        self._phase = None
+        self._phase_start = None
+
+    def enter_phase(self, phase, timestamp):
+        self._end_phase('done', timestamp)
+        if phase in self.phases:
+            self.phases[phase]['state'] = 'running'
+            self._phase = phase
+            self._phase_start = timestamp
+
+    def _end_phase(self, state, timestamp):
+        if self._phase is not None:
+            self.phases[self._phase]['state'] = state
+            self.phases[self._phase]['time'] = timestamp - self._phase_start
+            self._phase = None
+
+    def finish(self, state, result, timestamp=None):
+        timestamp = timestamp if timestamp is not None else time.time()
+        self._end_phase('done' if state == 'done' else state, timestamp)
+        for phase in self.phases.values():
+            if phase['state'] == 'pending':
+                phase['state'] = 'skipped'
+        self.state = state
+        self.result = result
+        self.finished = time.time()
+        self.process = None
+        self.done.set()
+
+    def to_json(self):
+        now = self.finished if self.finished is not None else time.time()
+        return {
+            'id': self.id,
+            'path': self.path,
+            'state': self.state,
+            'phase': self._phase,
+            'phases': [
+                dict(name=name, **phase)
+                for name, phase in self.phases.items()
+            ],
+            'queuedTime': (
+                (self.started if self.started is not None else now) -
+                self.submitted
+            ),
+            'runTime': (
+                now - self.started if self.started is not None else None
+            ),
+            'result': self.result,
+        }
+
+
+class CompileJobs:
+    """
+    Runs compile jobs in the background, each in its own spawned process. At
+    most `max_concurrent` jobs run at the same time, further jobs are queued.
+    Processes are spawned rather than forked, since DaCe's global state must
+    not be shared with the daemon, and a fresh process per job means
+    cancelling one never affects another.
+    """
+
+    def __init__(self, max_concurrent=1):
+        self.max_concurrent = max_concurrent
+        self.custom_transformation_paths = []
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._slots = None
+
+    def _get_slots(self):
+        with self._lock:
+            if self._slots is None:
+                self._slots = threading.Semaphore(max(self.max_concurrent, 1))
+            return self._slots
+
+    def add_custom_transformations(self, paths):
+        """
+        Record custom transformation files to be loaded before compiling.
+        :param paths:  Paths to the custom transformation files.
+        """
+        for p in paths:
+            if p not in self.custom_transformation_paths:
+                self.custom_transformation_paths.append(p)
+
+    def submit(self, path, suppress_instrumentation=False, config_file=None,
+               result=None):
+        """
+        Queue the compilation of an SDFG file.
+        :param path:                      Path to the SDFG file.
+        :param suppress_instrumentation:  Whether to remove all
+                                          instrumentation before compiling.
+        :param config_file:               Optional DaCe configuration file to
+                                          load before compiling.
+        :param result:                    The compile result, if it is already
+                                          known from the compile cache. The
+                                          job is then done right away, without
+                                          waiting for a slot or starting a
+                                          process.
+        :returns:                         The queued job.
+        """
+        with self._lock:
+            job = CompileJob(str(next(self._ids)), path,
+                             suppress_instrumentation, config_file)
+            self._jobs[job.id] = job
+            finished = [
+                j.id for j in self._jobs.values() if j.state in FINAL_STATES
+            ]
+            for job_id in finished[:max(
+                len(finished) - FINISHED_JOBS_LIMIT, 0
+            )]:
+                del self._jobs[job_id]
+            if result is not None:
+                job.started = job.submitted
+                job.finish('done', result)
+                return job
+        threading.Thread(target=self._run, args=(job,), daemon=True).start()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _run(self, job):
+        slots = self._get_slots()
+        with slots:
+            with self._lock:
+                if job.cancel_requested:
+                    job.finish('cancelled', None)
+                    return
+                custom_transformation_paths = list(
+                    self.custom_transformation_paths
+                )
+            # Spawning a process takes a while, so it is started without
+            # holding the lock, which would block polling and cancellation.
+            ctx = multiprocessing.get_context('spawn')
+            messages = ctx.Queue()
+            process = ctx.Process(
+                target=_compile_job_main,
+                args=(messages, job.path, job.suppress_instrumentation,
+                      custom_transformation_paths, job.config_file),
+                daemon=True
+            )
+            started = time.time()
+            process.start()
+            with self._lock:
+                job.process = process
+                job.started = started
+                job.state = 'running'
+                # A cancellation requested while the process was starting
+                # could not reach the process yet.
+                cancelled = job.cancel_requested
+            if cancelled:
+                self._kill(process)
+
+            result = None
+            timestamp = None
+            while True:
+                try:
+                    kind, data, timestamp = messages.get(timeout=0.2)
+                except queue.Empty:
+                    if process.is_alive():
+                        continue
+                    # Pick up anything the process sent right before exiting.
+                    try:
+                        kind, data, timestamp = messages.get(timeout=0.5)
+                    except queue.Empty:
+                        break
+                if kind == 'phase':
+                    with self._lock:
+                        job.enter_phase(data, timestamp)
+                else:
+                    result = data
+                    break
+            process.join()
+
+            with self._lock:
+                if job.cancel_requested:
+                    job.finish('cancelled', None, timestamp)
+                elif result is None:
+                    job.finish('failed', {
+                        'error': {
+                            'message': 'Failed to compile SDFG',
+                            'details': ('The compilation process exited ' +
+                                        'with code ' + str(process.exitcode)),
+                        },
+                    }, timestamp)
+                elif 'error' in result:
+                    job.finish('failed', result, timestamp)
+                else:
+                    job.finish('done', result, timestamp)
+
+    def cancel(self, job_id):
+        """
+        Cancel a compile job. Queued jobs are dropped, and running jobs have
+        their process and all compiler processes it started terminated.
+        :param job_id:  ID of the job to cancel.
+        :returns:       The job, or None if no such job exists.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state in FINAL_STATES:
+                return job
+            job.cancel_requested = True
+            process = job.process
+        if process is not None:
+            threading.Thread(target=self._kill, args=(process,),
+                             daemon=True).start()
+        return job
+
+    @staticmethod
+    def _kill(process):
+        if not hasattr(os, 'killpg'):
+            # Without process groups, only the job's own process can be
+            # terminated.
+            process.terminate()
+            return
+        for sig, grace_period in ((signal.SIGTERM, CANCEL_GRACE_PERIOD),
+                                  (signal.SIGKILL, None)):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                # The process has not created its group yet, or is gone.
+                if process.is_alive():
+                    process.kill()
+                return
+            except OSError:
+                process.kill()
+                return
+            if grace_period is not None:
+                process.join(grace_period)
+                if not process.is_alive():
+                    # Also make sure the compiler processes are gone.
+                    try:
+                        os.killpg(process.pid, signal.SIGKILL)
+                    except OSError:
+                        pass
+                    return
+
+    def shutdown(self):
+        for job in self.list():
+            self.cancel(job.id)
+
+
+compile_jobs = CompileJobs()
@@ -0,0 +1,187 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+
+# Eviction removes entries until the cache is at this fraction of its size
+# limit, so the folder is not scanned again with every following entry.
+EVICTION_TARGET = 0.75
+
+
+def get_cache_dir():
+    """
+    Get the directory the daemon persists its caches in. This is the
+    'dace-vscode' folder in the user's cache directory, unless overridden
+    through the DACE_VSCODE_CACHE_DIR environment variable.
+    """
+    override = os.environ.get('DACE_VSCODE_CACHE_DIR')
+    if override:
+        return override
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    else:
+        base = os.environ.get(
+            'XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')
+        )
+    return os.path.join(base, 'dace-vscode')
+
+
+def hash_key(key):
+    """
+    Hash a JSON serializable cache key to a file name safe string.
+    :param key:  The key to hash.
+    """
+    return hashlib.sha256(
+        json.dumps(key, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+class DiskCache:
+    """
+    A cache of JSON serializable values, stored as one file per entry in a
+    namespace folder of the cache directory. Once the entries exceed the size
+    limit, the least recently used entries are evicted.
+    Failing to read or write the cache is never an error, the cache simply
+    behaves as if the entry did not exist.
+    The total size of the entries is tracked in memory, so the folder is only
+    scanned once up front and whenever entries need to be evicted. Entries
+    written by other processes are therefore only accounted for by the next
+    eviction.
+    """
+
+    def __init__(self, namespace, max_bytes):
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Directory the total size was determined for, and the total size.
+        self._size_directory = None
+        self._size = 0
+
+    @property
+    def directory(self):
+        return os.path.join(get_cache_dir(), self.namespace)
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, hash_key(key) + '.json')
+
+    def _scan(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _add_size(self, delta):
+        """ Update the tracked total size, and report if it is exceeded. """
+        with self._lock:
+            if self._size_directory != self.directory:
+                try:
+                    self._size = sum(size for _, size, _ in self._scan())
+                except OSError:
+                    return False
+                self._size_directory = self.directory
+            else:
+                self._size = max(self._size + delta, 0)
+            return self._size > self.max_bytes
+
+    @staticmethod
+    def _file_size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def get(self, key):
+        """
+        Look up a cache entry.
+        :param key:  The JSON serializable key of the entry.
+        :returns:    The cached value, or None if there is no such entry.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as fp:
+                value = json.load(fp)
+            # Mark the entry as recently used.
+            os.utime(path)
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, value):
+        """
+        Store a cache entry, replacing any existing entry with the same key.
+        :param key:    The JSON serializable key of the entry.
+        :param value:  The JSON serializable value to store.
+        """
+        path = self._entry_path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first, so concurrent readers never
+            # see a partially written entry.
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory,
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(value, fp)
+            replaced_size = self._file_size(path)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            return
+        if self._add_size(self._file_size(path) - replaced_size):
+            self.evict()
+
+    def remove(self, key):
+        """
+        Remove a cache entry, if it exists.
+        :param key:  The JSON serializable key of the entry.
+        """
+        path = self._entry_path(key)
+        size = self._file_size(path)
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        self._add_size(-size)
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache is well within its
+        size limit, see `EVICTION_TARGET`.
+        """
+        with self._lock:
+            try:
+                entries = self._scan()
+            except OSError:
+                return
+
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                target = total
+            else:
+                target = self.max_bytes * EVICTION_TARGET
+            for _, size, name in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    total -= size
+                except OSError:
+                    pass
+            self._size_directory = self.directory
+            self._size = total
+
+    def clear(self):
+        with self._lock:
+            try:
+                for name in os.listdir(self.directory):
+                    if name.endswith('.json'):
+                        os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            self._size_directory = None
@@ -8,7 +8,44 @@ try:
 except ModuleNotFoundError:
     analyze_sdfg_op_in = None
 
+import copy
+
 from dace_vscode.utils import load_sdfg_from_json, get_exception_message
+from dace_vscode.worker_pool import SDFG_MISSING, worker_sdfg
+
+def analyze_op_in(sdfg, cache_params, assumptions):
+    """
+    Run the operational intensity analysis on an SDFG.
+    :param sdfg:          The SDFG to analyze.
+    :param cache_params:  Space separated cache size and cache line size.
+    :param assumptions:   Space separated symbol assumptions.
+    :returns:             The operational intensity map.
+    """
+    op_in_map = {}
+    assumptions_dict = {
+        x.split('==')[0] : int(x.split('==')[1])
+        for x in assumptions.split()
+    }
+    C = int(cache_params.split()[0])
+    L = int(cache_params.split()[1])
+    analyze_sdfg_op_in(
+        sdfg, op_in_map, C, L, assumptions_dict, stringify=True
+    )
+    return op_in_map
+
+
+def analyze_op_in_task(sdfg_hash, sdfg_string, cache_params, assumptions):
+    """
+    Worker process task running the operational intensity analysis for one
+    set of parameters.
+    :returns:  The operational intensity map, or `SDFG_MISSING` if the SDFG is
+               neither cached in the worker nor provided.
+    """
+    sdfg = worker_sdfg(sdfg_hash, sdfg_string)
+    if sdfg is None:
+        return SDFG_MISSING
+    return analyze_op_in(copy.deepcopy(sdfg), cache_params, assumptions)
+
 
 def get_operational_intensity(sdfg_json, cache_params, assumptions):
     if not analyze_sdfg_op_in:
@@ -26,19 +63,8 @@ def get_operational_intensity(sdfg_json, cache_params, assumptions):
     sdfg = loaded['sdfg']
     
     try:
-        op_in_map = {}
-        assumptions_dict = {
-            x.split('==')[0] : int(x.split('==')[1])
-            for x in assumptions.split()
-        }
-        print(cache_params)
-        C = int(cache_params.split()[0])
-        L = int(cache_params.split()[1])
-        analyze_sdfg_op_in(
-            sdfg, op_in_map, C, L, assumptions_dict, stringify=True
-        )
         return {
-            'opInMap': op_in_map,
+            'opInMap': analyze_op_in(sdfg, cache_params, assumptions),
         }
     except Exception as e:
         return {
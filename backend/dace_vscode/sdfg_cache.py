@@ -0,0 +1,149 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+
+# Default upper bound for the estimated memory held by cached SDFGs.
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def canonical_json(sdfg_json):
+    """
+    Serialize a JSON object to its canonical string representation, i.e., with
+    sorted keys and without any insignificant whitespace.
+    :param sdfg_json:  The JSON object to serialize.
+    """
+    return json.dumps(sdfg_json, sort_keys=True, separators=(',', ':'))
+
+
+def hash_json(sdfg_json):
+    """
+    Compute a content hash of a JSON object, independent of key order and
+    formatting.
+    :param sdfg_json:  The JSON object to hash.
+    """
+    return hashlib.sha256(
+        canonical_json(sdfg_json).encode('utf-8')
+    ).hexdigest()
+
+
+class HashedJSON(dict):
+    """
+    An SDFG JSON object that carries a precomputed content hash and size, so
+    the SDFG cache does not need to re-serialize it in order to look it up.
+    If the hash is chained, it was derived from a previous version of the SDFG
+    and the changes made to it, and it identifies the SDFG only within its
+    edit history.
+    """
+
+    def __init__(self, sdfg_json, content_hash, content_size, chained=False):
+        super().__init__(sdfg_json)
+        self.content_hash = content_hash
+        self.content_size = content_size
+        self.chained = chained
+
+
+def get_hash(sdfg_json):
+    """
+    Get the content hash of an SDFG in JSON format. The precomputed hash of a
+    `HashedJSON` is reused, and only plain JSON objects are serialized to
+    compute it.
+    :param sdfg_json:  The SDFG in JSON format.
+    """
+    if isinstance(sdfg_json, HashedJSON):
+        return sdfg_json.content_hash
+    return hash_json(sdfg_json)
+
+
+def get_content_hash(sdfg_json):
+    """
+    Get a hash of an SDFG in JSON format that only depends on its content,
+    for keys that must stay valid across edit histories and daemon runs.
+    Unlike `get_hash`, the chained hash of a patched `HashedJSON` is not
+    reused, and the SDFG is serialized to hash it instead.
+    :param sdfg_json:  The SDFG in JSON format.
+    """
+    if isinstance(sdfg_json, HashedJSON) and not sdfg_json.chained:
+        return sdfg_json.content_hash
+    return hash_json(sdfg_json)
+
+
+class SDFGCache:
+    """
+    A bounded LRU cache of deserialized SDFGs, keyed by the hash of their
+    canonical JSON representation. Cached SDFGs are never handed out directly,
+    callers always receive a deep copy they are free to modify.
+
+    The memory footprint of a cached SDFG is estimated through the size of its
+    canonical JSON representation, which the size of the deserialized object
+    graph is proportional to.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def load(self, sdfg_json):
+        """
+        Obtain an SDFG for the given JSON, deserializing it only if no SDFG
+        with the same content is cached.
+        :param sdfg_json:  The SDFG in JSON format.
+        :returns:          A private copy of the deserialized SDFG.
+        """
+        if isinstance(sdfg_json, HashedJSON):
+            key = sdfg_json.content_hash
+            size = sdfg_json.content_size
+        else:
+            key_json = canonical_json(sdfg_json)
+            key = hashlib.sha256(key_json.encode('utf-8')).hexdigest()
+            size = len(key_json)
+
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            sdfg, _ = self._entries[key]
+            return copy.deepcopy(sdfg)
+
+        # Lazy import DaCe, the daemon imports this module before DaCe is
+        # loaded.
+        from dace import SDFG
+
+        self.misses += 1
+        sdfg = SDFG.from_json(sdfg_json)
+        self._insert(key, sdfg, size)
+        return copy.deepcopy(sdfg)
+
+    def _insert(self, key, sdfg, size):
+        if size > self.max_bytes:
+            # Do not flush the entire cache for a single oversized SDFG.
+            return
+        self._entries[key] = (sdfg, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'size': self._size,
+            'maxSize': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+sdfg_cache = SDFGCache()
@@ -0,0 +1,186 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+import json
+
+from dace_vscode.utils import get_json_cfg_id, ids_to_string
+
+# Responses only contain a patch instead of the entire SDFG if the patch is at
+# most this fraction of the SDFG's size.
+MAX_PATCH_RATIO = 0.5
+
+# Keys of graph elements that hold child elements, which are compared on
+# their own.
+_CHILD_KEYS = ('nodes', 'edges')
+
+
+def compute_json_patch(old, new, path='', ops=None):
+    """
+    Compute a list of JSON patch operations (RFC 6902) that turns one JSON
+    value into another. Lists are compared element by element, elements are
+    appended to or removed from the end of lists. This mirrors
+    `computeJsonPatch` of the extension.
+    :param old:   The original JSON value.
+    :param new:   The JSON value to turn the original value into.
+    :param path:  JSON pointer to the location of the compared values.
+    :param ops:   List of operations to append to.
+    :returns:     The list of patch operations.
+    """
+    if ops is None:
+        ops = []
+    if old is new:
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            compute_json_patch(old[i], new[i], path + '/' + str(i), ops)
+        for i in range(common, len(new)):
+            ops.append({
+                'op': 'add',
+                'path': path + '/' + str(i),
+                'value': new[i],
+            })
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({
+                'op': 'remove',
+                'path': path + '/' + str(i),
+            })
+        return ops
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({
+                    'op': 'remove',
+                    'path': path + '/' + _escape(key),
+                })
+        for key, value in new.items():
+            child_path = path + '/' + _escape(key)
+            if key in old:
+                compute_json_patch(old[key], value, child_path, ops)
+            else:
+                ops.append({
+                    'op': 'add',
+                    'path': child_path,
+                    'value': value,
+                })
+        return ops
+
+    # Booleans compare equal to integers, but must not be mixed up.
+    if type(old) is not type(new) or old != new:
+        ops.append({
+            'op': 'replace',
+            'path': path,
+            'value': new,
+        })
+    return ops
+
+
+def _escape(key):
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _shallow(element):
+    shallow = {k: v for k, v in element.items() if k not in _CHILD_KEYS}
+    attributes = shallow.get('attributes')
+    if isinstance(attributes, dict) and isinstance(
+        attributes.get('sdfg'), dict
+    ):
+        # Nested SDFGs are compared on their own.
+        shallow['attributes'] = {
+            k: v for k, v in attributes.items() if k != 'sdfg'
+        }
+    return shallow
+
+
+def _flatten_state(state_json, cfg_id, state_id, elements):
+    for node in state_json.get('nodes', []):
+        elements[ids_to_string(cfg_id, state_id, node['id'])] = (
+            _shallow(node)
+        )
+        nested = node.get('attributes', {}).get('sdfg')
+        if isinstance(nested, dict):
+            nested_cfg_id = get_json_cfg_id(nested, None)
+            elements[ids_to_string(nested_cfg_id)] = _shallow(nested)
+            _flatten_graph(nested, nested_cfg_id, elements)
+    for i, edge in enumerate(state_json.get('edges', [])):
+        elements[ids_to_string(cfg_id, state_id, -1, i)] = edge
+
+
+def _flatten_graph(graph_json, cfg_id, elements):
+    for block in graph_json.get('nodes', []):
+        block_id = block['id']
+        elements[ids_to_string(cfg_id, block_id)] = _shallow(block)
+        if block.get('type') == 'SDFGState':
+            _flatten_state(block, cfg_id, block_id, elements)
+        elif 'nodes' in block:
+            # Control flow regions are graphs of their own.
+            _flatten_graph(block, get_json_cfg_id(block, cfg_id), elements)
+    for i, edge in enumerate(graph_json.get('edges', [])):
+        elements[ids_to_string(cfg_id, -1, -1, i)] = edge
+
+
+def _flatten(sdfg_json):
+    """
+    Map the IDs of all elements of an SDFG, in the format of
+    `utils.ids_to_string`, to the elements' JSON without their children.
+    """
+    cfg_id = get_json_cfg_id(sdfg_json, 0)
+    elements = {
+        ids_to_string(cfg_id): _shallow(sdfg_json),
+    }
+    _flatten_graph(sdfg_json, cfg_id, elements)
+    return elements
+
+
+def diff_sdfgs(old_json, new_json):
+    """
+    Compute the structural difference between two versions of an SDFG.
+    :param old_json:  The original SDFG in JSON format.
+    :param new_json:  The changed SDFG in JSON format.
+    :returns:         The IDs of all added, removed, and modified SDFGs,
+                      control flow blocks, nodes, and edges, where an element
+                      is modified if any of its properties changed.
+    """
+    old_elements = _flatten(old_json)
+    new_elements = _flatten(new_json)
+    return {
+        'added': [k for k in new_elements if k not in old_elements],
+        'removed': [k for k in old_elements if k not in new_elements],
+        'modified': [
+            k for k, v in new_elements.items()
+            if k in old_elements and old_elements[k] != v
+        ],
+    }
+
+
+def sdfg_diff_response(old_json, new_json, old_size=None, elements=False):
+    """
+    Build the response of a request that changed an SDFG, relative to the SDFG
+    the request was made with. Instead of the entire changed SDFG, the
+    response contains a JSON patch against the original SDFG in 'sdfgPatch',
+    unless the patch is not much smaller than the SDFG.
+    :param old_json:  The SDFG the request was made with, in JSON format.
+    :param new_json:  The changed SDFG in JSON format.
+    :param old_size:  Size of the original SDFG's JSON, to compare the size
+                      of the patch against. If None, the size recorded with a
+                      `HashedJSON` is used, and the SDFG is only serialized to
+                      measure it if there is none.
+    :param elements:  Whether to also include the structural difference (see
+                      `diff_sdfgs`) in 'sdfgDiff'.
+    """
+    response = {}
+    if elements:
+        response['sdfgDiff'] = diff_sdfgs(old_json, new_json)
+    patch = compute_json_patch(old_json, new_json)
+    if old_size is None:
+        old_size = getattr(old_json, 'content_size', None)
+    if old_size is None:
+        old_size = len(json.dumps(old_json, separators=(',', ':')))
+    if (len(json.dumps(patch, separators=(',', ':'))) <=
+            old_size * MAX_PATCH_RATIO):
+        response['sdfgPatch'] = patch
+    else:
+        response['sdfg'] = new_json
+    return response
@@ -0,0 +1,235 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+from collections import OrderedDict
+import hashlib
+
+from dace_vscode.sdfg_cache import HashedJSON, canonical_json
+
+# Maximum number of documents for which the daemon keeps the last SDFG.
+MAX_SESSIONS = 16
+
+
+class JSONPatchError(Exception):
+    pass
+
+
+def _parse_pointer(path):
+    if path == '':
+        return []
+    if not path.startswith('/'):
+        raise JSONPatchError('Invalid JSON pointer "' + path + '"')
+    return [
+        token.replace('~1', '/').replace('~0', '~')
+        for token in path[1:].split('/')
+    ]
+
+
+def _child_key(container, token, allow_end=False):
+    if isinstance(container, list):
+        if allow_end and token == '-':
+            return len(container)
+        try:
+            index = int(token)
+        except ValueError:
+            raise JSONPatchError('Invalid list index "' + token + '"')
+        upper = len(container) if allow_end else len(container) - 1
+        if index < 0 or index > upper:
+            raise JSONPatchError('List index ' + token + ' out of range')
+        return index
+    elif isinstance(container, dict):
+        if not allow_end and token not in container:
+            raise JSONPatchError('Missing key "' + token + '"')
+        return token
+    raise JSONPatchError('Cannot index into a scalar value')
+
+
+def _shallow_copy(container):
+    return list(container) if isinstance(container, list) else dict(container)
+
+
+def apply_json_patch(document, patch, size=None):
+    """
+    Apply a list of JSON patch operations (RFC 6902 'add', 'remove' and
+    'replace') to a JSON document. The input document is not modified, only
+    the containers along the patched paths are copied and everything else is
+    shared between the input and the returned document.
+    :param document:  The JSON document to patch.
+    :param patch:     List of patch operations.
+    :param size:      Optional size of the document's canonical JSON string,
+                      to estimate the patched document's size from. Only the
+                      added and removed values are serialized to do so.
+    :returns:         The patched document, or a tuple of the patched
+                      document and its estimated size if a size is given.
+    """
+    for operation in patch:
+        op = operation.get('op')
+        tokens = _parse_pointer(operation.get('path', ''))
+        if op not in ('add', 'remove', 'replace'):
+            raise JSONPatchError('Unsupported patch operation "' +
+                                 str(op) + '"')
+
+        if not tokens:
+            if op == 'remove':
+                raise JSONPatchError('Cannot remove the document root')
+            document = operation['value']
+            if size is not None:
+                size = len(canonical_json(document))
+            continue
+
+        root = _shallow_copy(document)
+        parent = root
+        for token in tokens[:-1]:
+            key = _child_key(parent, token)
+            parent[key] = _shallow_copy(parent[key])
+            parent = parent[key]
+
+        last = tokens[-1]
+        if op == 'add':
+            key = _child_key(parent, last, allow_end=True)
+            if (size is not None and isinstance(parent, dict) and
+                    key in parent):
+                size -= len(canonical_json(parent[key]))
+            if isinstance(parent, list):
+                parent.insert(key, operation['value'])
+            else:
+                parent[key] = operation['value']
+        else:
+            key = _child_key(parent, last)
+            if size is not None:
+                size -= len(canonical_json(parent[key]))
+            if op == 'remove':
+                del parent[key]
+            else:
+                parent[key] = operation['value']
+        if size is not None and op != 'remove':
+            size += len(canonical_json(operation['value']))
+        document = root
+    if size is not None:
+        return document, size
+    return document
+
+
+class DocumentSession:
+    """
+    The last SDFG the daemon has received for a given document. The SDFG's
+    hash acts as a version token, which the client has to present when sending
+    only a delta against this SDFG. Backend modules may keep further
+    per-document state in `caches`, which lives as long as the session.
+    The hash of a patched SDFG is a history hash, chained off the previous
+    version and the patch, so it differs from the content hash of the same
+    SDFG sent in full (see `sdfg_cache.get_content_hash`).
+    """
+
+    def __init__(self):
+        self.sdfg_json = None
+        self.caches = {}
+
+    @property
+    def sdfg_hash(self):
+        return self.sdfg_json.content_hash
+
+    def update(self, sdfg_json, content_hash, content_size, chained=False):
+        self.sdfg_json = HashedJSON(sdfg_json, content_hash, content_size,
+                                    chained)
+
+
+class SessionStore:
+    """ Bounded LRU store of document sessions, keyed by document ID. """
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+
+    def get(self, document_id):
+        session = self._sessions.get(document_id)
+        if session is not None:
+            self._sessions.move_to_end(document_id)
+        return session
+
+    def put(self, document_id, session):
+        self._sessions[document_id] = session
+        self._sessions.move_to_end(document_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def drop(self, document_id):
+        self._sessions.pop(document_id, None)
+
+    def resolve_sdfg(self, request_json):
+        """
+        Determine the SDFG a request operates on. Requests may either provide
+        the full SDFG in 'sdfg', or refer to the last SDFG of a document
+        session via 'document_id' and 'sdfg_hash', optionally along with a list
+        of JSON patch operations in 'sdfg_patch' to apply to it.
+        If the referenced session state is unknown to the daemon, a response
+        asking the client to resend the full SDFG is returned as the error.
+        :param request_json:  The entire provided request JSON.
+        """
+        document_id = request_json.get('document_id')
+        if 'sdfg' in request_json:
+            sdfg_json = request_json['sdfg']
+            if document_id is None or 'error' in sdfg_json:
+                return {
+                    'error': None,
+                    'sdfg': sdfg_json,
+                    'session': None,
+                }
+            key_json = canonical_json(sdfg_json)
+            session = self.get(document_id)
+            if session is None:
+                session = DocumentSession()
+                self.put(document_id, session)
+            session.update(
+                sdfg_json,
+                hashlib.sha256(key_json.encode('utf-8')).hexdigest(),
+                len(key_json)
+            )
+            return {
+                'error': None,
+                'sdfg': session.sdfg_json,
+                'session': session,
+            }
+
+        session = self.get(document_id)
+        if (session is None or
+                session.sdfg_hash != request_json.get('sdfg_hash')):
+            return {
+                'error': {
+                    'resync': True,
+                },
+                'sdfg': None,
+                'session': None,
+            }
+
+        patch = request_json.get('sdfg_patch')
+        if patch:
+            try:
+                patched, patched_size = apply_json_patch(
+                    session.sdfg_json, patch, session.sdfg_json.content_size
+                )
+            except (JSONPatchError, KeyError, TypeError) as e:
+                self.drop(document_id)
+                return {
+                    'error': {
+                        'resync': True,
+                        'details': str(e),
+                    },
+                    'sdfg': None,
+                    'session': None,
+                }
+            # The new version token is chained off the previous one, which
+            # avoids re-serializing the entire SDFG to hash it.
+            patched_hash = hashlib.sha256(
+                (session.sdfg_hash + canonical_json(patch)).encode('utf-8')
+            ).hexdigest()
+            session.update(patched, patched_hash, patched_size, chained=True)
+
+        return {
+            'error': None,
+            'sdfg': session.sdfg_json,
+            'session': session,
+        }
+
+
+sessions = SessionStore()
@@ -0,0 +1,185 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+from collections import OrderedDict
+
+import sympy as sp
+
+from dace_vscode.worker_pool import simplify_pool
+
+# Number of simplified expressions remembered across analyses.
+SIMPLIFY_CACHE_SIZE = 65536
+
+# Expressions with at most this many operations after the cheap
+# normalizations are not simplified any further.
+FULL_SIMPLIFY_MIN_OPS = 4
+
+# Expressions with more than this many operations after the cheap
+# normalizations are not fully simplified either, since `sympy.simplify` may
+# take arbitrarily long on them. Bounding full simplification by the size of
+# expressions rather than by time keeps the results deterministic.
+FULL_SIMPLIFY_MAX_OPS = 48
+
+# Minimum number of expressions to simplify for it to be worth distributing
+# them across the worker processes.
+PARALLEL_MIN_EXPRESSIONS = 16
+
+# Maps expressions to their simplified form.
+_simplified = OrderedDict()
+
+
+def _normalize(expr):
+    """
+    Apply the cheap normalizations to an expression and pick the shortest
+    result.
+    """
+    candidates = [expr]
+    for normalization in (sp.cancel, sp.powsimp, sp.expand):
+        try:
+            candidates.append(normalization(expr))
+        except Exception:
+            # Not all normalizations support all kinds of expressions.
+            pass
+    return min(candidates, key=sp.count_ops)
+
+
+def _needs_full_simplify(expr):
+    return FULL_SIMPLIFY_MIN_OPS < sp.count_ops(expr) <= FULL_SIMPLIFY_MAX_OPS
+
+
+def _full_simplify(expr):
+    try:
+        simplified = sp.simplify(expr)
+        if sp.count_ops(simplified) < sp.count_ops(expr):
+            return simplified
+    except Exception:
+        pass
+    return expr
+
+
+def simplify_fully(expr):
+    """
+    Normalize and, if necessary, fully simplify an expression. The result
+    only depends on the expression.
+    """
+    simplified = _normalize(expr)
+    if _needs_full_simplify(simplified):
+        simplified = _full_simplify(simplified)
+    return simplified
+
+
+def _remember(expr, simplified):
+    _simplified[expr] = simplified
+    _simplified.move_to_end(expr)
+    while len(_simplified) > SIMPLIFY_CACHE_SIZE:
+        _simplified.popitem(last=False)
+
+
+def clear_cache():
+    _simplified.clear()
+
+
+class Simplifier:
+    """
+    Simplifies the symbolic expressions of one analysis. Results are memoized
+    across analyses, since elements of the same (or a slightly changed) SDFG
+    share most of their expressions. Expressions are first normalized with
+    cheap rewrites, and only fully simplified with `sympy.simplify` if they
+    are neither trivial nor too large for that (see `simplify_fully`).
+    If the simplification pool is enabled, large batches of expressions are
+    instead simplified in parallel, with a time limit per expression. An
+    expression that exceeds it is only normalized, which makes the result
+    depend on timing, so it is not memoized and `complete` is cleared to keep
+    the analysis from persisting its results.
+    """
+
+    def __init__(self):
+        self.complete = True
+
+    def simplify(self, expr):
+        """
+        Simplify a symbolic expression.
+        :param expr:  The expression to simplify.
+        :returns:     The simplified expression.
+        """
+        expr = sp.sympify(expr)
+        if expr in _simplified:
+            _simplified.move_to_end(expr)
+            return _simplified[expr]
+        simplified = simplify_fully(expr)
+        _remember(expr, simplified)
+        return simplified
+
+    def simplify_all(self, exprs):
+        """
+        Simplify a list of symbolic expressions.
+        :param exprs:  The expressions to simplify.
+        :returns:      List of the simplified expressions.
+        """
+        exprs = [sp.sympify(expr) for expr in exprs]
+        pending = list(OrderedDict.fromkeys(
+            expr for expr in exprs if expr not in _simplified
+        ))
+        if (not simplify_pool.enabled or
+                len(pending) < PARALLEL_MIN_EXPRESSIONS):
+            return [self.simplify(expr) for expr in exprs]
+
+        results = {}
+        for expr, simplified in zip(pending, simplify_pool.simplify(pending)):
+            if simplified is None:
+                # Timed out, fall back to the normalized expression.
+                results[expr] = _normalize(expr)
+                self.complete = False
+            else:
+                _remember(expr, simplified)
+        return [
+            results[expr] if expr in results else self.simplify(expr)
+            for expr in exprs
+        ]
+
+    def simplify_ratios(self, ratios):
+        """
+        Simplify the ratios of pairs of expressions. A ratio is 0 if its
+        denominator is 0.
+        :param ratios:  List of (numerator, denominator) pairs.
+        :returns:       List of the simplified ratios.
+        """
+        indices = []
+        exprs = []
+        for i, (numerator, denominator) in enumerate(ratios):
+            if str(denominator) != '0':
+                indices.append(i)
+                exprs.append(sp.sympify(numerator) / sp.sympify(denominator))
+        results = [0] * len(ratios)
+        for i, simplified in zip(indices, self.simplify_all(exprs)):
+            results[i] = simplified
+        return results
+
+
+def simplify_expressions(expressions):
+    """
+    Simplify expressions in their string form, e.g. raw analysis results once
+    they are displayed.
+    :param expressions:  List of expression strings.
+    :returns:            A map from each expression to its simplified string.
+    """
+    from dace.symbolic import pystr_to_symbolic
+    from dace_vscode.utils import get_exception_message
+
+    try:
+        simplified = Simplifier().simplify_all(
+            [pystr_to_symbolic(expr) for expr in expressions]
+        )
+        return {
+            'simplified': {
+                expr: str(result)
+                for expr, result in zip(expressions, simplified)
+            },
+        }
+    except Exception as e:
+        return {
+            'error': {
+                'message': 'Failed to simplify expressions',
+                'details': get_exception_message(e),
+            },
+        }
@@ -0,0 +1,79 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+from dace_vscode.utils import (get_exception_message, load_sdfg_from_json,
+                               store_metadata)
+
+# Empty SDFG the constants of specializations are serialized with.
+_scratch_sdfg = None
+
+
+def _constants_to_json(constants):
+    """
+    Serialize constants exactly like they appear in the `constants_prop` of an
+    SDFG specialized with them, without needing that SDFG.
+    """
+    global _scratch_sdfg
+
+    from dace import SDFG
+
+    if _scratch_sdfg is None:
+        _scratch_sdfg = SDFG('specialization')
+    _scratch_sdfg.constants_prop = {}
+    _scratch_sdfg.specialize(constants)
+    with store_metadata(False):
+        for prop, value in _scratch_sdfg.properties():
+            if prop.attr_name == 'constants_prop':
+                return prop.to_json(value)
+    return {}
+
+
+def specialize_symbols(sdfg_json, symbol_maps, remove_undef=True):
+    """
+    Compute how specializing an SDFG for symbol values changes its constants,
+    without deserializing or re-serializing the SDFG. Specializing only binds
+    symbols to constants, so the result is the same as that of
+    `specialize_sdfg`, restricted to the changed `constants_prop` entries.
+    :param sdfg_json:     The SDFG in JSON format.
+    :param symbol_maps:   List of maps from symbol names to values, each of
+                          which the SDFG is specialized for separately.
+    :param remove_undef:  Whether to remove constants that are not defined in
+                          a symbol map, or have a value of None or 0 in it.
+    :returns:             For each symbol map, the constants to set (in their
+                          JSON representation) in 'set', and the names of
+                          constants to remove in 'removed'.
+    """
+    if 'error' in sdfg_json:
+        return load_sdfg_from_json(sdfg_json)['error']
+
+    try:
+        attributes = sdfg_json.get('attributes') or {}
+        constants = attributes.get('constants_prop') or {}
+        specializations = []
+        for symbol_map in symbol_maps:
+            new_constants = dict(constants)
+            new_constants.update(_constants_to_json({
+                k: int(v) for k, v in symbol_map.items() if v is not None
+            }))
+            if remove_undef:
+                for key in list(new_constants.keys()):
+                    if (key not in symbol_map or symbol_map[key] is None or
+                            symbol_map[key] == 0):
+                        del new_constants[key]
+            specializations.append({
+                'set': {
+                    k: v for k, v in new_constants.items()
+                    if k not in constants or constants[k] != v
+                },
+                'removed': [k for k in constants if k not in new_constants],
+            })
+        return {
+            'specializations': specializations,
+        }
+    except Exception as e:
+        return {
+            'error': {
+                'message': 'Failed to specialize SDFG',
+                'details': get_exception_message(e),
+            },
+        }
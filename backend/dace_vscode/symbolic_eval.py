@@ -0,0 +1,100 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+import itertools
+
+import numpy as np
+import sympy as sp
+
+from dace.symbolic import pystr_to_symbolic
+
+# NumPy implementations of DaCe's symbolic functions, for functions sympy
+# does not know how to translate on its own.
+_NUMPY_FUNCTIONS = {
+    'int_floor': lambda a, b: np.floor_divide(a, b),
+    'int_ceil': lambda a, b: -np.floor_divide(-a, b),
+    'OR': np.logical_or,
+    'AND': np.logical_and,
+    'Mod': np.mod,
+}
+
+
+def _to_json_values(values, num_points):
+    values = np.broadcast_to(np.asarray(values, dtype=np.float64),
+                             (num_points,))
+    return [float(v) if np.isfinite(v) else None for v in values]
+
+
+def evaluate_maps(maps, symbol_values=None, sweep=None):
+    """
+    Numerically evaluate maps of symbolic expressions, such as the results of
+    the work depth analysis, for concrete symbol values. All expressions are
+    compiled into a single NumPy function, which evaluates them in one
+    vectorized batch, also across all points of a sweep.
+    :param maps:           Dictionary of maps from element keys to expression
+                           strings.
+    :param symbol_values:  Dictionary of values for symbols.
+    :param sweep:          Optional dictionary of lists of values for symbols
+                           to sweep over. All combinations of these values are
+                           evaluated.
+    :returns:              For each map, a map from element keys to the value,
+                           or to the list of values at each sweep point if a
+                           sweep is given. Expressions that contain unbound
+                           symbols or do not evaluate to a finite number have
+                           a value of None. If a sweep is given, the symbol
+                           values at each sweep point are listed in 'points'.
+    """
+    symbol_values = dict(symbol_values or {})
+    sweep = dict(sweep or {})
+
+    sweep_names = list(sweep.keys())
+    grid = list(itertools.product(*[sweep[name] for name in sweep_names]))
+    num_points = len(grid)
+    bindings = {
+        name: np.full(num_points, value, dtype=np.float64)
+        for name, value in symbol_values.items()
+    }
+    for i, name in enumerate(sweep_names):
+        bindings[name] = np.array([point[i] for point in grid],
+                                  dtype=np.float64)
+
+    # Parse and deduplicate the expressions of all maps.
+    expressions = {}
+    for entries in maps.values():
+        for expr_string in entries.values():
+            if expr_string not in expressions:
+                expressions[expr_string] = pystr_to_symbolic(expr_string)
+
+    bound = [
+        expr_string for expr_string, expr in expressions.items()
+        if all(str(s) in bindings for s in expr.free_symbols)
+    ]
+    symbols = sorted(
+        set(s for expr_string in bound
+            for s in expressions[expr_string].free_symbols),
+        key=str
+    )
+    values = {}
+    if bound:
+        evaluate = sp.lambdify(
+            symbols, [expressions[expr_string] for expr_string in bound],
+            modules=[_NUMPY_FUNCTIONS, 'numpy']
+        )
+        with np.errstate(all='ignore'):
+            results = evaluate(*[bindings[str(s)] for s in symbols])
+        for expr_string, result in zip(bound, results):
+            values[expr_string] = _to_json_values(result, num_points)
+
+    evaluated = {}
+    for name, entries in maps.items():
+        evaluated[name] = {}
+        for key, expr_string in entries.items():
+            value = values.get(expr_string)
+            if value is None:
+                value = [None] * num_points
+            evaluated[name][key] = value if sweep_names else value[0]
+    if sweep_names:
+        evaluated['points'] = {
+            name: bindings[name].tolist() for name in sweep_names
+        }
+    return evaluated
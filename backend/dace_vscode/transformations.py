@@ -5,8 +5,16 @@ from dace import nodes, serialize, config as dc_config
 from dace.transformation.transformation import (SubgraphTransformation,
                                                 PatternTransformation)
 from dace.transformation.pass_pipeline import Pass, Pipeline
-from dace_vscode import utils
+from dace_vscode import checkpoints, utils
+from dace_vscode.worker_pool import (SDFG_MISSING, run_sdfg_tasks,
+                                     worker_pool, worker_sdfg)
+from dace_vscode.sdfg_cache import (HashedJSON, canonical_json, get_hash,
+                                    hash_json)
+import copy
+import hashlib
+import inspect
 import sys
+import time
 import traceback
 import importlib.util
 
@@ -16,212 +24,362 @@ def expand_library_node(json_in):
     is provided, expand all library nodes in the given SDFG.
     :param json_in:  The entire provided request JSON.
     """
-    old_meta = utils.disable_save_metadata()
+    with utils.store_metadata(False):
+        sdfg = None
+        try:
+            loaded = utils.load_sdfg_from_json(json_in['sdfg'])
+            if loaded['error'] is not None:
+                return loaded['error']
+            sdfg = loaded['sdfg']
+        except KeyError:
+            return {
+                'error': {
+                    'message': 'Failed to expand library node',
+                    'details': 'No SDFG provided',
+                },
+            }
+
+        try:
+            cfg_id, state_id, node_id = json_in['nodeid']
+        except KeyError:
+            cfg_id, state_id, node_id = None, None, None
+
+        try:
+            if cfg_id is None:
+                sdfg.expand_library_nodes()
+            else:
+                if hasattr(sdfg, 'cfg_list'):
+                    context_sdfg = sdfg.cfg_list[cfg_id]
+                else:
+                    context_sdfg = sdfg.sdfg_list[cfg_id]
+                state = context_sdfg.node(state_id)
+                node = state.node(node_id)
+                if isinstance(node, nodes.LibraryNode):
+                    node.expand(context_sdfg, state)
+                else:
+                    return {
+                        'error': {
+                            'message': 'Failed to expand library node',
+                            'details':
+                                'The provided node is not a valid library node',
+                        },
+                    }
+
+            new_sdfg = sdfg.to_json()
+            return {
+                'sdfg': new_sdfg,
+            }
+        except Exception as e:
+            return {
+                'error': {
+                    'message': 'Failed to expand library node',
+                    'details': utils.get_exception_message(e),
+                },
+            }
+
+
+def _reapply_transformation(original_sdfg, transformation):
+    # We lazy import DaCe, not to break cyclic imports, but to avoid any large
+    # delays when booting in daemon mode.
+    from dace import SDFG
 
-    sdfg = None
+    if hasattr(transformation, 'cfg_id'):
+        target_cfg = original_sdfg.cfg_list[transformation.cfg_id]
+        transformation._sdfg = (
+            target_cfg
+            if isinstance(target_cfg, SDFG)
+            else target_cfg.sdfg
+        )
+        if isinstance(transformation, SubgraphTransformation):
+            transformation._sdfg.append_transformation(transformation)
+            transformation.apply(
+                original_sdfg.cfg_list[transformation.cfg_id]
+            )
+        else:
+            transformation.apply_pattern(
+                original_sdfg.cfg_list[transformation.cfg_id]
+            )
+    else:
+        transformation._sdfg = original_sdfg.sdfg_list[
+            transformation.sdfg_id
+        ]
+        if isinstance(transformation, SubgraphTransformation):
+            transformation._sdfg.append_transformation(transformation)
+            transformation.apply(
+                original_sdfg.sdfg_list[transformation.sdfg_id]
+            )
+        else:
+            transformation.apply_pattern(
+                original_sdfg.sdfg_list[transformation.sdfg_id]
+            )
+
+
+def _get_history_keys(sdfg_json):
     try:
-        loaded = utils.load_sdfg_from_json(json_in['sdfg'])
+        attributes = sdfg_json['attributes']
+        orig_sdfg_json = attributes['orig_sdfg']
+        history_json = attributes['transformation_hist']
+    except (KeyError, TypeError):
+        return None, 0
+    if orig_sdfg_json is None or history_json is None:
+        return None, 0
+    return checkpoints.get_history_keys(orig_sdfg_json, history_json)
+
+
+def reapply_history_until(sdfg_json, index):
+    """
+    Rewind a given SDFG back to a specific point in its history by reapplying
+    all transformations until a given index in its history to its original
+    state. Intermediate SDFGs are checkpointed along the way, and replaying
+    starts from the latest checkpoint before the given index, so moving
+    around in a long history only reapplies a few transformations.
+    :param sdfg_json:  The SDFG to rewind.
+    :param index:      Index of the last history item to apply.
+    """
+    with utils.store_metadata(False):
+        loaded = utils.load_sdfg_from_json(sdfg_json)
         if loaded['error'] is not None:
             return loaded['error']
         sdfg = loaded['sdfg']
-    except KeyError:
-        return {
-            'error': {
-                'message': 'Failed to expand library node',
-                'details': 'No SDFG provided',
-            },
-        }
 
-    try:
-        cfg_id, state_id, node_id = json_in['nodeid']
-    except KeyError:
-        cfg_id, state_id, node_id = None, None, None
+        original_sdfg = sdfg.orig_sdfg
+        history = sdfg.transformation_hist
 
-    try:
-        if cfg_id is None:
-            sdfg.expand_library_nodes()
-        else:
-            if hasattr(sdfg, 'cfg_list'):
-                context_sdfg = sdfg.cfg_list[cfg_id]
-            else:
-                context_sdfg = sdfg.sdfg_list[cfg_id]
-            state = context_sdfg.node(state_id)
-            node = state.node(node_id)
-            if isinstance(node, nodes.LibraryNode):
-                node.expand(context_sdfg, state)
-            else:
+        keys, size = _get_history_keys(sdfg_json)
+        if keys is not None and len(keys) != len(history) + 1:
+            keys = None
+        start = 0
+        if keys is not None:
+            checkpoint_index, checkpoint = (
+                checkpoints.history_checkpoints.find_latest(keys, index)
+            )
+            if checkpoint is not None:
+                original_sdfg = checkpoint
+                start = checkpoint_index + 1
+
+        for i in range(start, index + 1):
+            try:
+                step_start = time.perf_counter()
+                _reapply_transformation(original_sdfg, history[i])
+                step_time = time.perf_counter() - step_start
+            except Exception as e:
+                print(traceback.format_exc(), file=sys.stderr)
+                sys.stderr.flush()
+                hist_nr = i + 1
+                hist_nr_string = str(hist_nr)
+                if (hist_nr - 1) % 10 == 0 and (hist_nr) != 11:
+                    hist_nr_string += 'st'
+                elif (hist_nr - 2) % 10 == 0 and hist_nr != 12:
+                    hist_nr_string += 'nd'
+                else:
+                    hist_nr_string += 'th'
                 return {
                     'error': {
-                        'message': 'Failed to expand library node',
-                        'details':
-                            'The provided node is not a valid library node',
+                        'message': (
+                            'Failed to play back the transformation history, ' +
+                            'failed at ' + hist_nr_string + ' history point'
+                        ),
+                        'details': utils.get_exception_message(e),
                     },
                 }
 
-        new_sdfg = sdfg.to_json()
-        utils.restore_save_metadata(old_meta)
+            if keys is not None and (
+                (i + 1) % checkpoints.CHECKPOINT_INTERVAL == 0 or
+                step_time >= checkpoints.EXPENSIVE_STEP_TIME or
+                i == index
+            ):
+                checkpoints.history_checkpoints.put(keys[i + 1],
+                                                    original_sdfg, size)
+
+        new_sdfg = original_sdfg.to_json()
         return {
             'sdfg': new_sdfg,
         }
-    except Exception as e:
-        return {
-            'error': {
-                'message': 'Failed to expand library node',
-                'details': utils.get_exception_message(e),
-            },
-        }
 
 
-def reapply_history_until(sdfg_json, index):
+def _apply_transformation(sdfg, transformation, annotate=True):
     # We lazy import DaCe, not to break cyclic imports, but to avoid any large
     # delays when booting in daemon mode.
     from dace import SDFG
 
+    if isinstance(transformation, PatternTransformation):
+        if hasattr(transformation, 'cfg_id'):
+            target_cfg = sdfg.cfg_list[transformation.cfg_id]
+            transformation._sdfg = (
+                target_cfg.sdfg
+                if not isinstance(target_cfg, SDFG)
+                else target_cfg
+            )
+        else:
+            target_cfg = sdfg.sdfg_list[transformation.sdfg_id]
+            transformation._sdfg = target_cfg
+        if isinstance(transformation, SubgraphTransformation):
+            sdfg.append_transformation(transformation)
+            transformation.apply(target_cfg)
+        elif annotate or 'annotate' not in inspect.signature(
+            transformation.apply_pattern
+        ).parameters:
+            transformation.apply_pattern(target_cfg)
+        else:
+            transformation.apply_pattern(target_cfg, annotate=False)
+    elif isinstance(transformation, Pipeline):
+        pipeline_results = dict()
+        transformation.apply_pass(sdfg, pipeline_results)
+    elif isinstance(transformation, Pass):
+        # Convert passes to pipelines to ensure all dependencies are
+        # run.
+        pipeline_results = dict()
+        pipeline = Pipeline([transformation])
+        pipeline.apply_pass(sdfg, pipeline_results)
+    else:
+        raise Exception('Invalid transformation type')
+
+
+def _validate_batch(sdfg):
     """
-    Rewind a given SDFG back to a specific point in its history by reapplying
-    all transformations until a given index in its history to its original
-    state.
-    :param sdfg_json:  The SDFG to rewind.
-    :param index:      Index of the last history item to apply.
+    Bring an SDFG a batch of transformations was applied to up to date and
+    validate it.
     """
-    old_meta = utils.disable_save_metadata()
+    from dace.sdfg.propagation import propagate_memlets_sdfg
 
-    loaded = utils.load_sdfg_from_json(sdfg_json)
-    if loaded['error'] is not None:
-        return loaded['error']
-    sdfg = loaded['sdfg']
+    propagate_memlets_sdfg(sdfg)
+    sdfg.validate()
 
-    original_sdfg = sdfg.orig_sdfg
-    history = sdfg.transformation_hist
 
-    for i in range(index + 1):
-        try:
-            transformation = history[i]
-
-            if hasattr(transformation, 'cfg_id'):
-                target_cfg = original_sdfg.cfg_list[transformation.cfg_id]
-                transformation._sdfg = (
-                    target_cfg
-                    if isinstance(target_cfg, SDFG)
-                    else target_cfg.sdfg
-                )
-                if isinstance(transformation, SubgraphTransformation):
-                    transformation._sdfg.append_transformation(transformation)
-                    transformation.apply(
-                        original_sdfg.cfg_list[transformation.cfg_id]
-                    )
-                else:
-                    transformation.apply_pattern(
-                        original_sdfg.cfg_list[transformation.cfg_id]
-                    )
-            else:
-                transformation._sdfg = original_sdfg.sdfg_list[
-                    transformation.sdfg_id
-                ]
-                if isinstance(transformation, SubgraphTransformation):
-                    transformation._sdfg.append_transformation(transformation)
-                    transformation.apply(
-                        original_sdfg.sdfg_list[transformation.sdfg_id]
-                    )
-                else:
-                    transformation.apply_pattern(
-                        original_sdfg.sdfg_list[transformation.sdfg_id]
-                    )
-        except Exception as e:
+def apply_transformations(sdfg_json, transformation_json_list,
+                          validate_every=None, rollback=False):
+    """
+    Apply a list of transformations to an SDFG, one after the other.
+    :param sdfg_json:                 The SDFG to transform.
+    :param transformation_json_list:  List of transformations in JSON format.
+    :param validate_every:            If None, apply the transformations
+                                      without validating the result. Otherwise,
+                                      apply them as a batch: memlets are only
+                                      propagated and the SDFG only validated
+                                      after every `validate_every`
+                                      transformations, or only once at the end
+                                      if 0.
+    :param rollback:                  In batch mode, whether to return the SDFG
+                                      as of the last successful validation if
+                                      a transformation fails or the SDFG does
+                                      not validate, instead of an error. The
+                                      failure is reported in 'failed', with
+                                      the index of the transformation that
+                                      failed or after which validation failed,
+                                      along with the number of transformations
+                                      the returned SDFG has applied in
+                                      'applied'. Transformations that cannot
+                                      be parsed are always reported as an
+                                      error, before any are applied.
+    :returns:                         The transformed SDFG, and the time in
+                                      seconds it took to apply each
+                                      transformation in 'timings'.
+    """
+    batch = validate_every is not None
+    with utils.store_metadata(False):
+        loaded = utils.load_sdfg_from_json(sdfg_json)
+        if loaded['error'] is not None:
+            return loaded['error']
+        sdfg = loaded['sdfg']
+
+        # All transformations are parsed up front, so malformed requests fail
+        # as a whole rather than as a partial application.
+        transformations = []
+        for transformation_json in transformation_json_list:
+            try:
+                transformation = serialize.from_json(transformation_json)
+                if not isinstance(transformation, (PatternTransformation,
+                                                   SubgraphTransformation,
+                                                   Pass)):
+                    raise ValueError('Unknown transformation type')
+            except Exception as e:
+                print(traceback.format_exc(), file=sys.stderr)
+                sys.stderr.flush()
+                return {
+                    'error': {
+                        'message': 'Failed to parse the applied ' +
+                                   'transformation',
+                        'details': utils.get_exception_message(e),
+                    },
+                }
+            transformations.append(transformation)
+
+        timings = []
+        validation_time = 0.0
+        # The state of the SDFG as of the last successful validation, and the
+        # number of transformations applied to it.
+        last_good = copy.deepcopy(sdfg) if batch and rollback else None
+        last_good_count = 0
+
+        def _failed(message, e, index):
             print(traceback.format_exc(), file=sys.stderr)
             sys.stderr.flush()
-            hist_nr = i + 1
-            hist_nr_string = str(hist_nr)
-            if (hist_nr - 1) % 10 == 0 and (hist_nr) != 11:
-                hist_nr_string += 'st'
-            elif (hist_nr - 2) % 10 == 0 and hist_nr != 12:
-                hist_nr_string += 'nd'
-            else:
-                hist_nr_string += 'th'
+            error = {
+                'message': message,
+                'details': utils.get_exception_message(e),
+            }
+            if last_good is None:
+                return {
+                    'error': error,
+                }
+            error['index'] = index
             return {
-                'error': {
-                    'message': (
-                        'Failed to play back the transformation history, ' +
-                        'failed at ' + hist_nr_string + ' history point'
-                    ),
-                    'details': utils.get_exception_message(e),
-                },
+                'sdfg': last_good.to_json(),
+                'applied': last_good_count,
+                'failed': error,
+                'timings': timings,
+                'validationTime': validation_time,
             }
 
-    new_sdfg = original_sdfg.to_json()
-    utils.restore_save_metadata(old_meta)
-    return {
-        'sdfg': new_sdfg,
-    }
+        num_transformations = len(transformations)
+        for i, transformation in enumerate(transformations):
+            try:
+                start = time.perf_counter()
+                _apply_transformation(sdfg, transformation, not batch)
+                timings.append(time.perf_counter() - start)
+            except Exception as e:
+                return _failed(
+                    'Failed to apply the transformation to the SDFG', e, i
+                )
 
+            if batch and (
+                i + 1 == num_transformations or
+                (validate_every > 0 and (i + 1) % validate_every == 0)
+            ):
+                try:
+                    start = time.perf_counter()
+                    _validate_batch(sdfg)
+                    validation_time += time.perf_counter() - start
+                except Exception as e:
+                    return _failed(
+                        'The SDFG failed to validate after applying ' +
+                        'transformations', e, i
+                    )
+                if rollback and i + 1 < num_transformations:
+                    last_good = copy.deepcopy(sdfg)
+                    last_good_count = i + 1
 
-def apply_transformations(sdfg_json, transformation_json_list):
-    # We lazy import DaCe, not to break cyclic imports, but to avoid any large
-    # delays when booting in daemon mode.
-    from dace import SDFG
+        new_sdfg = sdfg.to_json()
+        response = {
+            'sdfg': new_sdfg,
+            'timings': timings,
+        }
+        if batch:
+            response['applied'] = num_transformations
+            response['validationTime'] = validation_time
+        return response
 
-    old_meta = utils.disable_save_metadata()
 
-    loaded = utils.load_sdfg_from_json(sdfg_json)
-    if loaded['error'] is not None:
-        return loaded['error']
-    sdfg = loaded['sdfg']
+# Content hashes of all loaded custom transformation files, by path.
+_custom_transformation_hashes = {}
 
-    for transformation_json in transformation_json_list:
-        try:
-            transformation = serialize.from_json(transformation_json)
-        except Exception as e:
-            print(traceback.format_exc(), file=sys.stderr)
-            sys.stderr.flush()
-            return {
-                'error': {
-                    'message': 'Failed to parse the applied transformation',
-                    'details': utils.get_exception_message(e),
-                },
-            }
-        try:
-            if isinstance(transformation, PatternTransformation):
-                if hasattr(transformation, 'cfg_id'):
-                    target_cfg = sdfg.cfg_list[transformation.cfg_id]
-                    transformation._sdfg = (
-                        target_cfg.sdfg
-                        if not isinstance(target_cfg, SDFG)
-                        else target_cfg
-                    )
-                else:
-                    target_cfg = sdfg.sdfg_list[transformation.sdfg_id]
-                    transformation._sdfg = target_cfg
-                if isinstance(transformation, SubgraphTransformation):
-                    sdfg.append_transformation(transformation)
-                    transformation.apply(target_cfg)
-                else:
-                    transformation.apply_pattern(target_cfg)
-            elif isinstance(transformation, Pipeline):
-                pipeline_results = dict()
-                transformation.apply_pass(sdfg, pipeline_results)
-            elif isinstance(transformation, Pass):
-                # Convert passes to pipelines to ensure all dependencies are
-                # run.
-                pipeline_results = dict()
-                pipeline = Pipeline([transformation])
-                pipeline.apply_pass(sdfg, pipeline_results)
-            else:
-                raise Exception('Invalid transformation type')
-        except Exception as e:
-            print(traceback.format_exc(), file=sys.stderr)
-            sys.stderr.flush()
-            return {
-                'error': {
-                    'message': 'Failed to apply the transformation to the SDFG',
-                    'details': utils.get_exception_message(e),
-                },
-            }
 
-    new_sdfg = sdfg.to_json()
-    utils.restore_save_metadata(old_meta)
-    return {
-        'sdfg': new_sdfg,
-    }
+def get_custom_transformations_hash():
+    """
+    Get a hash identifying the set of loaded custom transformations and their
+    contents.
+    """
+    return hash_json(sorted(_custom_transformation_hashes.items()))
 
 
 def add_custom_transformations(filepaths):
@@ -234,6 +392,10 @@ def add_custom_transformations(filepaths):
                 xf_module = importlib.util.module_from_spec(xf_module_spec)
                 sys.modules[xf_path] = xf_module
                 xf_module_spec.loader.exec_module(xf_module)
+                with open(xf_path, 'rb') as fp:
+                    _custom_transformation_hashes[xf_path] = hashlib.sha256(
+                        fp.read()
+                    ).hexdigest()
         return {
             'done': True,
         }
@@ -246,131 +408,452 @@ def add_custom_transformations(filepaths):
         }
 
 
-def get_transformations(sdfg_json, selected_elements, permissive):
-    # We lazy import DaCe, not to break cyclic imports, but to avoid any large
-    # delays when booting in daemon mode.
+def _class_key(cls):
+    return cls.__module__ + '.' + cls.__qualname__
+
+
+def _get_pattern_classes(sdfg):
+    """
+    Obtain all registered pattern transformations in a stable order, which is
+    identical across processes.
+    """
     from dace.transformation.optimizer import SDFGOptimizer
-    from dace.transformation import passes
-    from dace.sdfg.graph import SubgraphView
 
-    old_meta = utils.disable_save_metadata()
+    patterns = getattr(SDFGOptimizer(sdfg), 'patterns', None)
+    if patterns is None:
+        patterns = PatternTransformation.subclasses_recursive()
+    return sorted(patterns, key=_class_key)
 
-    loaded = utils.load_sdfg_from_json(sdfg_json)
-    if loaded['error'] is not None:
-        return loaded['error']
-    sdfg = loaded['sdfg']
 
-    with dc_config.set_temporary('testing',
-                                 'serialize_all_fields',
-                                 value=True):
-        try:
-            optimizer = SDFGOptimizer(sdfg)
-            try:
-                matches = optimizer.get_pattern_matches(permissive=permissive)
-            except TypeError:
-                # Compatibility with versions older than 0.12
-                matches = optimizer.get_pattern_matches(strict=not permissive)
-
-            transformations = []
-            docstrings = {}
-            for transformation in matches:
-                transformations.append(transformation.to_json())
-                docstrings[type(transformation).__name__] = \
-                    transformation.__doc__
-
-            # Obtain available passes.
-            try:
-                all_passes = passes.available_passes(False)
-                for ps in all_passes:
-                    if ps.CATEGORY == 'Helper' or ps.CATEGORY == 'Analysis':
-                        continue
-                    docstrings[ps.__name__] = ps.__doc__
-                    pass_instance = ps()
-                    transformations.append(pass_instance.to_json())
-            except (NameError, AttributeError):
-                # Compatibility with legacy versions where no method for getting
-                # available passes exists.
-                pass
-
-            selected_states = [
-                utils.sdfg_find_state_from_element(sdfg, n)
-                for n in selected_elements
-                if n['type'] == 'state'
-            ]
-            selected_nodes = [
-                utils.sdfg_find_node_from_element(sdfg, n)
-                for n in selected_elements
-                if n['type'] == 'node'
-            ]
-            selected_cfg_ids = list(
-                set(elem['cfgId'] for elem in selected_elements)
-            )
-            selected_sdfg = sdfg
-            if len(selected_cfg_ids) > 1:
-                return {
-                    'transformations': transformations,
-                    'docstrings': docstrings,
-                    'warnings': 'More than one CFG selected, ignoring subgraph',
-                }
-            elif len(selected_cfg_ids) == 1:
-                if hasattr(sdfg, 'cfg_list'):
-                    selected_sdfg = sdfg.cfg_list[selected_cfg_ids[0]]
-                else:
-                    selected_sdfg = sdfg.sdfg_list[selected_cfg_ids[0]]
+def _get_subgraph_classes():
+    """
+    Obtain all registered subgraph transformations in a stable order, which is
+    identical across processes.
+    """
+    if hasattr(SubgraphTransformation, 'extensions'):
+        # Compatibility with versions older than 0.12
+        extensions = SubgraphTransformation.extensions()
+    else:
+        extensions = SubgraphTransformation.subclasses_recursive()
+    return sorted(extensions, key=_class_key)
 
-            subgraph = None
-            if len(selected_states) > 0:
-                subgraph = SubgraphView(selected_sdfg, selected_states)
+
+def _find_pattern_matches(sdfg, permissive, patterns=None, states=None):
+    from dace.transformation.optimizer import SDFGOptimizer
+
+    optimizer = SDFGOptimizer(sdfg)
+    try:
+        return optimizer.get_pattern_matches(permissive=permissive,
+                                             patterns=patterns,
+                                             states=states)
+    except TypeError:
+        # Compatibility with versions older than 0.12
+        return optimizer.get_pattern_matches(strict=not permissive,
+                                             patterns=patterns,
+                                             states=states)
+
+
+class PatternMatchMemo:
+    """
+    Pattern matches of single-state transformations per state of an SDFG.
+    Matches of a state are only valid as long as the state's fingerprint is
+    unchanged (see `utils.get_state_fingerprints`). Besides the state itself,
+    this covers the parts of the surrounding SDFG that single-state
+    transformations inspect, such as the control flow and the data accessed
+    in other states.
+    """
+
+    def __init__(self):
+        self.patterns = None
+        self.permissive = None
+        self.states = {}
+
+
+def _get_match_key(match):
+    if hasattr(match, 'cfg_id'):
+        return match.cfg_id, match.state_id
+    return match.sdfg_id, match.state_id
+
+
+def _get_states(sdfg):
+    """
+    Map the keys of all states of an SDFG, including the states of nested
+    SDFGs, to the states.
+    """
+    states = {}
+    for nested_sdfg in sdfg.all_sdfgs_recursive():
+        if hasattr(nested_sdfg, 'all_states'):
+            nested_states = nested_sdfg.all_states()
+        else:
+            nested_states = nested_sdfg.nodes()
+        for state in nested_states:
+            states[utils.get_state_key(state)] = state
+    return states
+
+
+def _match_to_json(match):
+    return {
+        'transformation': match.to_json(),
+        'name': type(match).__name__,
+        'docstring': match.__doc__,
+    }
+
+
+def _iter_pattern_matches(sdfg, permissive, memo=None, sdfg_json=None):
+    """
+    Find all pattern transformations applicable to an SDFG. If a memo and the
+    SDFG's JSON are provided, single-state transformations are only matched
+    against states whose fingerprint changed since the memo was last updated,
+    and the memo is updated with the new matches.
+    :returns:  A generator over dictionaries containing the transformations'
+               JSON, class name, and docstring.
+    """
+    try:
+        from dace.transformation.transformation import (
+            SingleStateTransformation
+        )
+    except ImportError:
+        # Compatibility with versions without an explicit distinction between
+        # single- and multi-state transformations.
+        memo = None
+
+    if memo is None or sdfg_json is None:
+        for match in _find_pattern_matches(sdfg, permissive):
+            yield _match_to_json(match)
+        return
+
+    pattern_classes = _get_pattern_classes(sdfg)
+    single_state = [
+        p for p in pattern_classes
+        if issubclass(p, SingleStateTransformation)
+    ]
+    multi_state = [
+        p for p in pattern_classes
+        if not issubclass(p, SingleStateTransformation)
+    ]
+
+    patterns_key = tuple(_class_key(p) for p in single_state)
+    if memo.patterns != patterns_key or memo.permissive != permissive:
+        memo.patterns = patterns_key
+        memo.permissive = permissive
+        memo.states = {}
+
+    # Multi-state transformations span the control flow of entire SDFGs, so
+    # those are always matched anew.
+    if multi_state:
+        for match in _find_pattern_matches(sdfg, permissive, multi_state):
+            yield _match_to_json(match)
+
+    # Fingerprints are computed from the JSON the SDFG was loaded from, which
+    # is much cheaper than serializing the SDFG's states again.
+    fingerprints = utils.get_state_fingerprints(sdfg_json)
+    states = {}
+    dirty = []
+    for key, state in _get_states(sdfg).items():
+        fingerprint = fingerprints.get(key)
+        cached = memo.states.get(key)
+        if (fingerprint is not None and cached is not None and
+                cached[0] == fingerprint):
+            states[key] = cached
+            yield from cached[1]
+        else:
+            states[key] = (fingerprint, [])
+            dirty.append(state)
+
+    complete = True
+    if dirty and single_state:
+        for match in _find_pattern_matches(sdfg, permissive, single_state,
+                                           states=dirty):
+            found = _match_to_json(match)
+            key = _get_match_key(match)
+            if key in states:
+                states[key][1].append(found)
             else:
-                violated = False
-                state = None
-                for node in selected_nodes:
-                    if state is None:
-                        state = node.state
-                    elif state != node.state:
-                        violated = True
-                        break
-                if not violated and state is not None:
-                    subgraph = SubgraphView(state, selected_nodes)
+                # A match that cannot be attributed to a state would get lost
+                # on the next call, so nothing may be reused in that case.
+                complete = False
+            yield found
+    memo.states = states if complete else {}
+
+
+def _get_available_passes():
+    from dace.transformation import passes
+
+    available = []
+    try:
+        all_passes = passes.available_passes(False)
+        for ps in all_passes:
+            if ps.CATEGORY == 'Helper' or ps.CATEGORY == 'Analysis':
+                continue
+            available.append(ps)
+    except (NameError, AttributeError):
+        # Compatibility with legacy versions where no method for getting
+        # available passes exists.
+        pass
+    return available
+
+
+def _get_selected_subgraph(sdfg, selected_elements):
+    """
+    Construct the subgraph view subgraph transformations are matched to from
+    a list of selected elements.
+    :returns:  A tuple of the graph containing the selection, the subgraph
+               view (None if no subgraph transformations apply), and a warning
+               message (None if there is nothing to warn about).
+    """
+    from dace.sdfg.graph import SubgraphView
 
+    selected_states = [
+        utils.sdfg_find_state_from_element(sdfg, n)
+        for n in selected_elements
+        if n['type'] == 'state'
+    ]
+    selected_nodes = [
+        utils.sdfg_find_node_from_element(sdfg, n)
+        for n in selected_elements
+        if n['type'] == 'node'
+    ]
+    selected_cfg_ids = list(
+        set(elem['cfgId'] for elem in selected_elements)
+    )
+    selected_sdfg = sdfg
+    if len(selected_cfg_ids) > 1:
+        return sdfg, None, 'More than one CFG selected, ignoring subgraph'
+    elif len(selected_cfg_ids) == 1:
+        if hasattr(sdfg, 'cfg_list'):
+            selected_sdfg = sdfg.cfg_list[selected_cfg_ids[0]]
+        else:
+            selected_sdfg = sdfg.sdfg_list[selected_cfg_ids[0]]
+
+    # Subgraph transformations are single-state, selected states never yield
+    # a subgraph they could be applied to.
+    if len(selected_states) > 0:
+        return selected_sdfg, None, None
+
+    violated = False
+    state = None
+    for node in selected_nodes:
+        if state is None:
+            state = node.state
+        elif state != node.state:
+            violated = True
+            break
+    if not violated and state is not None:
+        return selected_sdfg, SubgraphView(state, selected_nodes), None
+    return selected_sdfg, None, None
+
+
+def _find_subgraph_transformations(selected_sdfg, subgraph, extensions):
+    applicable = []
+    for xform in extensions:
+        xform_obj = None
+        try:
+            xform_obj = xform()
+            xform_obj.setup_match(subgraph)
+        except:
+            # If the above method throws an exception, it might be
+            # because an older version of dace (<= 0.13.1) is being
+            # used - attempt to construct subgraph transformations
+            # using the old API.
+            xform_obj = xform(subgraph)
+        try:
+            if xform_obj.can_be_applied(selected_sdfg, subgraph):
+                applicable.append(xform_obj)
+        except Exception as can_be_applied_exception:
+            # If something fails here, that is most likely due to a
+            # transformation bug. Fail gracefully.
+            print('Warning: ' + xform.__name__ +
+                  ' caused an exception')
+            print(can_be_applied_exception)
+            print('Most likely a transformation bug, ignoring...')
+    return applicable
+
+
+def _find_transformations_shard(sdfg_hash, sdfg_string, selected_elements,
+                                permissive, shard, num_shards):
+    """
+    Worker process task finding the applicable transformations among one
+    shard of all pattern and subgraph transformation classes.
+    :returns:  A list of tuples of an ordering key and a dictionary containing
+               the transformation's JSON, class name, and docstring, or
+               `SDFG_MISSING` if the SDFG is neither cached in the worker nor
+               provided.
+    """
+    sdfg = worker_sdfg(sdfg_hash, sdfg_string)
+    if sdfg is None:
+        return SDFG_MISSING
+
+    found = []
+    with utils.store_metadata(False):
+        with dc_config.set_temporary('testing',
+                                     'serialize_all_fields',
+                                     value=True):
+            pattern_classes = _get_pattern_classes(sdfg)
+            order = {
+                pattern: i for i, pattern in enumerate(pattern_classes)
+            }
+            patterns = pattern_classes[shard::num_shards]
+            if patterns:
+                matches = _find_pattern_matches(sdfg, permissive, patterns)
+                for i, match in enumerate(matches):
+                    found.append(((0, order[type(match)], i),
+                                  _match_to_json(match)))
+
+            selected_sdfg, subgraph, _ = _get_selected_subgraph(
+                sdfg, selected_elements
+            )
             if subgraph is not None:
-                if hasattr(SubgraphTransformation, 'extensions'):
-                    # Compatibility with versions older than 0.12
-                    extensions = SubgraphTransformation.extensions()
-                else:
-                    extensions = SubgraphTransformation.subclasses_recursive()
-
-                for xform in extensions:
-                    # Subgraph transformations are single-state.
-                    if len(selected_states) > 0:
-                        continue
-                    xform_obj = None
-                    try:
-                        xform_obj = xform()
-                        xform_obj.setup_match(subgraph)
-                    except:
-                        # If the above method throws an exception, it might be
-                        # because an older version of dace (<= 0.13.1) is being
-                        # used - attempt to construct subgraph transformations
-                        # using the old API.
-                        xform_obj = xform(subgraph)
-                    try:
-                        if xform_obj.can_be_applied(selected_sdfg, subgraph):
-                            transformations.append(xform_obj.to_json())
-                            docstrings[xform.__name__] = xform_obj.__doc__
-                    except Exception as can_be_applied_exception:
-                        # If something fails here, that is most likely due to a
-                        # transformation bug. Fail gracefully.
-                        print('Warning: ' + xform.__name__ +
-                              ' caused an exception')
-                        print(can_be_applied_exception)
-                        print('Most likely a transformation bug, ignoring...')
-
-            utils.restore_save_metadata(old_meta)
-            return {
-                'transformations': transformations,
-                'docstrings': docstrings,
+                extensions = _get_subgraph_classes()
+                order = {xform: i for i, xform in enumerate(extensions)}
+                for xform_obj in _find_subgraph_transformations(
+                        selected_sdfg, subgraph, extensions[shard::num_shards]):
+                    found.append(((2, order[type(xform_obj)], 0),
+                                  _match_to_json(xform_obj)))
+    return found
+
+
+def _get_selection_warning(selected_elements):
+    if len(set(elem['cfgId'] for elem in selected_elements)) > 1:
+        return 'More than one CFG selected, ignoring subgraph'
+    return None
+
+
+def _iter_transformations_parallel(sdfg_json, selected_elements, permissive):
+    """
+    Find applicable transformations by sharding all pattern and subgraph
+    transformation classes across the worker pool. The transformations of
+    each shard are yielded as soon as the shard is done, followed by all
+    available passes. Sorted by their ordering keys, the transformations are
+    identical to the ones `_iter_transformations` finds.
+    :returns:  A generator over tuples of an ordering key and a dictionary
+               containing the transformation's JSON, class name, and
+               docstring.
+    """
+    sdfg_hash = get_hash(sdfg_json)
+
+    num_shards = worker_pool.num_workers
+    for _, found in run_sdfg_tasks(
+        worker_pool.executor, _find_transformations_shard, sdfg_hash,
+        lambda: canonical_json(sdfg_json),
+        [
+            (selected_elements, permissive, shard, num_shards)
+            for shard in range(num_shards)
+        ]
+    ):
+        yield from found
+
+    with utils.store_metadata(False):
+        for i, ps in enumerate(_get_available_passes()):
+            yield (1, i, 0), {
+                'transformation': ps().to_json(),
+                'name': ps.__name__,
+                'docstring': ps.__doc__,
             }
+
+
+def _get_transformations_parallel(sdfg_json, selected_elements, permissive):
+    """
+    Find applicable transformations with the worker pool, see
+    `_iter_transformations_parallel`. The result is identical to the one of
+    `get_transformations` without workers.
+    """
+    found = sorted(
+        _iter_transformations_parallel(sdfg_json, selected_elements,
+                                       permissive),
+        key=lambda x: x[0]
+    )
+    response = {
+        'transformations': [xform['transformation'] for _, xform in found],
+        'docstrings': {
+            xform['name']: xform['docstring'] for _, xform in found
+        },
+    }
+    warning = _get_selection_warning(selected_elements)
+    if warning is not None:
+        response['warnings'] = warning
+    return response
+
+
+def _stream_transformations_parallel(sdfg_json, selected_elements,
+                                     permissive):
+    """
+    Find applicable transformations with the worker pool, yielding them in
+    the order in which the workers find them, followed by a warning about the
+    selection if there is one.
+    """
+    for _, found in _iter_transformations_parallel(sdfg_json,
+                                                   selected_elements,
+                                                   permissive):
+        yield found
+    warning = _get_selection_warning(selected_elements)
+    if warning is not None:
+        yield {
+            'warnings': warning,
+        }
+
+
+def _iter_transformations(sdfg, selected_elements, permissive, memo=None,
+                          sdfg_json=None):
+    """
+    Find all transformations applicable to an SDFG, yielding each one as soon
+    as it is found. Pattern matches come first, followed by all available
+    passes and finally the subgraph transformations applicable to the
+    selected elements.
+    :param memo:       Optional `PatternMatchMemo` to reuse pattern matches of
+                       unchanged states from.
+    :param sdfg_json:  The SDFG in JSON format, required to use the memo.
+    :returns:          A generator over dictionaries containing the
+                  transformation's JSON, class name, and docstring, or a
+                  warning message.
+    """
+    yield from _iter_pattern_matches(sdfg, permissive, memo, sdfg_json)
+
+    # Obtain available passes.
+    for ps in _get_available_passes():
+        yield {
+            'transformation': ps().to_json(),
+            'name': ps.__name__,
+            'docstring': ps.__doc__,
+        }
+
+    selected_sdfg, subgraph, warning = _get_selected_subgraph(
+        sdfg, selected_elements
+    )
+    if warning is not None:
+        yield {
+            'warnings': warning,
+        }
+        return
+
+    if subgraph is not None:
+        for xform_obj in _find_subgraph_transformations(
+                selected_sdfg, subgraph, _get_subgraph_classes()):
+            yield {
+                'transformation': xform_obj.to_json(),
+                'name': type(xform_obj).__name__,
+                'docstring': xform_obj.__doc__,
+            }
+
+
+def get_transformations(sdfg_json, selected_elements, permissive,
+                        memo=None):
+    """
+    Find all transformations applicable to an SDFG.
+    :param sdfg_json:          The SDFG in JSON format.
+    :param selected_elements:  Elements selected in the editor, to find
+                               applicable subgraph transformations for.
+    :param permissive:         Whether to match transformations permissively.
+    :param memo:               Optional `PatternMatchMemo` of the SDFG's
+                               document, to only re-match changed states with.
+                               The memo only applies to the in-process search;
+                               with the worker pool enabled, all states are
+                               matched in the workers.
+    """
+    if worker_pool.enabled and 'error' not in sdfg_json:
+        try:
+            return _get_transformations_parallel(sdfg_json,
+                                                 selected_elements,
+                                                 permissive)
         except Exception as e:
             traceback.print_exc()
             return {
@@ -379,3 +862,89 @@ def get_transformations(sdfg_json, selected_elements, permissive):
                     'details': utils.get_exception_message(e),
                 },
             }
+
+    with utils.store_metadata(False):
+        loaded = utils.load_sdfg_from_json(sdfg_json)
+        if loaded['error'] is not None:
+            return loaded['error']
+        sdfg = loaded['sdfg']
+
+        with dc_config.set_temporary('testing',
+                                     'serialize_all_fields',
+                                     value=True):
+            try:
+                response = {}
+                transformations = []
+                docstrings = {}
+                for found in _iter_transformations(sdfg, selected_elements,
+                                                   permissive, memo,
+                                                   sdfg_json):
+                    if 'warnings' in found:
+                        response['warnings'] = found['warnings']
+                    else:
+                        transformations.append(found['transformation'])
+                        docstrings[found['name']] = found['docstring']
+
+                response['transformations'] = transformations
+                response['docstrings'] = docstrings
+                return response
+            except Exception as e:
+                traceback.print_exc()
+                return {
+                    'error': {
+                        'message': 'Failed to load transformations',
+                        'details': utils.get_exception_message(e),
+                    },
+                }
+
+
+def stream_transformations(sdfg_json, selected_elements, permissive,
+                           memo=None):
+    """
+    Find all transformations applicable to an SDFG, emitting each one as a
+    server-sent event as soon as it is found. Each applicable transformation
+    is sent as a 'transformation' event, followed by a 'done' event once the
+    search is complete. Failures are reported through an 'error' event. If
+    the worker pool is enabled, the search runs in the workers, and the
+    transformations of each shard are sent as soon as the shard is done.
+    :returns:  A generator over server-sent event strings.
+    """
+    with utils.store_metadata(False):
+        try:
+            if worker_pool.enabled and 'error' not in sdfg_json:
+                # Shards are streamed as the workers finish them.
+                transformations = _stream_transformations_parallel(
+                    sdfg_json, selected_elements, permissive
+                )
+            else:
+                loaded = utils.load_sdfg_from_json(sdfg_json)
+                if loaded['error'] is not None:
+                    yield utils.sse_event('error', loaded['error']['error'])
+                    return
+                transformations = _iter_transformations(
+                    loaded['sdfg'], selected_elements, permissive, memo,
+                    sdfg_json
+                )
+
+            with dc_config.set_temporary('testing',
+                                         'serialize_all_fields',
+                                         value=True):
+                for found in transformations:
+                    if 'warnings' in found:
+                        yield utils.sse_event('warnings', found)
+                    else:
+                        yield utils.sse_event('transformation', {
+                            'transformation': found['transformation'],
+                            'docstring': found['docstring'],
+                        })
+
+            done = {}
+            if isinstance(sdfg_json, HashedJSON):
+                done['sdfgHash'] = sdfg_json.content_hash
+            yield utils.sse_event('done', done)
+        except Exception as e:
+            traceback.print_exc()
+            yield utils.sse_event('error', {
+                'message': 'Failed to load transformations',
+                'details': utils.get_exception_message(e),
+            })
@@ -0,0 +1,130 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+import gzip
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+# Responses are only compressed if they are at least this many bytes large.
+COMPRESSION_MIN_BYTES = 1024 * 1024
+
+# Compression levels favor speed, since the daemon is usually reached over a
+# local connection.
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+
+def get_supported_encodings():
+    """ Get the content encodings the daemon accepts and emits. """
+    encodings = ['gzip']
+    if zstandard is not None:
+        encodings.append('zstd')
+    return encodings
+
+
+def get_supported_mimetypes():
+    """ Get the body formats the daemon accepts and emits. """
+    mimetypes = [JSON_MIMETYPE]
+    if msgpack is not None:
+        mimetypes.append(MSGPACK_MIMETYPE)
+    return mimetypes
+
+
+def decompress(data, encoding):
+    """
+    Decompress a body according to its content encoding.
+    :param data:      The body.
+    :param encoding:  The value of the Content-Encoding header, or None.
+    :returns:         The decompressed body.
+    """
+    encoding = (encoding or 'identity').strip().lower()
+    if encoding == 'identity':
+        return data
+    if encoding == 'gzip':
+        return gzip.decompress(data)
+    if encoding == 'zstd' and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError('Unsupported content encoding "' + encoding + '"')
+
+
+def decode(data, encoding, mimetype):
+    """
+    Decode a request body.
+    :param data:      The body.
+    :param encoding:  The value of the Content-Encoding header, or None.
+    :param mimetype:  The body's mimetype, JSON or MessagePack.
+    :returns:         The decoded object.
+    """
+    data = decompress(data, encoding)
+    if mimetype == MSGPACK_MIMETYPE:
+        if msgpack is None:
+            raise ValueError('MessagePack is not installed')
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data)
+
+
+def _accepts(header, value):
+    """
+    Check whether an Accept or Accept-Encoding header accepts a value, i.e.,
+    lists it without a quality of 0.
+    """
+    for entry in (header or '').split(','):
+        parts = [p.strip() for p in entry.split(';')]
+        if parts[0].lower() != value:
+            continue
+        for param in parts[1:]:
+            if param.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00',
+                                          'q=0.000'):
+                return False
+        return True
+    return False
+
+
+def choose_mimetype(accept):
+    """
+    Choose the format of a response, preferring MessagePack if the client
+    accepts it and it is installed.
+    :param accept:  The value of the request's Accept header, or None.
+    """
+    if msgpack is not None and _accepts(accept, MSGPACK_MIMETYPE):
+        return MSGPACK_MIMETYPE
+    return JSON_MIMETYPE
+
+
+def choose_encoding(accept_encoding):
+    """
+    Choose the content encoding of a response, preferring zstd over gzip.
+    :param accept_encoding:  The value of the request's Accept-Encoding
+                             header, or None.
+    :returns:                The encoding, or None to not compress.
+    """
+    if zstandard is not None and _accepts(accept_encoding, 'zstd'):
+        return 'zstd'
+    if _accepts(accept_encoding, 'gzip'):
+        return 'gzip'
+    return None
+
+
+def encode(obj):
+    """ Encode an object as MessagePack. """
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def compress(data, encoding):
+    """
+    Compress a body with a content encoding chosen by `choose_encoding`.
+    """
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
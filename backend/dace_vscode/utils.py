@@ -1,18 +1,46 @@
 # Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
 # All rights reserved.
 
+import contextlib
+import gzip
+import json
+import os
 import sys
+import threading
+import time
 import traceback
 
+try:
+    import resource
+except ImportError:
+    resource = None
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from dace import SDFG, serialize
 
+from dace_vscode.sdfg_cache import hash_json, sdfg_cache
+
 UUID_SEPARATOR = '/'
 
+_store_metadata_lock = threading.RLock()
+
 
 def get_exception_message(exception):
     return '%s: %s' % (type(exception).__name__, exception)
 
 
+def sse_event(event, data):
+    """
+    Format a server-sent event with a JSON payload.
+    :param event:  Name of the event.
+    :param data:   JSON serializable event data.
+    """
+    return 'event: ' + event + '\ndata: ' + json.dumps(data) + '\n\n'
+
+
 def ids_to_string(cfg_id, state_id=-1, node_id=-1, edge_id=-1):
     return (str(cfg_id) + UUID_SEPARATOR + str(state_id) + UUID_SEPARATOR +
             str(node_id) + UUID_SEPARATOR + str(edge_id))
@@ -47,9 +75,176 @@ def sdfg_find_node_from_element(sdfg: SDFG, element):
         return node
 
 
+def get_state_key(state):
+    """ Identify a state by its control flow graph ID and node ID. """
+    if hasattr(state, 'parent_graph'):
+        graph = state.parent_graph
+        return graph.cfg_id, graph.node_id(state)
+    return state.parent.sdfg_id, state.parent.node_id(state)
+
+
+def get_json_cfg_id(graph_json, default):
+    """
+    Get the ID of an SDFG or control flow region in JSON format, or a default
+    if it has none.
+    """
+    for key in ('cfg_list_id', 'sdfg_list_id'):
+        if key in graph_json:
+            return graph_json[key]
+    return default
+
+
+def _collect_cfg(graph_json, cfg_id, states, control_flow):
+    for block in graph_json.get('nodes', []):
+        if block.get('type') == 'SDFGState':
+            states.append(((cfg_id, block['id']), block))
+        else:
+            control_flow.append([cfg_id, {
+                k: v for k, v in block.items() if k not in ('nodes', 'edges')
+            }])
+            if 'nodes' in block:
+                # Control flow regions are graphs of their own.
+                _collect_cfg(block, get_json_cfg_id(block, cfg_id), states,
+                             control_flow)
+    for edge in graph_json.get('edges', []):
+        control_flow.append([cfg_id, edge])
+
+
+def _fingerprint_sdfg(sdfg_json, parent_context, symbol_mapping,
+                      fingerprints):
+    states = []
+    control_flow = []
+    _collect_cfg(sdfg_json, get_json_cfg_id(sdfg_json, 0), states,
+                 control_flow)
+
+    attributes = sdfg_json.get('attributes', {})
+    context = hash_json([
+        parent_context,
+        symbol_mapping,
+        attributes.get('_arrays'),
+        attributes.get('symbols'),
+        attributes.get('constants_prop'),
+        control_flow,
+        [
+            [list(key), sorted(set(
+                node.get('attributes', {}).get('data')
+                for node in state.get('nodes', [])
+                if node.get('type') == 'AccessNode'
+            ))] for key, state in states
+        ],
+    ])
+
+    state_fingerprints = []
+    for key, state in states:
+        nodes = []
+        for node in state.get('nodes', []):
+            node_attributes = node.get('attributes', {})
+            if isinstance(node_attributes.get('sdfg'), dict):
+                # Nested SDFGs are represented by their fingerprint, rather
+                # than serialized again with every state around them.
+                node_attributes = dict(node_attributes)
+                node_attributes['sdfg'] = _fingerprint_sdfg(
+                    node_attributes['sdfg'], context,
+                    node_attributes.get('symbol_mapping'), fingerprints
+                )
+                node = dict(node, attributes=node_attributes)
+            nodes.append(node)
+        fingerprint = hash_json([context, dict(state, nodes=nodes)])
+        fingerprints[key] = fingerprint
+        state_fingerprints.append(fingerprint)
+    return hash_json([context, state_fingerprints])
+
+
+def get_state_fingerprints(sdfg_json):
+    """
+    Fingerprint all states of an SDFG, including the states of nested SDFGs,
+    from its JSON representation. A state's fingerprint covers the state
+    itself, including the SDFGs nested in it, and everything in the SDFG
+    around it that analyses of the state may look at: the data containers,
+    symbols, and constants, the control flow, which data each state accesses,
+    and the context of the parent SDFG for nested SDFGs.
+    :param sdfg_json:  The SDFG in JSON format.
+    :returns:          A dictionary mapping state keys (see `get_state_key`)
+                       to fingerprints.
+    """
+    fingerprints = {}
+    _fingerprint_sdfg(sdfg_json, None, None, fingerprints)
+    return fingerprints
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Files of at least this size (compressed or not) are parsed incrementally,
+# if the optional ijson package is installed. For smaller files, the built-in
+# parser is faster and the memory saved is negligible.
+STREAMING_MIN_BYTES = 32 * 1024 * 1024
+
+
+def get_peak_memory():
+    """
+    Get the peak resident set size of the process over its entire lifetime in
+    bytes, or None if the platform does not report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def get_memory_usage():
+    """
+    Get the current resident set size of the process in bytes, or None if the
+    platform does not report it.
+    """
+    try:
+        with open('/proc/self/statm', 'r') as fp:
+            return int(fp.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _read_sdfg_file(path):
+    """
+    Read an SDFG file, decompressing it on the fly if it is compressed. Large
+    files are parsed incrementally from the (decompressed) stream if the
+    optional ijson package is installed, so neither the file's contents nor
+    its text are ever held in memory at once. Without ijson, the compressed
+    file is still never held in memory, but the decompressed text is read in
+    full before it is parsed. Files that do not contain JSON, e.g. pickled
+    SDFGs, are left to DaCe.
+    """
+    with open(path, 'rb') as raw:
+        fp = raw
+        if raw.read(2) == GZIP_MAGIC:
+            fp = gzip.GzipFile(fileobj=raw, mode='rb')
+        else:
+            raw.seek(0)
+        with fp:
+            first = fp.peek(1)[:1] if hasattr(fp, 'peek') else b''
+            if first and first not in b'{ \t\r\n':
+                return SDFG.from_file(path)
+            if (ijson is not None and
+                    os.fstat(raw.fileno()).st_size >= STREAMING_MIN_BYTES):
+                sdfg_json = next(ijson.items(fp, '', use_float=True))
+            else:
+                sdfg_json = json.load(fp)
+    return SDFG.from_json(sdfg_json)
+
+
 def load_sdfg_from_file(path):
+    """
+    Load an SDFG from a file.
+    :param path:  Path to the SDFG file, compressed or not.
+    :returns:     The SDFG or an error, along with the time loading took and
+                  by how many bytes the process' resident set size grew
+                  while loading in 'stats'. The latter is None if the
+                  platform does not report the resident set size.
+    """
+    memory_before = get_memory_usage()
+    start = time.perf_counter()
     try:
-        sdfg = SDFG.from_file(path)
+        sdfg = _read_sdfg_file(path)
         error = None
     except Exception as e:
         print(traceback.format_exc(), file=sys.stderr)
@@ -61,9 +256,19 @@ def load_sdfg_from_file(path):
             },
         }
         sdfg = None
+    load_time = time.perf_counter() - start
+    memory_after = get_memory_usage()
     return {
         'error': error,
         'sdfg': sdfg,
+        'stats': {
+            'loadTime': load_time,
+            'memoryIncrease': (
+                memory_after - memory_before
+                if memory_before is not None and memory_after is not None
+                else None
+            ),
+        },
     }
 
 
@@ -81,7 +286,7 @@ def load_sdfg_from_json(json):
         sdfg = None
     else:
         try:
-            sdfg = SDFG.from_json(json)
+            sdfg = sdfg_cache.load(json)
             error = None
         except Exception as e:
             print(traceback.format_exc(), file=sys.stderr)
@@ -99,14 +304,24 @@ def load_sdfg_from_json(json):
     }
 
 
-def disable_save_metadata():
-    old_meta = False
-    if hasattr(serialize, 'JSON_STORE_METADATA'):
-        old_meta = serialize.JSON_STORE_METADATA
-        serialize.JSON_STORE_METADATA = False
-    return old_meta
-
-
-def restore_save_metadata(old_meta):
-    if hasattr(serialize, 'JSON_STORE_METADATA'):
-        serialize.JSON_STORE_METADATA = old_meta
+@contextlib.contextmanager
+def store_metadata(enabled):
+    """
+    Set whether DaCe includes metadata when serializing SDFGs to JSON, for the
+    duration of the context. DaCe only offers the module-global setting
+    `serialize.JSON_STORE_METADATA` for this, so the setting is changed while
+    holding a lock, which serializes all such contexts across threads. The
+    previous value is restored on exit, even if the context is left through
+    an error.
+    :param enabled:  Whether to include metadata.
+    """
+    with _store_metadata_lock:
+        has_setting = hasattr(serialize, 'JSON_STORE_METADATA')
+        if has_setting:
+            old_value = serialize.JSON_STORE_METADATA
+            serialize.JSON_STORE_METADATA = enabled
+        try:
+            yield
+        finally:
+            if has_setting:
+                serialize.JSON_STORE_METADATA = old_value
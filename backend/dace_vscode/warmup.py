@@ -0,0 +1,75 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+from collections import OrderedDict
+import threading
+import time
+import traceback
+
+
+class Warmup:
+    """
+    Loads the heavy subsystems of the daemon (DaCe, the analysis modules,
+    registries, etc.) one after the other in a background thread, so the
+    daemon can start answering requests right away. Request handlers import
+    what they need lazily, which blocks until the background thread has
+    finished importing the respective module.
+    """
+
+    def __init__(self):
+        self._tasks = []
+        self._status = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, name, task):
+        """
+        Register a subsystem to load.
+        :param name:  Name of the subsystem, as reported by `status`.
+        :param task:  Function loading the subsystem.
+        """
+        self._tasks.append((name, task))
+        self._status[name] = {
+            'state': 'pending',
+        }
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        for name, task in self._tasks:
+            with self._lock:
+                self._status[name] = {
+                    'state': 'loading',
+                }
+            start = time.perf_counter()
+            try:
+                task()
+                status = {
+                    'state': 'ready',
+                }
+            except Exception as e:
+                traceback.print_exc()
+                status = {
+                    'state': 'failed',
+                    'error': '%s: %s' % (type(e).__name__, e),
+                }
+            status['time'] = time.perf_counter() - start
+            with self._lock:
+                self._status[name] = status
+
+    def status(self):
+        """
+        Report the warmup state of each subsystem, which is one of 'pending',
+        'loading', 'ready', or 'failed', along with the time it took to load
+        finished subsystems.
+        """
+        with self._lock:
+            subsystems = {
+                name: dict(status) for name, status in self._status.items()
+            }
+        return {
+            'ready': all(
+                s['state'] == 'ready' for s in subsystems.values()
+            ),
+            'subsystems': subsystems,
+        }
@@ -1,6 +1,9 @@
 # Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
 # All rights reserved.
 
+import contextlib
+import inspect
+import threading
 from typing import Any
 
 import sympy as sp
@@ -9,7 +12,22 @@ try:
 except ImportError:
     work_depth = None
 
-from dace_vscode.utils import load_sdfg_from_json, get_exception_message
+from dace_vscode.sdfg_cache import hash_json
+from dace_vscode.simplify import Simplifier
+from dace_vscode.utils import (get_exception_message, get_state_fingerprints,
+                               get_state_key, load_sdfg_from_json)
+
+# Runs of the analysis in this module are serialized through this lock, since
+# memoized runs replace DaCe's module-global analysis of single states, which
+# is visible to every thread.
+_analysis_lock = threading.RLock()
+
+
+def _analyze_sdfg(sdfg, w_d_map, analyze_tasklet, assumptions: str):
+    with _analysis_lock:
+        work_depth.analyze_sdfg(sdfg, w_d_map, analyze_tasklet,
+                                assumptions.split(), False)
+
 
 def get_work(sdfg_json: Any, assumptions: str):
     if not work_depth:
@@ -27,12 +45,13 @@ def get_work(sdfg_json: Any, assumptions: str):
 
     try:
         work_map = {}
-        work_depth.analyze_sdfg(
-            sdfg, work_map, work_depth.get_tasklet_work, assumptions.split(),
-            False
+        _analyze_sdfg(sdfg, work_map, work_depth.get_tasklet_work,
+                      assumptions)
+        simplified = Simplifier().simplify_all(
+            [v[0] for v in work_map.values()]  # only take work
         )
-        for k, v, in work_map.items():
-            work_map[k] = str(sp.simplify(v[0]))  # only take work
+        for k, v in zip(list(work_map.keys()), simplified):
+            work_map[k] = str(v)
         return {
             'arithOpsMap': work_map,
         }
@@ -61,12 +80,13 @@ def get_depth(sdfg_json: Any, assumptions: str):
 
     try:
         depth_map = {}
-        work_depth.analyze_sdfg(
-            sdfg, depth_map, work_depth.get_tasklet_work_depth,
-            assumptions.split(), False
+        _analyze_sdfg(sdfg, depth_map, work_depth.get_tasklet_work_depth,
+                      assumptions)
+        simplified = Simplifier().simplify_all(
+            [v[1] for v in depth_map.values()]  # only take depth
         )
-        for k, v, in depth_map.items():
-            depth_map[k] = str(sp.simplify(v[1]))  # only take depth
+        for k, v in zip(list(depth_map.keys()), simplified):
+            depth_map[k] = str(v)
         return {
             'depthMap': depth_map,
         }
@@ -95,14 +115,13 @@ def get_avg_parallelism(sdfg_json: Any, assumptions: str):
 
     try:
         avg_parallelism_map = {}
-        work_depth.analyze_sdfg(
-            sdfg, avg_parallelism_map, work_depth.get_tasklet_avg_par,
-            assumptions.split(), False
+        _analyze_sdfg(sdfg, avg_parallelism_map,
+                      work_depth.get_tasklet_avg_par, assumptions)
+        simplified = Simplifier().simplify_ratios(
+            list(avg_parallelism_map.values())  # work / depth = avg par
         )
-        for k, v, in avg_parallelism_map.items():
-            avg_parallelism_map[k] = str(
-                sp.simplify(v[0] / v[1])
-                if str(v[1]) != '0' else 0)  # work / depth = avg par
+        for k, v in zip(list(avg_parallelism_map.keys()), simplified):
+            avg_parallelism_map[k] = str(v)
         return {
             'avgParallelismMap': avg_parallelism_map,
         }
@@ -113,3 +132,151 @@ def get_avg_parallelism(sdfg_json: Any, assumptions: str):
                 'details': get_exception_message(e),
             },
         }
+
+
+class WorkDepthMemo:
+    """
+    Work depth analysis results per state of a document's SDFG. The results
+    of a state, including those of all nested SDFGs inside it, stay valid as
+    long as the state's fingerprint and the arguments it is analyzed with are
+    unchanged. Only states that changed since the last analysis are analyzed
+    again, while the control flow around them is always re-aggregated.
+    """
+
+    def __init__(self):
+        self.states = {}
+
+
+def _supports_memoization():
+    """
+    Check whether DaCe's analysis looks up the analysis of single states
+    through the module-global `state_work_depth`, which memoization relies on.
+    """
+    if not inspect.isfunction(getattr(work_depth, 'state_work_depth', None)):
+        return False
+    return any(
+        'state_work_depth' in f.__code__.co_names
+        for name, f in vars(work_depth).items()
+        if name != 'state_work_depth' and inspect.isfunction(f)
+    )
+
+
+@contextlib.contextmanager
+def _memoized_state_analysis(memoized):
+    """
+    Replace DaCe's analysis of single states by a memoized version for the
+    duration of the context. DaCe offers no way of passing it in, so the
+    module-global function is replaced while holding the analysis lock.
+    :param memoized:  The memoized analysis, called like `state_work_depth`.
+    :returns:         The original analysis of single states.
+    """
+    with _analysis_lock:
+        original = work_depth.state_work_depth
+        work_depth.state_work_depth = memoized
+        try:
+            yield original
+        finally:
+            work_depth.state_work_depth = original
+
+
+def _run_analysis(sdfg, assumptions: str, memo: WorkDepthMemo = None,
+                  sdfg_json: Any = None):
+    work_depth_map = {}
+    if memo is None or sdfg_json is None or not _supports_memoization():
+        _analyze_sdfg(sdfg, work_depth_map, work_depth.get_tasklet_work_depth,
+                      assumptions)
+        return work_depth_map
+
+    # Fingerprints are computed from the JSON the SDFG was loaded from, which
+    # is much cheaper than serializing the SDFG's states again.
+    fingerprints = get_state_fingerprints(sdfg_json)
+    used = {}
+
+    def _memoized_state_work_depth(state, w_d_map, analyze_tasklet, symbols,
+                                   *args, **kwargs):
+        state_key = get_state_key(state)
+        fingerprint = fingerprints.get(state_key)
+        if fingerprint is None:
+            # States unknown to the JSON, e.g., if DaCe changed the SDFG while
+            # loading it, cannot be memoized.
+            return analyze_state(state, w_d_map, analyze_tasklet, symbols,
+                                 *args, **kwargs)
+        key = hash_json([
+            fingerprint,
+            state_key,
+            assumptions,
+            getattr(analyze_tasklet, '__name__', str(analyze_tasklet)),
+            sorted((str(k), str(v)) for k, v in symbols.items()),
+            [str(arg) for arg in args],
+            sorted((k, str(v)) for k, v in kwargs.items()),
+        ])
+
+        if key in memo.states:
+            result, entries = memo.states[key]
+        else:
+            # Analyze into a separate map to capture the entries of exactly
+            # this state and everything nested in it.
+            entries = {}
+            result = analyze_state(state, entries, analyze_tasklet, symbols,
+                                   *args, **kwargs)
+        used[key] = (result, entries)
+        w_d_map.update(entries)
+        return result
+
+    with _memoized_state_analysis(
+        _memoized_state_work_depth
+    ) as analyze_state:
+        _analyze_sdfg(sdfg, work_depth_map, work_depth.get_tasklet_work_depth,
+                      assumptions)
+    # Only keep the results of states that are still part of the SDFG.
+    memo.states = used
+    return work_depth_map
+
+
+def analyze_work_depth(sdfg, assumptions: str, simplify: bool = True,
+                       memo: WorkDepthMemo = None,
+                       simplifier: Simplifier = None, sdfg_json: Any = None):
+    """
+    Run the work depth analysis on an SDFG once, and derive the work, depth,
+    and average parallelism of each element from its result.
+    :param sdfg:         The SDFG to analyze.
+    :param assumptions:  Space separated symbol assumptions.
+    :param simplify:     Whether to simplify the resulting expressions. If
+                         not, the raw expressions are returned, which can be
+                         simplified on demand with `simplify_expressions`.
+    :param memo:         Optional `WorkDepthMemo` of the SDFG's document, to
+                         only re-analyze changed states with.
+    :param simplifier:   Optional `Simplifier` to simplify the expressions
+                         with, to check whether simplification completed.
+    :param sdfg_json:    The SDFG in JSON format, required to use the memo.
+    :returns:            The work, depth, and average parallelism maps.
+    """
+    work_depth_map = _run_analysis(sdfg, assumptions, memo, sdfg_json)
+    work_map = {}
+    depth_map = {}
+    avg_parallelism_map = {}
+    if not simplify:
+        for k, (work, depth) in work_depth_map.items():
+            work_map[k] = str(work)
+            depth_map[k] = str(depth)
+            avg_parallelism_map[k] = str(
+                sp.sympify(work) / sp.sympify(depth)
+                if str(depth) != '0' else 0
+            )
+        return work_map, depth_map, avg_parallelism_map
+
+    # Simplify all expressions in one batch, which lets the simplification
+    # pool distribute them across processes.
+    keys = list(work_depth_map.keys())
+    values = list(work_depth_map.values())
+    if simplifier is None:
+        simplifier = Simplifier()
+    works = simplifier.simplify_all([work for work, _ in values])
+    depths = simplifier.simplify_all([depth for _, depth in values])
+    avg_parallelisms = simplifier.simplify_ratios(values)
+    for k, work, depth, avg_parallelism in zip(keys, works, depths,
+                                               avg_parallelisms):
+        work_map[k] = str(work)
+        depth_map[k] = str(depth)
+        avg_parallelism_map[k] = str(avg_parallelism)
+    return work_map, depth_map, avg_parallelism_map
@@ -0,0 +1,308 @@
+# Copyright 2020-2025 ETH Zurich and the DaCe-VSCode authors.
+# All rights reserved.
+
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import time
+
+# Number of deserialized SDFGs each worker process keeps around.
+WORKER_SDFG_CACHE_SIZE = 4
+
+# Marker returned by worker tasks if the SDFG they were asked to operate on is
+# not cached in the worker and has not been sent along with the task.
+SDFG_MISSING = '__sdfg_missing__'
+
+# Default time in seconds a worker process may spend simplifying a single
+# expression.
+DEFAULT_SIMPLIFY_TIMEOUT = 5.0
+
+_worker_sdfgs = OrderedDict()
+
+
+def _init_worker(custom_transformation_paths):
+    # Importing the transformations module loads DaCe and registers all
+    # built-in transformations, custom ones are loaded on top.
+    from dace_vscode import transformations
+    transformations.add_custom_transformations(custom_transformation_paths)
+
+
+def _warm_up():
+    return multiprocessing.current_process().pid
+
+
+def worker_sdfg(sdfg_hash, sdfg_string=None):
+    """
+    Obtain a deserialized SDFG inside a worker process. Each worker keeps the
+    SDFGs it recently operated on, so SDFGs only need to be sent and parsed
+    the first time a worker sees them.
+    :param sdfg_hash:    Content hash of the SDFG.
+    :param sdfg_string:  The SDFG as a JSON string, or None to only look up
+                         the worker's cache.
+    :returns:            The SDFG, or None if it is not cached and no JSON
+                         string was provided.
+    """
+    from dace import SDFG
+    import json
+
+    if sdfg_hash in _worker_sdfgs:
+        _worker_sdfgs.move_to_end(sdfg_hash)
+        return _worker_sdfgs[sdfg_hash]
+    if sdfg_string is None:
+        return None
+
+    sdfg = SDFG.from_json(json.loads(sdfg_string))
+    _worker_sdfgs[sdfg_hash] = sdfg
+    while len(_worker_sdfgs) > WORKER_SDFG_CACHE_SIZE:
+        _worker_sdfgs.popitem(last=False)
+    return sdfg
+
+
+def run_sdfg_tasks(executor, task, sdfg_hash, get_sdfg_string, task_args):
+    """
+    Run tasks operating on an SDFG in worker processes, yielding their results
+    as soon as they finish. Each task is first sent only the SDFG's hash, and
+    tasks whose worker has not cached the SDFG yet (see `worker_sdfg`) are
+    sent again along with the SDFG.
+    :param executor:         The executor to submit the tasks to.
+    :param task:             The task, called as
+                             `task(sdfg_hash, sdfg_string, *args)`, which
+                             returns `SDFG_MISSING` if it lacks the SDFG.
+    :param sdfg_hash:        Content hash of the SDFG.
+    :param get_sdfg_string:  Callable returning the SDFG as a JSON string,
+                             only called if a worker lacks the SDFG.
+    :param task_args:        List of argument tuples, one per task.
+    :returns:                A generator over tuples of each task's index in
+                             `task_args` and its result, in the order in
+                             which the tasks finish.
+    """
+    sdfg_string = None
+    pending = list(range(len(task_args)))
+    while pending:
+        futures = {
+            executor.submit(task, sdfg_hash, sdfg_string, *task_args[i]): i
+            for i in pending
+        }
+        pending = []
+        for future in as_completed(futures):
+            result = future.result()
+            if isinstance(result, str) and result == SDFG_MISSING:
+                pending.append(futures[future])
+            else:
+                yield futures[future], result
+        if pending:
+            if sdfg_string is not None:
+                raise RuntimeError('Worker failed to load the SDFG')
+            sdfg_string = get_sdfg_string()
+
+
+class WorkerPool:
+    """
+    A lazily started pool of worker processes with DaCe and all custom
+    transformations loaded. Processes are spawned rather than forked, since
+    DaCe's global state must not be shared with the daemon.
+    """
+
+    def __init__(self, num_workers=0):
+        self.num_workers = num_workers
+        self.custom_transformation_paths = []
+        self._executor = None
+
+    @property
+    def enabled(self):
+        return self.num_workers > 0
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(list(self.custom_transformation_paths),)
+            )
+        return self._executor
+
+    def warm_up(self):
+        """ Start all worker processes ahead of the first request. """
+        if not self.enabled:
+            return
+        futures = [
+            self.executor.submit(_warm_up) for _ in range(self.num_workers)
+        ]
+        for future in futures:
+            future.result()
+
+    def add_custom_transformations(self, paths):
+        """
+        Record custom transformation files to be loaded in all workers. Running
+        workers are shut down, so the next request starts workers which have
+        the custom transformations registered.
+        :param paths:  Paths to the custom transformation files.
+        """
+        new_paths = [
+            p for p in paths if p not in self.custom_transformation_paths
+        ]
+        if not new_paths:
+            return
+        self.custom_transformation_paths.extend(new_paths)
+        self.shutdown()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+worker_pool = WorkerPool()
+
+
+def _simplify_worker(conn):
+    # Signal readiness only after the heavy imports, so deadlines do not
+    # include the worker's start-up.
+    from dace_vscode.simplify import simplify_fully
+    conn.send(None)
+    while True:
+        try:
+            expr = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, simplify_fully(expr)))
+        except Exception:
+            conn.send((False, None))
+
+
+class _SimplifyWorker:
+    """ A spawned simplification process and its end of the pipe to it. """
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_simplify_worker,
+                                       args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class SimplifyPool:
+    """
+    A lazily started set of worker processes to simplify expressions in
+    parallel. Each expression may take at most `timeout` seconds from when a
+    worker starts on it. A worker that is stuck on an expression is killed
+    and replaced on its own, while the other workers carry on.
+    """
+
+    def __init__(self, num_workers=0, timeout=DEFAULT_SIMPLIFY_TIMEOUT):
+        self.num_workers = num_workers
+        self.timeout = timeout
+        self._workers = []
+        self._starting = set()
+
+    @property
+    def enabled(self):
+        return self.num_workers > 0
+
+    def _start_worker(self):
+        worker = _SimplifyWorker(multiprocessing.get_context('spawn'))
+        self._starting.add(worker)
+        return worker
+
+    def _replace_worker(self, worker):
+        worker.kill()
+        self._starting.discard(worker)
+        self._workers[self._workers.index(worker)] = self._start_worker()
+
+    def simplify(self, exprs):
+        """
+        Fully simplify expressions in the worker processes, with the same
+        routine as the sequential path, `simplify.simplify_fully`.
+        Each worker is handed one expression at a time, and its deadline is
+        counted from then. If an expression exceeds its deadline, only the
+        worker running it is killed and replaced.
+        :param exprs:  List of expressions to simplify.
+        :returns:      List of the simplified expressions, with None for
+                       expressions that timed out or failed.
+        """
+        from multiprocessing.connection import wait
+
+        for worker in self._workers[self.num_workers:]:
+            worker.kill()
+            self._starting.discard(worker)
+        del self._workers[self.num_workers:]
+        while len(self._workers) < self.num_workers:
+            self._workers.append(self._start_worker())
+
+        results = [None] * len(exprs)
+        pending = deque(range(len(exprs)))
+        idle = [w for w in self._workers if w not in self._starting]
+        # Maps the workers running an expression to its index and deadline.
+        running = {}
+
+        while running or (pending and (idle or self._starting)):
+            while pending and idle:
+                worker = idle.pop()
+                i = pending.popleft()
+                try:
+                    worker.conn.send(exprs[i])
+                except Exception:
+                    # The expression cannot be sent and stays None.
+                    idle.append(worker)
+                    continue
+                running[worker] = (i, time.monotonic() + self.timeout)
+
+            timeout = None
+            if running:
+                next_deadline = min(d for _, d in running.values())
+                timeout = max(next_deadline - time.monotonic(), 0)
+            conns = {
+                w.conn: w for w in list(running) + list(self._starting)
+            }
+            for conn in wait(list(conns), timeout):
+                worker = conns[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    message = None
+                    failed = True
+                else:
+                    failed = False
+                if worker in self._starting:
+                    self._starting.discard(worker)
+                    if failed:
+                        # Replacing a worker that fails to start would fail
+                        # again, so the pool shrinks instead.
+                        worker.kill()
+                        self._workers.remove(worker)
+                    else:
+                        idle.append(worker)
+                    continue
+                i, _ = running.pop(worker)
+                if failed:
+                    # The worker died, e.g., because it ran out of memory.
+                    self._replace_worker(worker)
+                    continue
+                if message[0]:
+                    results[i] = message[1]
+                idle.append(worker)
+
+            now = time.monotonic()
+            for worker, (i, deadline) in list(running.items()):
+                if now >= deadline:
+                    # The expression is given up on and stays None.
+                    del running[worker]
+                    self._replace_worker(worker)
+        return results
+
+    def shutdown(self):
+        for worker in self._workers:
+            worker.kill()
+        self._workers = []
+        self._starting.clear()
+
+
+simplify_pool = SimplifyPool()
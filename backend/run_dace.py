@@ -41,40 +41,146 @@ if 'PYTHONPATH' in vals:
     sys.path.extend(paths)
 #####################################################################
 
+import functools
+import importlib
+import importlib.util
 import inspect
 import sys
 from argparse import ArgumentParser
+from collections import OrderedDict
 from os import path
 import json
+import threading
 
-# Then, load the rest of the modules
-import aenum
-import dace
-from dace.version import __version__ as DACE_VERSION
-
+# Then, load the rest of the modules. DaCe and the modules depending on it are
+# only imported lazily, since importing DaCe takes several seconds. This lets
+# the daemon bind its port and answer requests right away, while DaCe is
+# loaded in the background.
 sys.path.append(path.abspath(path.dirname(__file__)))
 
-from dace_vscode import work_depth, operational_intensity, transformations
-from dace_vscode.utils import (disable_save_metadata, get_exception_message,
-                               load_sdfg_from_file, restore_save_metadata,
-                               load_sdfg_from_json)
+from dace_vscode.checkpoints import history_checkpoints
+from dace_vscode.compile_jobs import compile_jobs
+from dace_vscode.disk_cache import DiskCache
+from dace_vscode.sdfg_cache import sdfg_cache
+from dace_vscode.sessions import sessions
+from dace_vscode.warmup import Warmup
+from dace_vscode.worker_pool import simplify_pool, worker_pool
+
+DACE_VERSION = None
+
+# DaCe's global state (serialization settings, configuration, registries) is
+# not thread-safe, so requests operating on SDFGs in the daemon process are
+# serialized through this lock. Lightweight requests do not take it and are
+# answered while other requests are being processed.
+dace_lock = threading.RLock()
 
 meta_dict = {}
+meta_dict_key = None
+meta_dict_lock = threading.Lock()
+
+# Increment when changing the structure of the generated metadata, to
+# invalidate dictionaries persisted by earlier versions.
+METADATA_FORMAT_VERSION = 1
+
+metadata_cache = DiskCache('metadata', 64 * 1024 * 1024)
+
+
+warmup = Warmup()
+
+
+def get_dace_version():
+    """
+    Get the version of DaCe without importing it, by reading the version module
+    of the DaCe package that would be imported, or the installed package's
+    metadata if that fails.
+    """
+    global DACE_VERSION
+
+    if DACE_VERSION is not None:
+        return DACE_VERSION
+
+    try:
+        spec = importlib.util.find_spec('dace')
+        if spec is not None and spec.submodule_search_locations:
+            version_file = path.join(spec.submodule_search_locations[0],
+                                     'version.py')
+            with open(version_file, 'r') as fp:
+                match = re.search(r'__version__\s*=\s*[\'"]([^\'"]+)[\'"]',
+                                  fp.read())
+            if match:
+                DACE_VERSION = match.group(1)
+                return DACE_VERSION
+    except (ImportError, OSError, ValueError):
+        pass
+
+    try:
+        from importlib.metadata import version
+        DACE_VERSION = version('dace')
+    except Exception:
+        from dace.version import __version__
+        DACE_VERSION = __version__
+    return DACE_VERSION
+
+
+def _get_metadata_cache_key():
+    from dace_vscode import transformations
+
+    return {
+        'format': METADATA_FORMAT_VERSION,
+        'dace': str(get_dace_version()),
+        'python': sys.version,
+        'customTransformations':
+            transformations.get_custom_transformations_hash(),
+    }
+
 
 def get_property_metadata(force_regenerate=False):
+    """ Get the dictionary of class properties and their metadata.
+        The dictionary is persisted to disk, keyed by the DaCe version, the
+        Python version, and the loaded custom transformations. It is only
+        regenerated if none was persisted for the current key, or if
+        explicitly requested.
+    """
+    global meta_dict_key
+
+    with meta_dict_lock:
+        key = _get_metadata_cache_key()
+        if meta_dict and meta_dict_key == key and not force_regenerate:
+            return {
+                'metaDict': meta_dict,
+            }
+
+        if not force_regenerate:
+            cached = metadata_cache.get(key)
+            if cached is not None:
+                meta_dict.clear()
+                meta_dict.update(cached)
+                meta_dict_key = key
+                return {
+                    'metaDict': meta_dict,
+                }
+
+        # Generating the metadata walks DaCe's registries, which must not
+        # happen while another thread changes DaCe's global state.
+        with dace_lock:
+            _generate_property_metadata()
+        meta_dict_key = key
+        metadata_cache.put(key, meta_dict)
+        return {
+            'metaDict': meta_dict,
+        }
+
+
+def _generate_property_metadata():
     """ Generate a dictionary of class properties and their metadata.
         This iterates over all classes registered as serializable in DaCe's
         serialization module, checks whether there are properties present
         (true for any class registered via the @make.properties decorator), and
         then assembels their metadata to a dictionary.
     """
-    # If a cached version of the dictionary is available, return that.
-    if meta_dict and not force_regenerate:
-        return {
-            'metaDict': meta_dict,
-        }
-
     # Lazy import to cut down on module load time.
+    import aenum
+    import dace
     from dace.properties import TypeClassProperty
     from dace.sdfg.nodes import full_class_path
     # In order to get all transformation metadata the @make.properties
@@ -244,103 +350,165 @@ def get_property_metadata(force_regenerate=False):
                 'choices': choices,
             }
 
+
+def submit_compile_job(path, suppress_instrumentation=False):
+    """
+    Queue the compilation of an SDFG file. Compilation takes long, so it runs
+    in the background, in a separate process, and its progress is queried
+    through the returned job ID. If the compile cache holds an unchanged
+    build, the job is done right away.
+    :param path:                      Path to the SDFG file.
+    :param suppress_instrumentation:  Whether to remove all instrumentation
+                                      before compiling.
+    :returns:                         The ID of the compile job.
+    """
+    job = compile_jobs.submit(
+        path, suppress_instrumentation, _get_config_file(),
+        _get_cached_build(path, suppress_instrumentation)
+    )
     return {
-        'metaDict': meta_dict,
+        'jobId': job.id,
     }
 
 
-def _sdfg_remove_instrumentations(sdfg: dace.sdfg.SDFG):
-    sdfg.instrument = dace.dtypes.InstrumentationType.No_Instrumentation
-    for state in sdfg.nodes():
-        state.instrument = dace.dtypes.InstrumentationType.No_Instrumentation
-        for node in state.nodes():
-            node.instrument = dace.dtypes.InstrumentationType.No_Instrumentation
-            if isinstance(node, dace.sdfg.nodes.NestedSDFG):
-                _sdfg_remove_instrumentations(node.sdfg)
+def _get_config_file():
+    # Compile jobs load the configuration file the daemon has loaded, rather
+    # than resolving it again on their own.
+    import dace
+    return dace.Config.cfg_filename()
 
 
-def compile_sdfg(path, suppress_instrumentation=False):
-    # We lazy import DaCe, not to break cyclic imports, but to avoid any large
-    # delays when booting in daemon mode.
-    from dace.codegen.compiled_sdfg import CompiledSDFG
+def _get_cached_build(path, suppress_instrumentation):
+    # The compile cache is looked up in the daemon, so cache hits are answered
+    # right away, rather than after waiting for a free slot and loading DaCe
+    # in a new process. The lookup only reads configuration that requests
+    # never change, so it does not need to take the DaCe lock.
+    from dace_vscode import compilation
+    return compilation.get_cached_build(path, suppress_instrumentation)
 
-    old_meta = disable_save_metadata()
 
-    loaded = load_sdfg_from_file(path)
-    if loaded['error'] is not None:
-        return loaded['error']
-    sdfg = loaded['sdfg']
-
-    try:
-        if suppress_instrumentation:
-            _sdfg_remove_instrumentations(sdfg)
-    except Exception as e:
+def compile_sdfgs(paths, suppress_instrumentation=False, wait=True):
+    """
+    Compile several SDFG files concurrently. Each file is compiled in its own
+    compile job, and at most as many jobs as there are compile workers run at
+    the same time.
+    :param paths:                     Paths to the SDFG files.
+    :param suppress_instrumentation:  Whether to remove all instrumentation
+                                      before compiling.
+    :param wait:                      Whether to wait for all files to be
+                                      compiled, or only queue the jobs.
+    :returns:                         For each path, its compile result, i.e.,
+                                      the library's filename or an error, or
+                                      the ID of its job if not waiting.
+    """
+    config_file = _get_config_file()
+    jobs = OrderedDict()
+    for p in paths:
+        if p not in jobs:
+            jobs[p] = compile_jobs.submit(
+                p, suppress_instrumentation, config_file,
+                _get_cached_build(p, suppress_instrumentation)
+            )
+    if not wait:
         return {
-            'error': {
-                'message': ('Failed to remove instrumentation from SDFG ' +
-                    'for compiling'),
-                'details': get_exception_message(e),
-            },
+            'jobIds': {p: job.id for p, job in jobs.items()},
         }
 
-    try:
-        compiled_sdfg: CompiledSDFG = sdfg.compile()
+    results = {}
+    for p, job in jobs.items():
+        job.done.wait()
+        if job.state == 'cancelled':
+            results[p] = {
+                'error': {
+                    'message': 'Failed to compile SDFG',
+                    'details': 'The compile job was cancelled',
+                },
+            }
+        else:
+            results[p] = job.result
+    return {
+        'results': results,
+    }
 
-        restore_save_metadata(old_meta)
-        return {
-            'filename': compiled_sdfg.filename,
-        }
-    except Exception as e:
+
+def get_compile_job(job_id, cancel=False):
+    """
+    Get the state, phase timings, and result of a compile job.
+    :param job_id:  ID of the job.
+    :param cancel:  Whether to cancel the job first.
+    """
+    job = (compile_jobs.cancel(job_id) if cancel
+           else compile_jobs.get(job_id))
+    if job is None:
         return {
             'error': {
-                'message': 'Failed to compile SDFG',
-                'details': get_exception_message(e),
+                'message': 'Unknown compile job',
+                'details': 'No compile job with ID ' + str(job_id),
             },
         }
+    return job.to_json()
 
 
 def specialize_sdfg(sdfg_string, symbol_map, remove_undef=True):
-    old_meta = disable_save_metadata()
+    import dace
+    from dace_vscode.utils import (get_exception_message, load_sdfg_from_json,
+                                   store_metadata)
+
+    with store_metadata(False):
+        loaded = load_sdfg_from_json(json.loads(sdfg_string))
+        if loaded['error'] is not None:
+            return loaded['error']
+        sdfg: dace.sdfg.SDFG = loaded['sdfg']
+
+        try:
+            cleaned_map = { k: int(v) for k, v in symbol_map.items() }
+            sdfg.specialize(cleaned_map)
+
+            # Remove any constants that are not defined anymore in the symbol
+            # map, if the remove_undef flag is set.
+            if remove_undef:
+                delkeys = set()
+                for key in sdfg.constants_prop:
+                    if (key not in symbol_map or symbol_map[key] is None or
+                        symbol_map[key] == 0):
+                        delkeys.add(key)
+                for key in delkeys:
+                    del sdfg.constants_prop[key]
+
+            ret_sdfg = sdfg.to_json()
+
+            return {
+                'sdfg': ret_sdfg,
+            }
+        except Exception as e:
+            return {
+                'error': {
+                    'message': 'Failed to specialize SDFG',
+                    'details': get_exception_message(e),
+                },
+            }
 
-    loaded = load_sdfg_from_json(json.loads(sdfg_string))
-    if loaded['error'] is not None:
-        return loaded['error']
-    sdfg: dace.sdfg.SDFG = loaded['sdfg']
 
-    try:
-        cleaned_map = { k: int(v) for k, v in symbol_map.items() }
-        sdfg.specialize(cleaned_map)
-
-        # Remove any constants that are not defined anymore in the symbol map,
-        # if the remove_undef flag is set.
-        if remove_undef:
-            delkeys = set()
-            for key in sdfg.constants_prop:
-                if (key not in symbol_map or symbol_map[key] is None or
-                    symbol_map[key] == 0):
-                    delkeys.add(key)
-            for key in delkeys:
-                del sdfg.constants_prop[key]
-
-        ret_sdfg = sdfg.to_json()
-
-        restore_save_metadata(old_meta)
-        return {
-            'sdfg': ret_sdfg,
-        }
-    except Exception as e:
-        return {
-            'error': {
-                'message': 'Failed to specialize SDFG',
-                'details': get_exception_message(e),
-            },
-        }
+def _prewarm_optimizer():
+    import dace
+    from dace.transformation.optimizer import SDFGOptimizer
 
+    # Enumerating the matches of a dummy SDFG collects and caches the list of
+    # registered transformations.
+    with dace_lock:
+        list(SDFGOptimizer(dace.SDFG('warmup')).get_pattern_matches())
 
-def run_daemon(port):
+
+def run_daemon(port, prewarm=True):
     from logging.config import dictConfig
 
-    from flask import Flask, request
+    from flask import Flask, Request, Response, request, stream_with_context
+    try:
+        from flask.json.provider import DefaultJSONProvider
+    except ImportError:
+        DefaultJSONProvider = None
+
+    from dace_vscode import transport
 
     # Move Flask's logging over to stdout, because stderr is used for error
     # reporting. This was taken from
@@ -366,8 +534,67 @@ def run_daemon(port):
         }
     })
 
+    class DaemonRequest(Request):
+        """
+        A request whose body may be compressed and encoded as either JSON or
+        MessagePack, as indicated by its Content-Encoding and Content-Type
+        headers.
+        """
+
+        def get_json(self, force=False, silent=False, cache=True):
+            try:
+                return transport.decode(self.get_data(cache=cache),
+                                        self.headers.get('Content-Encoding'),
+                                        self.mimetype)
+            except Exception as e:
+                if silent:
+                    return None
+                return self.on_json_loading_failed(e)
+
     daemon = Flask('DaCeInterface')
     daemon.config['DEBUG'] = False
+    daemon.request_class = DaemonRequest
+
+    # Sorting the keys of large SDFGs in responses takes long and is of no use
+    # to the extension.
+    if DefaultJSONProvider is not None:
+        class DaemonJSONProvider(DefaultJSONProvider):
+            """
+            Encodes responses as MessagePack instead of JSON if the client
+            accepts that.
+            """
+            sort_keys = False
+
+            def response(self, *args, **kwargs):
+                mimetype = transport.choose_mimetype(
+                    request.headers.get('Accept')
+                )
+                if mimetype != transport.MSGPACK_MIMETYPE:
+                    return super().response(*args, **kwargs)
+                obj = args[0] if len(args) == 1 else (list(args) or kwargs)
+                return daemon.response_class(transport.encode(obj),
+                                             mimetype=mimetype)
+
+        daemon.json = DaemonJSONProvider(daemon)
+    else:
+        daemon.config['JSON_SORT_KEYS'] = False
+
+    @daemon.after_request
+    def _compress_response(response):
+        if (response.is_streamed or response.status_code != 200 or
+                response.mimetype not in transport.get_supported_mimetypes()):
+            return response
+        encoding = transport.choose_encoding(
+            request.headers.get('Accept-Encoding')
+        )
+        response.vary.add('Accept-Encoding')
+        if (encoding is None or 'Content-Encoding' in response.headers or
+                response.content_length is None or
+                response.content_length < transport.COMPRESSION_MIN_BYTES):
+            return response
+        response.set_data(transport.compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
 
     @daemon.route('/', methods=['GET'])
     def _root():
@@ -375,76 +602,329 @@ def run_daemon(port):
 
     @daemon.route('/version', methods=['GET'])
     def _version():
-        return str(DACE_VERSION)
+        return str(get_dace_version())
+
+    @daemon.route('/transport', methods=['GET'])
+    def _transport():
+        return {
+            'encodings': transport.get_supported_encodings(),
+            'mimetypes': transport.get_supported_mimetypes(),
+        }
+
+    @daemon.route('/ready', methods=['GET'])
+    def _ready():
+        return warmup.status()
+
+    def sdfg_endpoint(handler):
+        """
+        Resolve the SDFG of a request before passing the request JSON on to
+        the handler. The SDFG may be sent in full or as a delta against the
+        last SDFG of a document session, see `SessionStore.resolve_sdfg`. If
+        the request is tied to a document session, the session's SDFG hash is
+        added to the response for the client to refer to in later requests.
+        """
+        @functools.wraps(handler)
+        def _handler():
+            request_json = request.get_json()
+            with dace_lock:
+                resolved = sessions.resolve_sdfg(request_json)
+                if resolved['error'] is not None:
+                    return resolved['error']
+                request_json['sdfg'] = resolved['sdfg']
+                response = handler(request_json)
+                if (resolved['session'] is not None and
+                        isinstance(response, dict) and
+                        'error' not in response):
+                    response['sdfgHash'] = resolved['session'].sdfg_hash
+                return response
+        return _handler
+
+    def with_sdfg_diff(request_json, sdfg_json, response, sdfg_size=None):
+        """
+        If the request asks for it with 'diff', replace the changed SDFG in a
+        response by its difference to the SDFG the request was made with, see
+        `sdfg_diff.sdfg_diff_response`. The IDs of changed elements are only
+        included if the request also sets 'diff_elements'.
+        Unless given, the size of the original SDFG is taken from the SDFG's
+        session, or estimated through the length of the request's body, which
+        avoids serializing the SDFG again. A compressed body underestimates
+        the size, which only makes sending the full SDFG more likely.
+        """
+        if (not request_json.get('diff') or not isinstance(response, dict) or
+                'sdfg' not in response or 'error' in response):
+            return response
+        from dace_vscode.sdfg_diff import sdfg_diff_response
+
+        if sdfg_size is None:
+            sdfg_size = getattr(sdfg_json, 'content_size', None)
+        if sdfg_size is None:
+            sdfg_size = request.content_length
+        response.update(sdfg_diff_response(
+            sdfg_json, response.pop('sdfg'), sdfg_size,
+            request_json.get('diff_elements', False)
+        ))
+        return response
+
+    def locked_stream(generator):
+        """
+        Hold the DaCe lock while a streamed response is being produced, which
+        happens only after the handler has returned.
+        """
+        with dace_lock:
+            yield from generator
+
+    def _get_match_memo(request_json):
+        from dace_vscode import transformations
+
+        session = sessions.get(request_json.get('document_id'))
+        if session is None:
+            return None
+        return session.caches.setdefault(
+            'pattern_matches', transformations.PatternMatchMemo()
+        )
+
+    def _get_work_depth_memo(request_json):
+        from dace_vscode import work_depth
+
+        session = sessions.get(request_json.get('document_id'))
+        if session is None:
+            return None
+        return session.caches.setdefault(
+            'work_depth', work_depth.WorkDepthMemo()
+        )
 
     @daemon.route('/transformations', methods=['POST'])
-    def _get_transformations():
-        request_json = request.get_json()
+    @sdfg_endpoint
+    def _get_transformations(request_json):
+        from dace_vscode import transformations
+
         return transformations.get_transformations(
             request_json['sdfg'], request_json['selected_elements'],
-            request_json['permissive'])
+            request_json['permissive'], _get_match_memo(request_json))
+
+    @daemon.route('/transformations_stream', methods=['POST'])
+    @sdfg_endpoint
+    def _stream_transformations(request_json):
+        from dace_vscode import transformations
+
+        return Response(
+            stream_with_context(locked_stream(
+                transformations.stream_transformations(
+                    request_json['sdfg'], request_json['selected_elements'],
+                    request_json['permissive'], _get_match_memo(request_json)
+                )
+            )),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+            }
+        )
 
     @daemon.route('/add_transformations', methods=['POST'])
     def _add_transformations():
+        from dace_vscode import transformations
+
         request_json = request.get_json()
-        return transformations.add_custom_transformations(request_json['paths'])
+        with dace_lock:
+            response = transformations.add_custom_transformations(
+                request_json['paths']
+            )
+            # Restarting the workers under the lock keeps requests that are
+            # using the worker pool from submitting to a shut down executor.
+            if 'error' not in response:
+                worker_pool.add_custom_transformations(request_json['paths'])
+                compile_jobs.add_custom_transformations(request_json['paths'])
+        return response
 
     @daemon.route('/apply_transformations', methods=['POST'])
-    def _apply_transformations():
-        request_json = request.get_json()
-        return transformations.apply_transformations(
-            request_json['sdfg'], request_json['transformations']
+    @sdfg_endpoint
+    def _apply_transformations(request_json):
+        from dace_vscode import transformations
+
+        return with_sdfg_diff(
+            request_json, request_json['sdfg'],
+            transformations.apply_transformations(
+                request_json['sdfg'], request_json['transformations'],
+                request_json.get('validate_every'),
+                request_json.get('rollback', False)
+            )
         )
 
     @daemon.route('/expand_library_node', methods=['POST'])
-    def _expand_library_node():
-        request_json = request.get_json()
-        return transformations.expand_library_node(request_json)
+    @sdfg_endpoint
+    def _expand_library_node(request_json):
+        from dace_vscode import transformations
+
+        return with_sdfg_diff(
+            request_json, request_json['sdfg'],
+            transformations.expand_library_node(request_json)
+        )
 
     @daemon.route('/reapply_history_until', methods=['POST'])
-    def _reapply_history_until():
-        request_json = request.get_json()
-        return transformations.reapply_history_until(request_json['sdfg'],
-                                                     request_json['index'])
+    @sdfg_endpoint
+    def _reapply_history_until(request_json):
+        from dace_vscode import transformations
+
+        return with_sdfg_diff(
+            request_json, request_json['sdfg'],
+            transformations.reapply_history_until(request_json['sdfg'],
+                                                  request_json['index'])
+        )
 
     @daemon.route('/get_arith_ops', methods=['POST'])
-    def _get_arith_ops():
-        request_json = request.get_json()
+    @sdfg_endpoint
+    def _get_arith_ops(request_json):
+        from dace_vscode import work_depth
+
         return work_depth.get_work(request_json['sdfg'], request_json['assumptions'])
 
     @daemon.route('/get_depth', methods=['POST'])
-    def _get_depth():
-        request_json = request.get_json()
+    @sdfg_endpoint
+    def _get_depth(request_json):
+        from dace_vscode import work_depth
+
         return work_depth.get_depth(request_json['sdfg'], request_json['assumptions'])
 
     @daemon.route('/get_avg_parallelism', methods=['POST'])
-    def _get_avg_parallelism():
-        request_json = request.get_json()
+    @sdfg_endpoint
+    def _get_avg_parallelism(request_json):
+        from dace_vscode import work_depth
+
         return work_depth.get_avg_parallelism(request_json['sdfg'], request_json['assumptions'])
     
     @daemon.route('/get_operational_intensity', methods=['POST'])
-    def _get_operational_intensity():
-        request_json = request.get_json()
+    @sdfg_endpoint
+    def _get_operational_intensity(request_json):
+        from dace_vscode import operational_intensity
+
         return operational_intensity.get_operational_intensity(request_json['sdfg'],
                                                                request_json['cacheParams'],
                                                                request_json['assumptions'])
 
+    @daemon.route('/analyze', methods=['POST'])
+    @sdfg_endpoint
+    def _analyze(request_json):
+        from dace_vscode import analysis
+
+        return analysis.analyze(request_json['sdfg'],
+                                request_json['assumptions'],
+                                request_json.get('cacheParams'),
+                                request_json.get('simplify', True),
+                                _get_work_depth_memo(request_json),
+                                request_json.get('symbolValues'),
+                                request_json.get('sweep'))
+
+    @daemon.route('/operational_intensity_sweep', methods=['POST'])
+    @sdfg_endpoint
+    def _operational_intensity_sweep(request_json):
+        from dace_vscode import analysis
+
+        return analysis.sweep_operational_intensity(
+            request_json['sdfg'], request_json['cacheSizes'],
+            request_json['lineSizes'], request_json.get('assumptions', [''])
+        )
+
+    @daemon.route('/simplify', methods=['POST'])
+    def _simplify():
+        from dace_vscode import simplify
+
+        request_json = request.get_json()
+        with dace_lock:
+            return simplify.simplify_expressions(request_json['expressions'])
+
     @daemon.route('/compile_sdfg_from_file', methods=['POST'])
     def _compile_sdfg_from_file():
         request_json = request.get_json()
-        return compile_sdfg(request_json['path'],
-                            request_json['suppress_instrumentation'])
+        return submit_compile_job(
+            request_json['path'],
+            request_json.get('suppress_instrumentation', False)
+        )
+
+    @daemon.route('/compile_sdfgs_from_files', methods=['POST'])
+    def _compile_sdfgs_from_files():
+        request_json = request.get_json()
+        return compile_sdfgs(
+            request_json['paths'],
+            request_json.get('suppress_instrumentation', False),
+            request_json.get('wait', True)
+        )
+
+    @daemon.route('/jobs', methods=['GET'])
+    def _get_jobs():
+        return {
+            'jobs': [job.to_json() for job in compile_jobs.list()],
+        }
+
+    @daemon.route('/jobs/<job_id>', methods=['GET'])
+    def _get_job(job_id):
+        return get_compile_job(job_id)
+
+    @daemon.route('/jobs/<job_id>/cancel', methods=['POST'])
+    def _cancel_job(job_id):
+        return get_compile_job(job_id, cancel=True)
 
     @daemon.route('/specialize_sdfg', methods=['POST'])
     def _specialize_sdfg():
         request_json = request.get_json()
-        return specialize_sdfg(request_json['sdfg'], request_json['symbol_map'])
+        with dace_lock:
+            response = specialize_sdfg(request_json['sdfg'],
+                                       request_json['symbol_map'])
+            if request_json.get('diff'):
+                response = with_sdfg_diff(
+                    request_json, json.loads(request_json['sdfg']), response,
+                    len(request_json['sdfg'])
+                )
+            return response
+
+    @daemon.route('/specialize_symbols', methods=['POST'])
+    @sdfg_endpoint
+    def _specialize_symbols(request_json):
+        from dace_vscode import specialization
+
+        symbol_maps = request_json.get('symbol_maps')
+        if symbol_maps is None:
+            symbol_maps = [request_json['symbol_map']]
+        return specialization.specialize_symbols(request_json['sdfg'],
+                                                 symbol_maps)
 
     @daemon.route('/get_metadata', methods=['GET'])
     def _get_metadata():
         return get_property_metadata()
 
-    daemon.run(host='::1', port=port)
+    @daemon.route('/get_cache_stats', methods=['GET'])
+    def _get_cache_stats():
+        return {
+            'sdfgCache': sdfg_cache.stats(),
+            'historyCheckpoints': history_checkpoints.stats(),
+        }
+
+    # Load DaCe and everything depending on it in the background, while the
+    # daemon is already serving requests. Handlers requiring a module that is
+    # still being loaded block until it is ready, and the progress can be
+    # queried through '/ready'.
+    warmup.add('dace', lambda: importlib.import_module('dace'))
+    warmup.add('transformations',
+               lambda: importlib.import_module('dace_vscode.transformations'))
+    warmup.add('work_depth',
+               lambda: importlib.import_module('dace_vscode.work_depth'))
+    warmup.add(
+        'operational_intensity',
+        lambda: importlib.import_module('dace_vscode.operational_intensity')
+    )
+    warmup.add('analysis',
+               lambda: importlib.import_module('dace_vscode.analysis'))
+    if prewarm:
+        # Load or generate the property metadata and populate the registry of
+        # transformations ahead of time, so they are ready by the time the
+        # first SDFG is opened. Likewise, start the transformation workers.
+        warmup.add('metadata', get_property_metadata)
+        warmup.add('optimizer', _prewarm_optimizer)
+        warmup.add('workers', worker_pool.warm_up)
+    warmup.start()
+
+    # Each request is handled in its own thread, so lightweight requests are
+    # answered while SDFGs are being processed or compiled.
+    daemon.run(host='::1', port=port, threaded=True)
 
 
 if __name__ == '__main__':
@@ -463,6 +943,57 @@ if __name__ == '__main__':
                         type=int,
                         help='The port to listen on')
 
+    parser.add_argument('--sdfg-cache-size',
+                        action='store',
+                        default=512,
+                        type=int,
+                        help='Memory limit for cached SDFGs, in megabytes')
+
+    parser.add_argument('--history-checkpoint-size',
+                        action='store',
+                        default=256,
+                        type=int,
+                        help=('Memory limit for checkpoints of transformation ' +
+                              'history replays, in megabytes'))
+
+    parser.add_argument('-w',
+                        '--transformation-workers',
+                        action='store',
+                        default=max((os.cpu_count() or 1) // 4, 1),
+                        type=int,
+                        help=('Number of worker processes to find applicable ' +
+                              'transformations and run operational ' +
+                              'intensity sweeps with, 0 to disable. ' +
+                              'Defaults to a quarter of the cores'))
+
+    parser.add_argument('--simplify-workers',
+                        action='store',
+                        default=0,
+                        type=int,
+                        help=('Number of worker processes to simplify ' +
+                              'analysis results with, 0 to disable'))
+
+    parser.add_argument('--simplify-timeout',
+                        action='store',
+                        default=5.0,
+                        type=float,
+                        help=('Time limit in seconds for simplifying a ' +
+                              'single expression in a worker process'))
+
+    parser.add_argument('--compile-workers',
+                        action='store',
+                        default=max((os.cpu_count() or 1) // 4, 1),
+                        type=int,
+                        help=('Maximum number of SDFGs compiled at the same ' +
+                              'time, each in its own process. Each build ' +
+                              'already compiles in parallel, so this ' +
+                              'defaults to a quarter of the cores'))
+
+    parser.add_argument('--no-prewarm',
+                        action='store_true',
+                        help=('Do not load the property metadata and start ' +
+                              'transformation workers ahead of time'))
+
     parser.add_argument('-t',
                         '--transformations',
                         action='store_true',
@@ -470,7 +1001,17 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
 
+    sdfg_cache.max_bytes = args.sdfg_cache_size * 1024 * 1024
+    history_checkpoints.max_bytes = (
+        args.history_checkpoint_size * 1024 * 1024
+    )
+    worker_pool.num_workers = max(args.transformation_workers, 0)
+    compile_jobs.max_concurrent = max(args.compile_workers, 1)
+    simplify_pool.num_workers = max(args.simplify_workers, 0)
+    simplify_pool.timeout = args.simplify_timeout
+
     if (args.transformations):
+        from dace_vscode import transformations
         transformations.get_transformations(None)
     else:
-        run_daemon(args.port)
+        run_daemon(args.port, not args.no_prewarm)
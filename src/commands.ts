@@ -38,10 +38,11 @@ export function registerCommands(context: ExtensionContext): void {
             if (editor.document.isDirty)
                 editor.document.save();
             window.withProgress({
-                location: ProgressLocation.Window,
+                // Only notifications offer to cancel the compilation.
+                location: ProgressLocation.Notification,
                 title: 'Compiling SDFG',
-                cancellable: false,
-            }, (_progress) => {
+                cancellable: true,
+            }, (progress, token) => {
                 return new Promise<string>((resolve, reject) => {
                     DaCeInterface.getInstance()?.compileSdfgFromFile(
                         editor.document.uri, data => {
@@ -61,7 +62,12 @@ export function registerCommands(context: ExtensionContext): void {
                                 resolve(data.filename as string);
                             }
                         },
-                        false
+                        false,
+                        job => {
+                            if (job.phase)
+                                progress.report({ message: job.phase });
+                        },
+                        token
                     );
                 });
             }).then((filename) => {
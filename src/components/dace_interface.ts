@@ -12,6 +12,9 @@ import { ICPCRequest } from '../common/messaging/icpc_messaging_component';
 
 import { DaCeVSCode } from '../dace_vscode';
 import {
+    JsonPatchOperation,
+    applyJsonPatch,
+    computeJsonPatch,
     showUntrustedWorkspaceWarning,
     walkDirectory,
 } from '../utils/utils';
@@ -25,6 +28,7 @@ import {
     TransformationListProvider,
 } from './transformation_list';
 import * as semver from 'semver';
+import { gunzipSync, gzipSync } from 'zlib';
 import { MetaDictT } from '../types';
 
 
@@ -33,10 +37,34 @@ export interface DaCeException {
     details?: string;
 }
 
+// Request bodies of at least this many bytes are compressed, if compression
+// is enabled in the backend settings.
+const COMPRESSION_MIN_BYTES = 1024 * 1024;
+
+// Time in milliseconds between polls of a running compile job.
+const COMPILE_JOB_POLL_INTERVAL = 500;
+
 export type DaCeMessage = Record<string, any> & {
     error?: DaCeException;
 };
 
+/**
+ * The last version of a document's SDFG that was sent to the daemon, along
+ * with the hash the daemon has assigned to it.
+ */
+interface SdfgSession {
+    sdfgString: string;
+    sdfg: JsonSDFG;
+    hash: string;
+}
+
+// Maximum number of documents to keep SDFG sessions with the daemon for.
+const MAX_SDFG_SESSIONS = 16;
+
+// Minimum time in milliseconds between updates of the transformation list
+// while applicable transformations are streamed in.
+const TRANSFORMATION_STREAM_UPDATE_INTERVAL = 250;
+
 enum InteractionMode {
     PREVIEW,
     APPLY,
@@ -81,6 +109,15 @@ export class DaCeInterface
 
     private port: number = -1;
 
+    private readonly sdfgSessions = new Map<string, SdfgSession>();
+    private transformationStreamId: number = 0;
+    private lastAnalysis?: {
+        sdfgString: string,
+        assumptions: string,
+        cacheParams?: string,
+        result: DaCeMessage,
+    };
+
     private version: string = '';
     private versionOk: boolean = false;
     private additionalVersionInfo: string = '';
@@ -221,9 +258,26 @@ export class DaCeInterface
         this.daemonTerminal = undefined;
         this.daemonBooting = false;
         this.daemonRunning = false;
+        this.sdfgSessions.clear();
         return this.invoke('setStatus', [false]);
     }
 
+    /**
+     * Assemble the command line arguments for the DaCe daemon from the user's
+     * backend settings.
+     * @param port Port for the daemon to listen on.
+     * @returns    The arguments as a string.
+     */
+    private getDaemonArgs(port: number): string {
+        let args = ' -p ' + port.toString();
+        const workers = vscode.workspace.getConfiguration(
+            'dace.backend'
+        ).transformationWorkers as number | undefined;
+        if (workers !== undefined && workers >= 0)
+            args += ' -w ' + workers.toString();
+        return args;
+    }
+
     @ICPCRequest()
     public async startDaemonInTerminal(port?: number): Promise<void> {
         if (!port) {
@@ -255,16 +309,16 @@ export class DaCeInterface
                     if (port) {
                         this.port = port;
                         this.daemonTerminal?.sendText(
-                            pyCmd + ' ' + scriptUri.fsPath + ' -p ' +
-                            port.toString()
+                            pyCmd + ' ' + scriptUri.fsPath +
+                            this.getDaemonArgs(port)
                         );
                         this.pollDaemon(resolve, reject);
                     } else {
                         this.getRandomPort().then(port => {
                             void this.invoke('setPort', [port]);
                             this.daemonTerminal?.sendText(
-                                pyCmd + ' ' + scriptUri.fsPath + ' -p ' +
-                                port.toString()
+                                pyCmd + ' ' + scriptUri.fsPath +
+                                this.getDaemonArgs(port)
                             );
                             this.pollDaemon(resolve, reject);
                         }).catch(() => {
@@ -395,96 +449,102 @@ export class DaCeInterface
     ): void {
         const doSend = () => {
             let method = 'GET';
-            let postData = undefined;
+            let postData: Buffer | undefined = undefined;
             if (data !== undefined)
                 method = 'POST';
 
+            const compression = vscode.workspace.getConfiguration(
+                'dace.backend'
+            ).compression as string | undefined;
+            const headers: Record<string, string | number> = {};
+            if (compression === 'gzip')
+                headers['Accept-Encoding'] = 'gzip';
+
+            if (data !== undefined) {
+                postData = Buffer.from(JSON.stringify(data), 'utf8');
+                headers['Content-Type'] = 'application/json';
+                if (compression === 'gzip' &&
+                    postData.length >= COMPRESSION_MIN_BYTES) {
+                    postData = gzipSync(postData, { level: 1 });
+                    headers['Content-Encoding'] = 'gzip';
+                }
+                headers['Content-Length'] = postData.length;
+            }
+
             const parameters = {
                 host: '::1',
                 port: this.port,
                 path: url,
                 method: method,
-                headers: {},
+                headers: headers,
             };
 
-            if (data !== undefined) {
-                postData = JSON.stringify(data);
-                parameters.headers = {
-                    'Content-Type': 'application/json',
-                    'Content-Length': postData.length,
-                };
-            }
+            const handleError = (error: DaCeException) => {
+                if (!callback)
+                    return;
+                if (customErrorHandler) {
+                    customErrorHandler(error);
+                } else {
+                    DaCeInterface.getInstance()?.genericErrorHandler(
+                        error.message, error.details
+                    ).catch((err: unknown) => {
+                        console.error(err);
+                    });
+                }
+            };
 
-            const req = request(parameters, response => {
-                response.setEncoding('utf8');
-                // Accumulate all the data, in case data is chunked up.
-                let accumulatedData = '';
-                if (callback) {
-                    response.on('data', (recvData: string) => {
-                        const dace = DaCeInterface.getInstance();
-                        if (response.statusCode === 200) {
-                            accumulatedData += recvData;
-                            // Check if this is all the data we're going to
-                            // receive, or if the data is chunked up into
-                            // pieces.
-                            const contentLength =
-                                Number(response.headers['content-length']);
-                            if (!contentLength ||
-                                accumulatedData.length >= contentLength) {
-                                let error: DaCeException | undefined =
-                                    undefined;
-                                let parsed: DaCeMessage | undefined = undefined;
-                                try {
-                                    parsed = JSON.parse(
-                                        accumulatedData
-                                    ) as DaCeMessage;
-                                    if (parsed.error) {
-                                        error = parsed.error;
-                                        parsed = undefined;
-                                    }
-                                } catch (e: unknown) {
-                                    error = {
-                                        message: 'Failed to parse response',
-                                        details: String(e),
-                                    };
-                                }
+            const handleResponse = (responseData: string) => {
+                if (!callback)
+                    return;
+                let parsed: DaCeMessage;
+                try {
+                    parsed = JSON.parse(responseData) as DaCeMessage;
+                } catch (e: unknown) {
+                    handleError({
+                        message: 'Failed to parse response',
+                        details: String(e),
+                    });
+                    return;
+                }
+                if (parsed.error)
+                    handleError(parsed.error);
+                else
+                    callback(parsed);
+            };
 
-                                if (parsed) {
-                                    callback(parsed);
-                                } else if (error) {
-                                    if (customErrorHandler) {
-                                        customErrorHandler(error);
-                                    } else {
-                                        dace?.genericErrorHandler(
-                                            error.message, error.details
-                                        ).catch((err: unknown) => {
-                                            console.error(err);
-                                        });
-                                    }
-                                }
-                            }
-                        } else {
-                            const errorMessage =
-                                'An internal DaCe error was encountered!';
-                            const errorDetails =
-                                'DaCe request failed with code ' + (
-                                    response.statusCode?.toString() ?? 'unknown'
-                                );
-                            if (customErrorHandler) {
-                                customErrorHandler({
-                                    message: errorMessage,
-                                    details: errorDetails,
-                                });
-                            } else {
-                                dace?.genericErrorHandler(
-                                    errorMessage, errorDetails
-                                ).catch((err: unknown) => {
-                                    console.error(err);
-                                });
-                            }
-                        }
+            const req = request(parameters, response => {
+                if (response.statusCode !== 200) {
+                    response.resume();
+                    handleError({
+                        message: 'An internal DaCe error was encountered!',
+                        details: 'DaCe request failed with code ' + (
+                            response.statusCode?.toString() ?? 'unknown'
+                        ),
                     });
+                    return;
                 }
+
+                // Accumulate all the data, in case data is chunked up, and
+                // decompress it once complete.
+                const chunks: Buffer[] = [];
+                response.on('data', (chunk: Buffer) => {
+                    chunks.push(chunk);
+                });
+                response.on('end', () => {
+                    let body = Buffer.concat(chunks);
+                    if (response.headers['content-encoding'] === 'gzip') {
+                        try {
+                            body = gunzipSync(body);
+                        } catch (e: unknown) {
+                            handleError({
+                                message: 'Failed to decompress response',
+                                details: String(e),
+                            });
+                            return;
+                        }
+                    }
+                    handleResponse(body.toString('utf8'));
+                });
             });
             if (postData !== undefined)
                 req.write(postData);
@@ -525,6 +585,262 @@ export class DaCeInterface
         );
     }
 
+    /**
+     * Assemble the request data for a request on an SDFG that belongs to a
+     * document. If the daemon already holds an earlier version of the
+     * document's SDFG, only the hash of that version and the changes since are
+     * included instead of the entire SDFG.
+     * @param documentId  Unique identifier of the SDFG's document.
+     * @param sdfgString  The SDFG in its serialized form.
+     * @param requestData Remaining request data besides the SDFG.
+     * @param forceFull   Include the entire SDFG in any case.
+     * @returns           The request data and the parsed SDFG.
+     */
+    private buildSdfgSessionRequest(
+        documentId: string,
+        sdfgString: string,
+        requestData: Record<string, unknown>,
+        forceFull: boolean = false
+    ): [Record<string, unknown>, JsonSDFG] {
+        const session = forceFull ?
+            undefined : this.sdfgSessions.get(documentId);
+        const data: Record<string, unknown> = {
+            ...requestData,
+            document_id: documentId,
+        };
+        let sdfg: JsonSDFG;
+        if (session && session.sdfgString === sdfgString) {
+            sdfg = session.sdfg;
+            data.sdfg_hash = session.hash;
+        } else {
+            sdfg = JSON.parse(sdfgString) as JsonSDFG;
+            if (session) {
+                data.sdfg_hash = session.hash;
+                data.sdfg_patch = computeJsonPatch(session.sdfg, sdfg);
+            } else {
+                data.sdfg = sdfg;
+            }
+        }
+        return [data, sdfg];
+    }
+
+    private updateSdfgSession(
+        documentId: string, sdfgString: string, sdfg: JsonSDFG, hash: string
+    ): void {
+        this.sdfgSessions.delete(documentId);
+        this.sdfgSessions.set(documentId, {
+            sdfgString: sdfgString,
+            sdfg: sdfg,
+            hash: hash,
+        });
+        // Maps iterate in insertion order, so the first key is the least
+        // recently used session.
+        if (this.sdfgSessions.size > MAX_SDFG_SESSIONS) {
+            const oldest = this.sdfgSessions.keys().next().value;
+            if (oldest !== undefined)
+                this.sdfgSessions.delete(oldest);
+        }
+    }
+
+    /**
+     * Send a request for an SDFG that belongs to a document, only sending the
+     * changes to the SDFG if possible (see `buildSdfgSessionRequest`). Should
+     * the daemon not know the referenced version, the request is repeated with
+     * the entire SDFG.
+     * @param url                The daemon endpoint to send the request to.
+     * @param documentId         Unique identifier of the SDFG's document.
+     * @param sdfgString         The SDFG in its serialized form.
+     * @param requestData        Remaining request data besides the SDFG.
+     * @param callback           Callback for the daemon's response, which also
+     *                           receives the parsed SDFG.
+     * @param customErrorHandler Handler for errors returned by the daemon.
+     * @param forceFull          Send the entire SDFG in any case.
+     */
+    private sendSdfgSessionRequest(
+        url: string,
+        documentId: string,
+        sdfgString: string,
+        requestData: Record<string, unknown>,
+        callback: (msg: DaCeMessage, sdfg: JsonSDFG) => unknown,
+        customErrorHandler?: (msg: DaCeException) => unknown,
+        forceFull: boolean = false
+    ): void {
+        const [data, sdfg] = this.buildSdfgSessionRequest(
+            documentId, sdfgString, requestData, forceFull
+        );
+        this.sendPostRequest(
+            url,
+            data,
+            (msg: DaCeMessage) => {
+                if (msg.resync) {
+                    this.sdfgSessions.delete(documentId);
+                    this.sendSdfgSessionRequest(
+                        url, documentId, sdfgString, requestData, callback,
+                        customErrorHandler, true
+                    );
+                    return;
+                }
+
+                if (typeof msg.sdfgHash === 'string') {
+                    this.updateSdfgSession(
+                        documentId, sdfgString, sdfg, msg.sdfgHash
+                    );
+                }
+                return callback(msg, sdfg);
+            },
+            customErrorHandler
+        );
+    }
+
+    /**
+     * Send a POST request to an endpoint that responds with a stream of
+     * server-sent events. Each event is handed to the event callback as soon
+     * as it arrives. If the daemon responds with a regular JSON message
+     * instead, that message is handed to the message callback. Like for all
+     * other requests, the compression setting of the backend applies to the
+     * request and to regular JSON responses.
+     * @param url                The daemon endpoint to send the request to.
+     * @param requestData        The request data.
+     * @param eventCallback      Callback for each received event.
+     * @param messageCallback    Callback for regular JSON responses.
+     * @param customErrorHandler Handler for errors returned by the daemon.
+     */
+    private sendStreamingPostRequest(
+        url: string,
+        requestData: any,
+        eventCallback: (event: string, data: DaCeMessage) => unknown,
+        messageCallback: (msg: DaCeMessage) => unknown,
+        customErrorHandler?: (err: DaCeException) => unknown
+    ): void {
+        const handleError = (error: DaCeException) => {
+            if (customErrorHandler) {
+                customErrorHandler(error);
+            } else {
+                this.genericErrorHandler(
+                    error.message, error.details
+                ).catch((err: unknown) => {
+                    console.error(err);
+                });
+            }
+        };
+
+        const compression = vscode.workspace.getConfiguration(
+            'dace.backend'
+        ).compression as string | undefined;
+        const headers: Record<string, string | number> = {
+            'Content-Type': 'application/json',
+        };
+        if (compression === 'gzip')
+            headers['Accept-Encoding'] = 'gzip';
+        let postData = Buffer.from(JSON.stringify(requestData), 'utf8');
+        if (compression === 'gzip' &&
+            postData.length >= COMPRESSION_MIN_BYTES) {
+            postData = gzipSync(postData, { level: 1 });
+            headers['Content-Encoding'] = 'gzip';
+        }
+        headers['Content-Length'] = postData.length;
+
+        const req = request({
+            host: '::1',
+            port: this.port,
+            path: url,
+            method: 'POST',
+            headers: headers,
+        }, response => {
+            if (response.statusCode !== 200) {
+                response.resume();
+                handleError({
+                    message: 'An internal DaCe error was encountered!',
+                    details: 'DaCe request failed with code ' + (
+                        response.statusCode?.toString() ?? 'unknown'
+                    ),
+                });
+                return;
+            }
+
+            const isEventStream = response.headers['content-type']?.startsWith(
+                'text/event-stream'
+            ) ?? false;
+            // Event streams are never compressed, only regular JSON responses
+            // may be, so those are decoded once complete.
+            if (isEventStream)
+                response.setEncoding('utf8');
+            const chunks: Buffer[] = [];
+            let buffered = '';
+            response.on('data', (recvData: string | Buffer) => {
+                if (!isEventStream) {
+                    chunks.push(recvData as Buffer);
+                    return;
+                }
+                buffered += recvData as string;
+
+                // Events are separated by blank lines, anything after the
+                // last blank line is an incomplete event.
+                let eventEnd = buffered.indexOf('\n\n');
+                while (eventEnd >= 0) {
+                    const block = buffered.slice(0, eventEnd);
+                    buffered = buffered.slice(eventEnd + 2);
+                    eventEnd = buffered.indexOf('\n\n');
+
+                    let event = 'message';
+                    let data = '';
+                    for (const line of block.split('\n')) {
+                        if (line.startsWith('event: '))
+                            event = line.slice(7);
+                        else if (line.startsWith('data: '))
+                            data += line.slice(6);
+                    }
+
+                    let parsed: DaCeMessage;
+                    try {
+                        parsed = JSON.parse(data) as DaCeMessage;
+                    } catch (e: unknown) {
+                        handleError({
+                            message: 'Failed to parse response',
+                            details: String(e),
+                        });
+                        continue;
+                    }
+                    eventCallback(event, parsed);
+                }
+            });
+            response.on('end', () => {
+                if (isEventStream)
+                    return;
+
+                let body = Buffer.concat(chunks);
+                if (response.headers['content-encoding'] === 'gzip') {
+                    try {
+                        body = gunzipSync(body);
+                    } catch (e: unknown) {
+                        handleError({
+                            message: 'Failed to decompress response',
+                            details: String(e),
+                        });
+                        return;
+                    }
+                }
+
+                let parsed: DaCeMessage;
+                try {
+                    parsed = JSON.parse(body.toString('utf8')) as DaCeMessage;
+                } catch (e: unknown) {
+                    handleError({
+                        message: 'Failed to parse response',
+                        details: String(e),
+                    });
+                    return;
+                }
+                if (parsed.error)
+                    handleError(parsed.error);
+                else
+                    messageCallback(parsed);
+            });
+        });
+        req.write(postData);
+        req.end();
+    }
+
     public async promptStartDaemon(): Promise<void> {
         if (this.daemonBooting)
             return;
@@ -672,6 +988,26 @@ export class DaCeInterface
         );
     }
 
+    /**
+     * Restore the changed SDFG of a response to a request that was made with
+     * `diff` set. Such responses may only contain a patch against the SDFG the
+     * request was made with in `sdfgPatch`, instead of the entire SDFG.
+     * @param sdfg The SDFG the request was made with. It is patched in place.
+     * @param data The response.
+     * @returns    The response, with the changed SDFG in `sdfg`.
+     */
+    private resolveSdfgResponse(
+        sdfg: JsonSDFG, data: DaCeMessage
+    ): DaCeMessage {
+        if (data.sdfgPatch !== undefined) {
+            data.sdfg = applyJsonPatch(
+                sdfg, data.sdfgPatch as JsonPatchOperation[]
+            );
+            delete data.sdfgPatch;
+        }
+        return data;
+    }
+
     private async sendApplyTransformationRequest(
         transformations: JsonTransformation[],
         callback: (data: DaCeMessage) => unknown,
@@ -695,8 +1031,11 @@ export class DaCeInterface
                             sdfg: sdfg,
                             transformations: transformations,
                             permissive: false,
+                            diff: true,
                         },
-                        callback
+                        (data: DaCeMessage) => callback(
+                            this.resolveSdfgResponse(sdfg, data)
+                        )
                     );
                 }
             }
@@ -714,8 +1053,10 @@ export class DaCeInterface
                         {
                             sdfg: sdfg,
                             nodeid: nodeid,
+                            diff: true,
                         },
                         async (data: DaCeMessage) => {
+                            this.resolveSdfgResponse(sdfg, data);
                             await this.writeToActiveDocument(
                                 data.sdfg as string | JsonSDFG
                             ).then(() => {
@@ -902,8 +1243,11 @@ export class DaCeInterface
                 {
                     sdfg: sdfg,
                     index: index,
+                    diff: true,
                 },
-                callback
+                (data: DaCeMessage) => callback(
+                    this.resolveSdfgResponse(sdfg, data)
+                )
             );
         }
     }
@@ -956,6 +1300,70 @@ export class DaCeInterface
     }
 
 
+    /**
+     * Analyze the work, depth, and average parallelism of an SDFG, and
+     * optionally its operational intensity, with a single request. The result
+     * of the last analysis is kept, so that the individual analysis overlays
+     * of the same SDFG and assumptions do not require another request.
+     * @param sdfg        The SDFG to analyze.
+     * @param assumptions Space separated symbol assumptions.
+     * @param cacheParams Cache parameters for the operational intensity
+     *                    analysis, or undefined to skip it.
+     * @param callback    Callback for the analysis results.
+     * @param reject      Callback for failed analyses.
+     */
+    private analyzeSdfg(
+        sdfg: JsonSDFG,
+        assumptions: string,
+        cacheParams: string | undefined,
+        callback: (data: DaCeMessage) => unknown,
+        reject: (reason: Error) => unknown
+    ): void {
+        const sdfgString = JSON.stringify(sdfg);
+        const last = this.lastAnalysis;
+        if (last && last.sdfgString === sdfgString &&
+            last.assumptions === assumptions &&
+            (cacheParams === undefined ||
+             last.cacheParams === cacheParams)) {
+            callback(last.result);
+            return;
+        }
+
+        const requestData = {
+            'assumptions': assumptions,
+            'cacheParams': cacheParams,
+        };
+        const analysisCallback = (data: DaCeMessage) => {
+            this.lastAnalysis = {
+                sdfgString: sdfgString,
+                assumptions: assumptions,
+                cacheParams: cacheParams,
+                result: data,
+            };
+            callback(data);
+        };
+        const errorHandler = async (error: DaCeException) => {
+            await this.genericErrorHandler(error.message, error.details);
+            reject(new Error(error.message));
+        };
+
+        // Analyses of a document's SDFG go through its session, so the daemon
+        // only re-analyzes the states that changed since the last analysis.
+        const documentId = DaCeVSCode.getInstance().activeSDFGEditor
+            ?.document.uri.toString();
+        if (documentId !== undefined) {
+            this.sendSdfgSessionRequest(
+                '/analyze', documentId, sdfgString, requestData,
+                analysisCallback, errorHandler
+            );
+        } else {
+            this.sendPostRequest(
+                '/analyze', { 'sdfg': sdfg, ...requestData },
+                analysisCallback, errorHandler
+            );
+        }
+    }
+
     @ICPCRequest()
     public async getFlops(): Promise<any> {
         return new Promise((resolve, reject) => {
@@ -973,23 +1381,16 @@ export class DaCeInterface
                             value
                         );
                         if(valid) {
-                            this.sendPostRequest(
-                                '/get_arith_ops',
-                                {
-                                    'sdfg': sdfg,
-                                    'assumptions': assumptions,
-                                },
+                            this.analyzeSdfg(
+                                sdfg,
+                                assumptions,
+                                undefined,
                                 (data: DaCeMessage) => {
                                     void DaCeInterface.getInstance(
                                     )?.hideSpinner();
                                     resolve(data.arithOpsMap);
                                 },
-                                async (error: DaCeException) => {
-                                    await this.genericErrorHandler(
-                                        error.message, error.details
-                                    );
-                                    reject(new Error(error.message));
-                                }
+                                reject
                             );
                         } else {
                             void DaCeInterface.getInstance()?.hideSpinner();
@@ -1024,23 +1425,16 @@ export class DaCeInterface
                             value
                         );
                         if(valid) {
-                            this.sendPostRequest(
-                                '/get_depth',
-                                {
-                                    'sdfg': sdfg,
-                                    'assumptions': assumptions,
-                                },
+                            this.analyzeSdfg(
+                                sdfg,
+                                assumptions,
+                                undefined,
                                 (data: DaCeMessage) => {
                                     resolve(data.depthMap);
                                     void DaCeInterface.getInstance(
                                     )?.hideSpinner();
                                 },
-                                async (error: DaCeException) => {
-                                    await this.genericErrorHandler(
-                                        error.message, error.details
-                                    );
-                                    reject(new Error(error.message));
-                                }
+                                reject
                             );
                         } else {
                             void DaCeInterface.getInstance()?.hideSpinner();
@@ -1076,23 +1470,16 @@ export class DaCeInterface
                             value
                         );
                         if(valid) {
-                            this.sendPostRequest(
-                                '/get_avg_parallelism',
-                                {
-                                    'sdfg': sdfg,
-                                    'assumptions': assumptions,
-                                },
+                            this.analyzeSdfg(
+                                sdfg,
+                                assumptions,
+                                undefined,
                                 (data: DaCeMessage) => {
                                     void DaCeInterface.getInstance(
                                     )?.hideSpinner();
                                     resolve(data.avgParallelismMap);
                                 },
-                                async (error: DaCeException) => {
-                                    await this.genericErrorHandler(
-                                        error.message, error.details
-                                    );
-                                    reject(new Error(error.message));
-                                }
+                                reject
                             );
                         } else {
                             void DaCeInterface.getInstance()?.hideSpinner();
@@ -1132,24 +1519,16 @@ export class DaCeInterface
                                     if(cacheParams === '' ||
                                         cacheParams === undefined)
                                         cacheParams = '1024 64';
-                                    this.sendPostRequest(
-                                        '/get_operational_intensity',
-                                        {
-                                            'sdfg': sdfg,
-                                            'cacheParams': cacheParams,
-                                            'assumptions': assumptions,
-                                        },
+                                    this.analyzeSdfg(
+                                        sdfg,
+                                        assumptions,
+                                        cacheParams,
                                         (data: DaCeMessage) => {
                                             resolve(data.opInMap);
                                             void DaCeInterface.getInstance(
                                             )?.hideSpinner();
                                         },
-                                        async (error: DaCeException) => {
-                                            await this.genericErrorHandler(
-                                                error.message, error.details
-                                            );
-                                            reject(new Error(error.message));
-                                        }
+                                        reject
                                     );
                                 }
                             );
@@ -1169,45 +1548,130 @@ export class DaCeInterface
         });
     }
 
+    /**
+     * Compile an SDFG file in the background. The daemon runs the compilation
+     * as a job, which is polled until it finishes.
+     * @param uri                     URI of the SDFG file.
+     * @param callback                Called with the result of the job, which
+     *                                contains either the library's `filename`
+     *                                or an `error`.
+     * @param suppressInstrumentation Whether to remove all instrumentation
+     *                                before compiling.
+     * @param onProgress              Called with the job's state, current
+     *                                phase, and phase timings on each poll.
+     * @param token                   Cancels the job when triggered.
+     */
     public compileSdfgFromFile(
         uri: vscode.Uri, callback: (data: DaCeMessage) => void,
-        suppressInstrumentation: boolean = false
+        suppressInstrumentation: boolean = false,
+        onProgress?: (job: DaCeMessage) => void,
+        token?: vscode.CancellationToken
     ): void {
+        const onError = (err: DaCeException) => {
+            callback({ error: err });
+        };
+        const poll = (jobId: string) => {
+            this.sendGetRequest('/jobs/' + jobId, (job: DaCeMessage) => {
+                onProgress?.(job);
+                if (job.state === 'queued' || job.state === 'running') {
+                    setTimeout(() => {
+                        poll(jobId);
+                    }, COMPILE_JOB_POLL_INTERVAL);
+                } else if (job.state === 'cancelled') {
+                    callback({
+                        error: {
+                            message: 'Compilation was cancelled',
+                            details: '',
+                        },
+                    });
+                } else {
+                    callback(job.result as DaCeMessage);
+                }
+            }, onError);
+        };
         this.sendPostRequest(
             '/compile_sdfg_from_file',
             {
                 'path': uri.fsPath,
                 'suppress_instrumentation': suppressInstrumentation,
             },
-            callback,
-            undefined,
+            (data: DaCeMessage) => {
+                const jobId = data.jobId as string;
+                token?.onCancellationRequested(() => {
+                    this.sendPostRequest(
+                        '/jobs/' + jobId + '/cancel', {}, undefined, onError
+                    );
+                });
+                poll(jobId);
+            },
+            onError,
             true
         );
     }
 
+    /**
+     * Specialize an SDFG for symbol values. The daemon only reports how the
+     * SDFG's constants change, which are applied to a copy of the SDFG here.
+     * @param sdfg      The SDFG in its serialized form.
+     * @param symbolMap Map from symbol names to values.
+     * @returns         The specialized SDFG.
+     */
     @ICPCRequest()
     public async specializeGraph(
         sdfg: string, symbolMap?: Record<string, unknown>
     ): Promise<any> {
         return new Promise((resolve, reject) => {
             this.showSpinner('Specializing').then(() => {
-                this.sendPostRequest(
-                    '/specialize_sdfg',
-                    {
-                        'sdfg': sdfg,
-                        'symbol_map': symbolMap,
-                    },
-                    (data: DaCeMessage) => {
-                        void this.hideSpinner();
-                        resolve(data.sdfg);
-                    },
-                    async (error: DaCeException) => {
-                        await this.genericErrorHandler(
-                            error.message, error.details
-                        );
-                        reject(new Error(error.message));
-                    }
-                );
+                const callback = (data: DaCeMessage, parsed: JsonSDFG) => {
+                    void this.hideSpinner();
+                    const specializations = data.specializations as {
+                        set: Record<string, unknown>,
+                        removed: string[],
+                    }[];
+                    const constants: Record<string, unknown> = {
+                        ...(parsed.attributes?.constants_prop ?? {}),
+                    };
+                    for (const name of specializations[0].removed)
+                        delete constants[name];
+                    Object.assign(constants, specializations[0].set);
+                    // The parsed SDFG may be shared with the document's
+                    // session, so it is copied rather than modified.
+                    resolve({
+                        ...parsed,
+                        attributes: {
+                            ...parsed.attributes,
+                            constants_prop: constants,
+                        },
+                    });
+                };
+                const errorHandler = async (error: DaCeException) => {
+                    await this.genericErrorHandler(
+                        error.message, error.details
+                    );
+                    reject(new Error(error.message));
+                };
+                const requestData = {
+                    'symbol_maps': [symbolMap ?? {}],
+                };
+
+                // The document's session usually already holds the SDFG, so
+                // only its hash needs to be sent.
+                const documentId = DaCeVSCode.getInstance().activeSDFGEditor
+                    ?.document.uri.toString();
+                if (documentId !== undefined) {
+                    this.sendSdfgSessionRequest(
+                        '/specialize_symbols', documentId, sdfg, requestData,
+                        callback, errorHandler
+                    );
+                } else {
+                    const parsed = JSON.parse(sdfg) as JsonSDFG;
+                    this.sendPostRequest(
+                        '/specialize_symbols',
+                        { 'sdfg': parsed, ...requestData },
+                        (data: DaCeMessage) => callback(data, parsed),
+                        errorHandler
+                    );
+                }
             }).catch((err: unknown) => {
                 console.error(err);
             });
@@ -1240,35 +1704,159 @@ export class DaCeInterface
                     return;
                 }
 
-                this.sendPostRequest(
-                    '/transformations',
-                    {
-                        sdfg: JSON.parse(sdfg) as JsonSDFG,
-                        selected_elements: selectedElements,
-                        permissive: false,
-                    },
-                    (data: DaCeMessage) => {
-                        const xforms =
-                            data.transformations as JsonTransformation[];
-                        const docstrings = data.docstrings as
-                            Record<string, string> | undefined;
-                        for (const elem of xforms) {
-                            let docstring = '';
-                            if (docstrings)
-                                docstring = docstrings[elem.transformation];
-                            elem.docstring = docstring;
-                        }
+                const callback = (data: DaCeMessage) => {
+                    resolve(this.parseTransformationsResponse(data));
+                };
+                const errorHandler = async (error: DaCeException) => {
+                    await this.genericErrorHandler(
+                        error.message, error.details
+                    );
+                    reject(new Error(error.message));
+                };
+
+                const documentId = DaCeVSCode.getInstance().activeSDFGEditor
+                    ?.document.uri.toString();
+                if (documentId !== undefined) {
+                    this.streamTransformations(
+                        documentId, sdfg, selectedElements, resolve,
+                        errorHandler
+                    );
+                } else {
+                    this.sendPostRequest(
+                        '/transformations',
+                        {
+                            sdfg: JSON.parse(sdfg) as JsonSDFG,
+                            selected_elements: selectedElements,
+                            permissive: false,
+                        },
+                        callback,
+                        errorHandler
+                    );
+                }
+            }
+        );
+    }
+
+    /**
+     * Extract the list of transformations from a regular, non-streamed
+     * response of the daemon, with the docstrings attached to them.
+     * @param data The daemon's response.
+     * @returns    The list of transformations.
+     */
+    private parseTransformationsResponse(
+        data: DaCeMessage
+    ): JsonTransformation[] {
+        const xforms = data.transformations as JsonTransformation[];
+        const docstrings = data.docstrings as
+            Record<string, string> | undefined;
+        for (const elem of xforms) {
+            let docstring = '';
+            if (docstrings)
+                docstring = docstrings[elem.transformation];
+            elem.docstring = docstring;
+        }
+        return xforms;
+    }
 
+    /**
+     * Stream in the transformations applicable to a document's SDFG. While
+     * the daemon is still searching, transformations found so far are
+     * periodically added to the active editor's transformation list.
+     * @param documentId       Unique identifier of the SDFG's document.
+     * @param sdfgString       The SDFG in its serialized form.
+     * @param selectedElements The selected elements in the SDFG.
+     * @param resolve          Callback for the complete list.
+     * @param errorHandler     Handler for errors returned by the daemon.
+     * @param forceFull        Send the entire SDFG in any case.
+     */
+    private streamTransformations(
+        documentId: string,
+        sdfgString: string,
+        selectedElements: unknown,
+        resolve: (xforms: JsonTransformation[]) => unknown,
+        errorHandler: (error: DaCeException) => unknown,
+        forceFull: boolean = false
+    ): void {
+        const streamId = ++this.transformationStreamId;
+        const [data, sdfg] = this.buildSdfgSessionRequest(
+            documentId,
+            sdfgString,
+            {
+                selected_elements: selectedElements,
+                permissive: false,
+            },
+            forceFull
+        );
+
+        const xforms: JsonTransformation[] = [];
+        let pending: JsonTransformation[] = [];
+        let lastUpdate = Date.now();
+        let firstUpdate = true;
+        const sendPending = () => {
+            // Stop updating the list once a newer stream has been started.
+            if (streamId !== this.transformationStreamId)
+                return;
+            void DaCeVSCode.getInstance().activeSDFGEditor?.invoke(
+                'addTransformations', [pending, firstUpdate]
+            );
+            firstUpdate = false;
+            pending = [];
+            lastUpdate = Date.now();
+        };
+
+        this.sendStreamingPostRequest(
+            '/transformations_stream',
+            data,
+            (event: string, msg: DaCeMessage) => {
+                switch (event) {
+                    case 'transformation': {
+                        const xform = msg.transformation as JsonTransformation;
+                        xform.docstring =
+                            (msg.docstring as string | null) ?? '';
+                        xforms.push(xform);
+                        pending.push(xform);
+                        if (Date.now() - lastUpdate >=
+                            TRANSFORMATION_STREAM_UPDATE_INTERVAL)
+                            sendPending();
+                        break;
+                    }
+                    case 'done':
+                        if (typeof msg.sdfgHash === 'string') {
+                            this.updateSdfgSession(
+                                documentId, sdfgString, sdfg, msg.sdfgHash
+                            );
+                        }
                         resolve(xforms);
-                    },
-                    async (error: DaCeException) => {
-                        await this.genericErrorHandler(
-                            error.message, error.details
+                        break;
+                    case 'error':
+                        errorHandler(msg as DaCeException);
+                        break;
+                }
+            },
+            (msg: DaCeMessage) => {
+                if (msg.resync) {
+                    this.sdfgSessions.delete(documentId);
+                    this.streamTransformations(
+                        documentId, sdfgString, selectedElements, resolve,
+                        errorHandler, true
+                    );
+                } else if (Array.isArray(msg.transformations)) {
+                    // Daemons that do not stream respond with the entire list
+                    // at once.
+                    if (typeof msg.sdfgHash === 'string') {
+                        this.updateSdfgSession(
+                            documentId, sdfgString, sdfg, msg.sdfgHash
                         );
-                        reject(new Error(error.message));
                     }
-                );
-            }
+                    resolve(this.parseTransformationsResponse(msg));
+                } else {
+                    errorHandler({
+                        message: 'Failed to load transformations',
+                        details: 'Unexpected response from the DaCe daemon',
+                    });
+                }
+            },
+            errorHandler
         );
     }
 
@@ -212,3 +212,128 @@ export function executeTrusted(
             customMessage, runOnTrusted ? f : undefined
         );
 }
+
+export interface JsonPatchOperation {
+    op: 'add' | 'remove' | 'replace';
+    path: string;
+    value?: unknown;
+}
+
+function isJsonObject(value: unknown): value is Record<string, unknown> {
+    return typeof value === 'object' && value !== null &&
+        !Array.isArray(value);
+}
+
+function escapeJsonPointerToken(token: string): string {
+    return token.replace(/~/g, '~0').replace(/\//g, '~1');
+}
+
+/**
+ * Compute a list of JSON patch operations (RFC 6902) that turns one JSON value
+ * into another. Lists are compared element by element, elements are appended
+ * to or removed from the end of lists.
+ * @param from  The original JSON value.
+ * @param to    The JSON value to turn the original value into.
+ * @param path  JSON pointer to the location of the compared values.
+ * @param ops   List of operations to append to.
+ * @returns     The list of patch operations.
+ */
+export function computeJsonPatch(
+    from: unknown, to: unknown, path: string = '',
+    ops: JsonPatchOperation[] = []
+): JsonPatchOperation[] {
+    if (from === to)
+        return ops;
+
+    if (Array.isArray(from) && Array.isArray(to)) {
+        const common = Math.min(from.length, to.length);
+        for (let i = 0; i < common; i++)
+            computeJsonPatch(from[i], to[i], path + '/' + i.toString(), ops);
+        for (let i = common; i < to.length; i++) {
+            ops.push({
+                op: 'add',
+                path: path + '/' + i.toString(),
+                value: to[i],
+            });
+        }
+        for (let i = from.length - 1; i >= common; i--)
+            ops.push({ op: 'remove', path: path + '/' + i.toString() });
+        return ops;
+    }
+
+    if (isJsonObject(from) && isJsonObject(to)) {
+        for (const key of Object.keys(from)) {
+            if (!Object.prototype.hasOwnProperty.call(to, key)) {
+                ops.push({
+                    op: 'remove',
+                    path: path + '/' + escapeJsonPointerToken(key),
+                });
+            }
+        }
+        for (const [key, value] of Object.entries(to)) {
+            const childPath = path + '/' + escapeJsonPointerToken(key);
+            if (Object.prototype.hasOwnProperty.call(from, key))
+                computeJsonPatch(from[key], value, childPath, ops);
+            else
+                ops.push({ op: 'add', path: childPath, value: value });
+        }
+        return ops;
+    }
+
+    ops.push({ op: 'replace', path: path, value: to });
+    return ops;
+}
+
+function unescapeJsonPointerToken(token: string): string {
+    return token.replace(/~1/g, '/').replace(/~0/g, '~');
+}
+
+/**
+ * Apply a list of JSON patch operations (RFC 6902 'add', 'remove' and
+ * 'replace') to a JSON value, as produced by `computeJsonPatch` or the
+ * daemon. The value is modified in place.
+ * @param document The JSON value to patch.
+ * @param ops      List of patch operations.
+ * @returns        The patched value, which is a new value if the root itself
+ *                 was replaced.
+ */
+export function applyJsonPatch(
+    document: unknown, ops: JsonPatchOperation[]
+): unknown {
+    for (const operation of ops) {
+        const tokens = operation.path === '' ?
+            [] : operation.path.slice(1).split('/').map(
+                unescapeJsonPointerToken
+            );
+        if (tokens.length === 0) {
+            if (operation.op === 'remove')
+                throw new Error('Cannot remove the document root');
+            document = operation.value;
+            continue;
+        }
+
+        let parent: any = document;
+        for (const token of tokens.slice(0, -1)) {
+            parent = Array.isArray(parent) ?
+                parent[Number(token)] : parent[token];
+            if (typeof parent !== 'object' || parent === null)
+                throw new Error('Invalid patch path ' + operation.path);
+        }
+
+        const last = tokens[tokens.length - 1];
+        if (Array.isArray(parent)) {
+            const index = last === '-' ? parent.length : Number(last);
+            if (operation.op === 'add')
+                parent.splice(index, 0, operation.value);
+            else if (operation.op === 'remove')
+                parent.splice(index, 1);
+            else
+                parent[index] = operation.value;
+        } else if (operation.op === 'remove') {
+            delete parent[last];
+        } else {
+            parent[last] = operation.value;
+        }
+    }
+    return document;
+}
@@ -73,6 +73,7 @@ import {
     refreshTransformationList,
     refreshXform,
     showTransformationDetails,
+    sortTransformations,
 } from './transformation/transformation';
 import {
     findJsonSDFGElementByUUID,
@@ -770,6 +771,32 @@ export class VSCodeSDFV extends SDFV {
         this.transformations = transformations;
     }
 
+    /**
+     * Add transformations to the transformation list while the applicable
+     * transformations are still being searched for.
+     * @param xforms Newly found transformations.
+     * @param reset  Whether to discard the transformations listed so far.
+     */
+    @ICPCRequest()
+    public addTransformations(
+        xforms: JsonTransformation[], reset: boolean = false
+    ): void {
+        if (reset) {
+            this.setTransformations({
+                selection: [],
+                viewport: [],
+                passes: [],
+                uncategorized: [],
+            });
+        }
+        this.transformations.uncategorized.push({
+            title: 'Uncategorized',
+            ordering: 0,
+            xforms: xforms,
+        });
+        sortTransformations(true, refreshTransformationList, false);
+    }
+
     public setSelectedTransformation(
         selectedTransformation: JsonTransformation | null
     ): void {